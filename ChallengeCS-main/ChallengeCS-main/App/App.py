@@ -1,32 +1,38 @@
 
 ###### Packages Used ######
-import spacy
 import streamlit as st # core package used in this project
 import pandas as pd
-import base64, random
+import functools, random
 import time,datetime
-import pymysql
 import os
 import socket
 import platform
-import geocoder
 import secrets
 import io,random
 import plotly.express as px # to create visualisations at the admin session
 import plotly.graph_objects as go
-from geopy.geocoders import Nominatim
-# libraries used to parse the pdf files
-from pyresparser import ResumeParser
-from pdfminer3.layout import LAParams, LTTextBox
-from pdfminer3.pdfpage import PDFPage
-from pdfminer3.pdfinterp import PDFResourceManager
-from pdfminer3.pdfinterp import PDFPageInterpreter
-from pdfminer3.converter import TextConverter
 from streamlit_tags import st_tags
 from PIL import Image
 import sys, os
 sys.path.append(os.path.abspath("./pyresparser"))
-from pyresparser.resume_parser import extract_education_from_resume
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pyresparser.resume_parser import extract_education, parse_resume
+from pyresparser.incremental import IncrementalParser, get_incremental_parser
+# the uploaded file is parsed once and shared by every consumer
+from utils.document import ParsedDocument
+from utils.result_cache import get_default_cache
+from utils.profiler import get_default_sampler
+from utils.timing import StageTimer
+from jobs import get_job_manager
+from preview import get_preview_server, inline_url, text_page
+import admin_data
+from geolocation import client_address, get_geo_resolver
+from storage import get_pool, get_write_queue
+import aggregates
+from query_cache import get_query_cache
+from scoring import SCORING_RULES, score_resume
+from field_classifier import default_classifier as field_classifier
+from recommender import default_catalog as course_catalog
 
 
 
@@ -35,7 +41,7 @@ from pyresparser.resume_parser import extract_education_from_resume
 
 
 # pre stored data for prediction purposes
-from Courses import ds_course,web_course,android_course,ios_course,uiux_course,resume_videos,interview_videos
+from Courses import resume_videos,interview_videos
 import nltk
 nltk.download('stopwords')
 
@@ -43,57 +49,114 @@ nltk.download('stopwords')
 ###### Preprocessing functions ######
 
 
-# Generates a link allowing the data in a given panda dataframe to be downloaded in csv format 
-def get_csv_download_link(df,filename,text):
-    csv = df.to_csv(index=False)
-    ## bytes conversions
-    b64 = base64.b64encode(csv.encode()).decode()      
-    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}">{text}</a>'
-    return href
-
-
-# Reads Pdf file and check_extractable
-def pdf_reader(file):
-    resource_manager = PDFResourceManager()
-    fake_file_handle = io.StringIO()
-    converter = TextConverter(resource_manager, fake_file_handle, laparams=LAParams())
-    page_interpreter = PDFPageInterpreter(resource_manager, converter)
-    with open(file, 'rb') as fh:
-        for page in PDFPage.get_pages(fh,
-                                      caching=True,
-                                      check_extractable=True):
-            page_interpreter.process_page(page)
-            print(page)
-        text = fake_file_handle.getvalue()
-
-    ## close open handles
-    converter.close()
-    fake_file_handle.close()
-    return text
-
-
-# show uploaded file path to view pdf_display
-def show_pdf(file_path):
-    with open(file_path, "rb") as f:
-        base64_pdf = base64.b64encode(f.read()).decode('utf-8')
-    pdf_display = F'<iframe src="data:application/pdf;base64,{base64_pdf}" width="700" height="1000" type="application/pdf"></iframe>'
-    st.markdown(pdf_display, unsafe_allow_html=True)
-
-
-# course recommendations which has data already loaded from Courses.py
-def course_recommender(course_list):
+# show the uploaded document; when a preview server is configured the pdf is served (and browser cached)
+# by it, so reruns only send the iframe tag. Otherwise the default is the text view, which pages through
+# the already extracted text; the pdf is only inlined (the whole file, on every rerun) when asked for
+def show_pdf(document, text_ready=False):
+    preview_server = get_preview_server()
+    if preview_server is not None:
+        view = st.radio('Preview', ['PDF', 'Text'], horizontal=True) if text_ready else 'PDF'
+    else:
+        view = 'PDF' if st.checkbox('Show the original PDF') else 'Text'
+    if view == 'PDF':
+        pdf_url = preview_server.url(document) if preview_server is not None else inline_url(document)
+        pdf_display = F'<iframe src="{pdf_url}" width="700" height="1000" type="application/pdf"></iframe>'
+        st.markdown(pdf_display, unsafe_allow_html=True)
+    elif not text_ready:
+        st.caption('The text preview is shown once the resume is read')
+    else:
+        page = st.number_input('Page', min_value=1, max_value=max(document.page_count or 1, 1), value=1, step=1)
+        page_text, no_of_pages = text_page(document, int(page))
+        st.caption(f"Page {int(page)} of {no_of_pages}")
+        st.text(page_text)
+
+
+# headers of the browser's request, None when this Streamlit version does not expose them
+def request_headers():
+    try:
+        from streamlit.web.server.websocket_headers import _get_websocket_headers
+    except ImportError:
+        return None
+    try:
+        return _get_websocket_headers()
+    except Exception:
+        return None
+
+
+# stages reported by the background analysis, they drive the progress bar
+ANALYSIS_STAGES = ['extract_text', 'split_sections', 'nlp', 'custom_nlp', 'custom_entities', 'name', 'email',
+                   'mobile_number', 'skills', 'sections', 'education', 'experience',
+                   'suggestions', 'app_education']
+
+
+# Parses the resume and extracts education; runs in a worker thread so it must not call st.*
+## `incremental` keeps the per-section analysis of the previous uploads, only changed sections go through the NLP pipelines
+def analyse_resume(document, incremental, progress=None):
+    ## slow (or randomly sampled) analyses are profiled to disk
+    profiler = get_default_sampler()
+    analysis_timer = StageTimer(progress)
+    capture = profiler.start(document.sha256)
+    try:
+        revisions = incremental.revisions
+        resume_data = parse_resume(document, cache=get_default_cache(), timer=analysis_timer, incremental=incremental)
+        ## sections reused from the previous uploads (nothing to report when the result came from the cache)
+        sections = dict(incremental.last_stats) if incremental.revisions != revisions else {}
+        education_entries = []
+        if resume_data:
+            with analysis_timer.stage('app_education'):
+                ## ORG entities found by the parser, kept in the (cached) result so a cache hit runs no NLP at all
+                education_entries = extract_education(document.text, resume_data.get('organisations') or ())
+    finally:
+        profiler.finish(capture, analysis_timer.as_dict())
+    return {'resume_data': resume_data, 'resume_text': document.text, 'education_entries': education_entries,
+            'sections': sections}
+
+
+## in lazy mode the NLP models only read the sections they are needed for (RESUME_LAZY_NLP=0 runs them on every section)
+LAZY_NLP = os.environ.get('RESUME_LAZY_NLP', '1') != '0'
+
+# The previous analyses of a candidate: shared by every upload with the same mail, else kept for the session
+def candidate_parser(act_mail):
+    if act_mail.strip():
+        return get_incremental_parser(act_mail.strip().lower(), lazy=LAZY_NLP)
+    if 'incremental_parser' not in st.session_state:
+        st.session_state['incremental_parser'] = IncrementalParser(lazy=LAZY_NLP)
+    return st.session_state['incremental_parser']
+
+
+# seconds between two updates of the progress bar while the analysis runs
+ANALYSIS_POLL_INTERVAL = 0.25
+
+# Submits the analysis of a new upload once and returns (job, document) on every rerun.
+# Uploads are told apart by the hash of their content, so a revised CV with the same name and size is a new one.
+# The upload stays in memory; the copy in ./Uploaded_Resumes is written in the background.
+def poll_analysis_job(pdf_file, incremental):
+    jobs = get_job_manager()
+    document = ParsedDocument.from_upload(pdf_file)
+    job = jobs.get(st.session_state.get('analysis_job', ''))
+    if job is None or st.session_state.get('analysis_upload') != document.sha256:
+        document.persist_async('./Uploaded_Resumes')
+        job = jobs.submit(analyse_resume, document, incremental, stages=ANALYSIS_STAGES)
+        st.session_state['analysis_job'] = job.id
+        st.session_state['analysis_upload'] = document.sha256
+        st.session_state['analysis_document'] = document
+    return job, st.session_state['analysis_document']
+
+
+# course recommendations ranked by the skill gap (index built once in recommender.py)
+def course_recommender(reco_field, skills, upload_hash):
     st.subheader("**Courses & Certificates Recommendations 👨‍🎓**")
-    c = 0
-    rec_course = []
+    ## the ranking is computed once per upload and field, the slider only slices it
+    key = (upload_hash, reco_field)
+    if st.session_state.get('course_ranking_key') != key:
+        st.session_state['course_ranking'] = course_catalog.recommend(reco_field, skills, k=10)
+        st.session_state['course_ranking_key'] = key
     ## slider to choose from range 1-10
     no_of_reco = st.slider('Choose Number of Course Recommendations:', 1, 10, 5)
-    random.shuffle(course_list)
-    for c_name, c_link in course_list:
-        c += 1
-        st.markdown(f"({c}) [{c_name}]({c_link})")
-        rec_course.append(c_name)
-        if c == no_of_reco:
-            break
+    rec_course = []
+    for c, course in enumerate(st.session_state['course_ranking'][:no_of_reco], 1):
+        st.markdown(f"({c}) [{course.name}]({course.link})")
+        rec_course.append(course.name)
     return rec_course
 
 
@@ -170,79 +233,35 @@ def generate_cv_suggestions(resume_text, resume_data, reco_field):
     return suggestions if suggestions else ["✨ Your resume looks comprehensive! Keep refining your skills and experience."]
 
 
-# Generates a link allowing the data in a given panda dataframe to be downloaded in csv format 
-def get_csv_download_link(df,filename,text):
-    csv = df.to_csv(index=False)
-    ## bytes conversions
-    b64 = base64.b64encode(csv.encode()).decode()      
-    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}">{text}</a>'
-    return href
-
-
-# Reads Pdf file and check_extractable
-def pdf_reader(file):
-    resource_manager = PDFResourceManager()
-    fake_file_handle = io.StringIO()
-    converter = TextConverter(resource_manager, fake_file_handle, laparams=LAParams())
-    page_interpreter = PDFPageInterpreter(resource_manager, converter)
-    with open(file, 'rb') as fh:
-        for page in PDFPage.get_pages(fh,
-                                      caching=True,
-                                      check_extractable=True):
-            page_interpreter.process_page(page)
-            print(page)
-        text = fake_file_handle.getvalue()
-
-    ## close open handles
-    converter.close()
-    fake_file_handle.close()
-    return text
-
-
-# show uploaded file path to view pdf_display
-def show_pdf(file_path):
-    with open(file_path, "rb") as f:
-        base64_pdf = base64.b64encode(f.read()).decode('utf-8')
-    pdf_display = F'<iframe src="data:application/pdf;base64,{base64_pdf}" width="700" height="1000" type="application/pdf"></iframe>'
-    st.markdown(pdf_display, unsafe_allow_html=True)
-
-
-# course recommendations which has data already loaded from Courses.py
-def course_recommender(course_list):
-    st.subheader("**Courses & Certificates Recommendations 👨‍🎓**")
-    c = 0
-    rec_course = []
-    ## slider to choose from range 1-10
-    no_of_reco = st.slider('Choose Number of Course Recommendations:', 1, 10, 5)
-    random.shuffle(course_list)
-    for c_name, c_link in course_list:
-        c += 1
-        st.markdown(f"({c}) [{c_name}]({c_link})")
-        rec_course.append(c_name)
-        if c == no_of_reco:
-            break
-    return rec_course
-
 
-# pre stored data for prediction purposes
-from Courses import ds_course,web_course,android_course,ios_course,uiux_course,resume_videos,interview_videos
-import nltk
-nltk.download('stopwords')
 
+# sql connector: a bounded pool of connections for reads (one cursor per request)
+# and a write-behind queue that batches inserts in the background
+db_pool = get_pool()
+db_writes = get_write_queue()
+## per-category counts for the admin charts, kept current by every write (no-op after the first run)
+aggregates.install(db_pool, db_writes)
+## dashboard reads are shared by all sessions for a short TTL, and dropped when a write to their table commits
+query_cache = get_query_cache(db_writes)
 
+# Runs a read-only dashboard query through the shared cache (the DataFrame must not be modified)
+def cached_read_sql(query, tables):
+    def load():
+        with db_pool.connection() as connection:
+            return pd.read_sql(query, connection)
+    return query_cache.get(query, tuple(tables), load)
 
-# sql connector
-connection = None
-cursor = None
+# inserting miscellaneous data, fetched results, prediction and recommendation into user_data table
+def insert_data(sec_token,ip_add,host_name,dev_user,os_name_ver,latlong,city,state,country,act_name,act_mail,act_mob,name,email,res_score,timestamp,no_of_pages,reco_field,cand_level,skills,recommended_skills,courses,pdf_name):
+    DB_table_name = 'user_data'
+    rec_values = (str(sec_token),str(ip_add),host_name,dev_user,os_name_ver,str(latlong),city,state,country,act_name,act_mail,act_mob,name,email,str(res_score),timestamp,str(no_of_pages),reco_field,cand_level,skills,recommended_skills,courses,pdf_name)
+    db_writes.put(DB_table_name, rec_values)
 
 # # inserting feedback data into user_feedback table
 def insertf_data(feed_name,feed_email,feed_score,comments,Timestamp):
     DBf_table_name = 'user_feedback'
-    insertfeed_sql = "insert into " + DBf_table_name + """
-    values (0,%s,%s,%s,%s,%s)"""
     rec_values = (feed_name, feed_email, feed_score, comments, Timestamp)
-    cursor.execute(insertfeed_sql, rec_values)
-    connection.commit()
+    db_writes.put(DBf_table_name, rec_values)
 
 
 # Setting Page Configuration (favicon, Logo, Title)
@@ -296,23 +315,17 @@ def run():
         act_mob  = st.text_input('Mobile Number*')
         sec_token = secrets.token_urlsafe(12)
         host_name = socket.gethostname()
-        ip_add = socket.gethostbyname(host_name)
+        ## the client's address when a proxy forwards it (RESUME_CLIENT_IP_HEADER), otherwise the server's own
+        ## address: without the header the user is located where the app runs
+        ip_add = client_address(request_headers()) or socket.gethostbyname(host_name)
         dev_user = os.getlogin()
         os_name_ver = platform.system() + " " + platform.release()
-        g = geocoder.ip('me')
-        latlong = g.latlng
-        geolocator = Nominatim(user_agent="http")
-        try : 
-            location = geolocator.reverse(latlong, language='en')
-            address = location.raw['address']
-            cityy = address.get('city', '')
-            statee = address.get('state', '')
-            countryy = address.get('country', '')  
-            city = cityy
-        except:
-            #state = statee
-            #country = countryy
-            pass
+        ## locating the user runs in the background (local database + LRU), the page never waits for it;
+        ## the lookup is only submitted again when the address changes
+        geo_resolver = get_geo_resolver()
+        if st.session_state.get('geo_ip') != ip_add:
+            st.session_state['geo_ip'] = ip_add
+            st.session_state['geo_lookup'] = geo_resolver.submit(ip_add)
         
 
 
@@ -322,28 +335,32 @@ def run():
         ## file upload in pdf format
         pdf_file = st.file_uploader("Choose your Resume", type=["pdf"])
         if pdf_file is not None:
-            with st.spinner('Hang On While We Cook Magic For You...'):
-                time.sleep(4)
-        
-            ### saving the uploaded resume to folder
-            save_image_path = './Uploaded_Resumes/'+pdf_file.name
             pdf_name = pdf_file.name
-            with open(save_image_path, "wb") as f:
-                f.write(pdf_file.getbuffer())
-            show_pdf(save_image_path)
 
-            ### parsing and extracting whole resume 
-            resume_data = ResumeParser(save_image_path).get_extracted_data()
+            ### parsing and extracting whole resume in a background job; only the progress placeholders
+            ### are updated while it runs, the page is not rerun, and the preview is drawn once it is done
+            job, document = poll_analysis_job(pdf_file, candidate_parser(act_mail))
+            if not job.done:
+                progress_bar = st.empty()
+                progress_stage = st.empty()
+                while not job.done:
+                    progress_bar.progress(int(job.progress * 100))
+                    progress_stage.caption('Hang On While We Cook Magic For You... ' + (job.stage or ''))
+                    time.sleep(ANALYSIS_POLL_INTERVAL)
+                progress_bar.empty()
+                progress_stage.empty()
+            show_pdf(document, text_ready=True)
+            analysis = job.result or {}
+            resume_data = analysis.get('resume_data')
             if resume_data:
                 
                 ## Get the whole resume data into resume_text
-                resume_text = pdf_reader(save_image_path)
+                resume_text = analysis['resume_text']
                 ## Section education 
-                nlp = spacy.load("en_core_web_sm")
-                doc = nlp(resume_text)
-
-                # Extract education info
-                education_entries = extract_education_from_resume(doc)
+                education_entries = analysis['education_entries']
+                sections = analysis.get('sections') or {}
+                if sections.get('reused'):
+                    st.caption(f"Revision: {sections['reused']} of {sections['sections']} sections unchanged since your previous upload, only {sections['analysed']} re-analysed")
 
                 st.subheader("**Education Details 🎓**")
                 if education_entries:
@@ -416,78 +433,26 @@ def run():
                     key='1'
                 )
 
-                ### Define Keywords
-                ds_keyword = ['tensorflow', 'keras', 'pytorch', 'machine learning', 'deep learning', 'flask', 'streamlit']
-                web_keyword = ['react', 'django', 'node js', 'react js', 'php', 'laravel', 'magento', 'wordpress', 'javascript', 'angular js', 'c#', 'asp.net', 'flask']
-                android_keyword = ['android', 'flutter', 'kotlin', 'xml', 'kivy']
-                ios_keyword = ['ios', 'swift', 'cocoa', 'xcode']
-                uiux_keyword = ['ux', 'adobe xd', 'figma', 'zeplin', 'balsamiq', 'ui', 'prototyping', 'wireframes', 'photoshop', 'illustrator', 'after effects', 'indesign', 'user experience']
-                n_any = ['english', 'communication', 'writing', 'microsoft office', 'leadership', 'customer management', 'social media']
-
                 ### Initialize
                 recommended_skills = []
                 reco_field = ''
                 rec_course = ''
 
-                ### Convert all skills to lowercase
-                skills_lower = [s.lower() for s in resume_data['skills']]
-
-                ### Helper to check intersection
-                def match_any(keywords):
-                    return any(any(k in s or s in k for k in keywords) for s in skills_lower)
+                ### Scoring every job field from the skills in one pass (keyword indexes in field_classifier.py)
+                field_ranking = field_classifier.rank(resume_data['skills'])
 
                 ### Recommendation Logic
-                if match_any(ds_keyword):
-                    reco_field = 'Data Science'
-                    st.success("**Our analysis says you are looking for Data Science Jobs.**")
-                    recommended_skills = ['Data Visualization', 'Predictive Analysis', 'Statistical Modeling', 'Data Mining', 
-                                        'Clustering & Classification', 'Data Analytics', 'Quantitative Analysis', 
-                                        'Web Scraping', 'ML Algorithms', 'Keras', 'Pytorch', 'Tensorflow', 'Scikit-learn', 'Streamlit']
+                if field_ranking:
+                    reco_field = field_ranking[0][0]
+                    st.success(f"**Our analysis says you are looking for {reco_field} Jobs.**")
+                    if len(field_ranking) > 1:
+                        st.caption('Other matching fields: ' + ', '.join(f'{name} ({score})' for name, score in field_ranking[1:]))
+                    recommended_skills = field_classifier.field(reco_field).recommended_skills
                     st_tags(label='### Recommended skills for you.',
                             text='Recommended skills generated from System',
-                            value=recommended_skills, key='2')
+                            value=recommended_skills, key=str(2 + field_classifier.order[reco_field]))
                     st.markdown("<h5 style='color:#1ed760;'>Adding these skills will boost 🚀 your chances!</h5>", unsafe_allow_html=True)
-                    rec_course = course_recommender(ds_course)
-
-                elif match_any(web_keyword):
-                    reco_field = 'Web Development'
-                    st.success("**Our analysis says you are looking for Web Development Jobs.**")
-                    recommended_skills = ['React', 'Django', 'Node JS', 'Laravel', 'PHP', 'WordPress', 'Angular JS', 'Flask', 'JavaScript']
-                    st_tags(label='### Recommended skills for you.',
-                            text='Recommended skills generated from System',
-                            value=recommended_skills, key='3')
-                    st.markdown("<h5 style='color:#1ed760;'>Adding these skills will boost 🚀 your chances!</h5>", unsafe_allow_html=True)
-                    rec_course = course_recommender(web_course)
-
-                elif match_any(android_keyword):
-                    reco_field = 'Android Development'
-                    st.success("**Our analysis says you are looking for Android Development Jobs.**")
-                    recommended_skills = ['Kotlin', 'Flutter', 'XML', 'Java', 'Kivy', 'SDK', 'SQLite']
-                    st_tags(label='### Recommended skills for you.',
-                            text='Recommended skills generated from System',
-                            value=recommended_skills, key='4')
-                    st.markdown("<h5 style='color:#1ed760;'>Adding these skills will boost 🚀 your chances!</h5>", unsafe_allow_html=True)
-                    rec_course = course_recommender(android_course)
-
-                elif match_any(ios_keyword):
-                    reco_field = 'iOS Development'
-                    st.success("**Our analysis says you are looking for iOS Development Jobs.**")
-                    recommended_skills = ['Swift', 'Cocoa', 'Xcode', 'Objective-C', 'UIKit', 'StoreKit']
-                    st_tags(label='### Recommended skills for you.',
-                            text='Recommended skills generated from System',
-                            value=recommended_skills, key='5')
-                    st.markdown("<h5 style='color:#1ed760;'>Adding these skills will boost 🚀 your chances!</h5>", unsafe_allow_html=True)
-                    rec_course = course_recommender(ios_course)
-
-                elif match_any(uiux_keyword):
-                    reco_field = 'UI/UX Design'
-                    st.success("**Our analysis says you are looking for UI/UX Design Jobs.**")
-                    recommended_skills = ['Figma', 'Adobe XD', 'Prototyping', 'Wireframes', 'User Research', 'Photoshop', 'Illustrator']
-                    st_tags(label='### Recommended skills for you.',
-                            text='Recommended skills generated from System',
-                            value=recommended_skills, key='6')
-                    st.markdown("<h5 style='color:#1ed760;'>Adding these skills will boost 🚀 your chances!</h5>", unsafe_allow_html=True)
-                    rec_course = course_recommender(uiux_course)
+                    rec_course = course_recommender(reco_field, resume_data['skills'], document.sha256)
 
                 else:
                     st.warning("**Currently no specific recommendations available for your skillset.**")
@@ -504,112 +469,14 @@ def run():
                 st.subheader("**Resume Tips & Ideas 🥂**")
                 resume_score = 0
                 
-                ### Predicting Whether these key points are added to the resume
-                if 'Objective' or 'Summary' in resume_text:
-                    resume_score = resume_score+6
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Objective/Summary</h4>''',unsafe_allow_html=True)                
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #000000;'>[-] Please add your career objective, it will give your career intension to the Recruiters.</h4>''',unsafe_allow_html=True)
-
-                if 'Education' or 'School' or 'College'  in resume_text:
-                    resume_score = resume_score + 12
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Education Details</h4>''',unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #000000;'>[-] Please add Education. It will give Your Qualification level to the recruiter</h4>''',unsafe_allow_html=True)
-
-                if 'EXPERIENCE' in resume_text:
-                    resume_score = resume_score + 16
-
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Experience</h4>''',unsafe_allow_html=True)
-                elif 'Experience' in resume_text:
-                    resume_score = resume_score + 16
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Experience</h4>''',unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #000000;'>[-] Please add Experience. It will help you to stand out from crowd</h4>''',unsafe_allow_html=True)
-
-                if 'INTERNSHIPS'  in resume_text:
-                    resume_score = resume_score + 6
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Internships</h4>''',unsafe_allow_html=True)
-                elif 'INTERNSHIP'  in resume_text:
-                    resume_score = resume_score + 6
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Internships</h4>''',unsafe_allow_html=True)
-                elif 'Internships'  in resume_text:
-                    resume_score = resume_score + 6
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Internships</h4>''',unsafe_allow_html=True)
-                elif 'Internship'  in resume_text:
-                    resume_score = resume_score + 6
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Internships</h4>''',unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #000000;'>[-] Please add Internships. It will help you to stand out from crowd</h4>''',unsafe_allow_html=True)
-
-                if 'SKILLS'  in resume_text:
-                    resume_score = resume_score + 7
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Skills</h4>''',unsafe_allow_html=True)
-                elif 'SKILL'  in resume_text:
-                    resume_score = resume_score + 7
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Skills</h4>''',unsafe_allow_html=True)
-                elif 'Skills'  in resume_text:
-                    resume_score = resume_score + 7
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Skills</h4>''',unsafe_allow_html=True)
-                elif 'Skill'  in resume_text:
-                    resume_score = resume_score + 7
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Skills</h4>''',unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #000000;'>[-] Please add Skills. It will help you a lot</h4>''',unsafe_allow_html=True)
-
-                if 'HOBBIES' in resume_text:
-                    resume_score = resume_score + 4
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Hobbies</h4>''',unsafe_allow_html=True)
-                elif 'Hobbies' in resume_text:
-                    resume_score = resume_score + 4
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Hobbies</h4>''',unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #000000;'>[-] Please add Hobbies. It will show your personality to the Recruiters and give the assurance that you are fit for this role or not.</h4>''',unsafe_allow_html=True)
-
-                if 'INTERESTS'in resume_text:
-                    resume_score = resume_score + 5
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Interest</h4>''',unsafe_allow_html=True)
-                elif 'Interests'in resume_text:
-                    resume_score = resume_score + 5
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Interest</h4>''',unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #000000;'>[-] Please add Interest. It will show your interest other that job.</h4>''',unsafe_allow_html=True)
-
-                if 'ACHIEVEMENTS' in resume_text:
-                    resume_score = resume_score + 13
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Achievements </h4>''',unsafe_allow_html=True)
-                elif 'Achievements' in resume_text:
-                    resume_score = resume_score + 13
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Achievements </h4>''',unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #000000;'>[-] Please add Achievements. It will show that you are capable for the required position.</h4>''',unsafe_allow_html=True)
-
-                if 'CERTIFICATIONS' in resume_text:
-                    resume_score = resume_score + 12
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Certifications </h4>''',unsafe_allow_html=True)
-                elif 'Certifications' in resume_text:
-                    resume_score = resume_score + 12
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Certifications </h4>''',unsafe_allow_html=True)
-                elif 'Certification' in resume_text:
-                    resume_score = resume_score + 12
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Certifications </h4>''',unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #000000;'>[-] Please add Certifications. It will show that you have done some specialization for the required position.</h4>''',unsafe_allow_html=True)
-
-                if 'PROJECTS' in resume_text:
-                    resume_score = resume_score + 19
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Projects</h4>''',unsafe_allow_html=True)
-                elif 'PROJECT' in resume_text:
-                    resume_score = resume_score + 19
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Projects</h4>''',unsafe_allow_html=True)
-                elif 'Projects' in resume_text:
-                    resume_score = resume_score + 19
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Projects</h4>''',unsafe_allow_html=True)
-                elif 'Project' in resume_text:
-                    resume_score = resume_score + 19
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Projects</h4>''',unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #000000;'>[-] Please add Projects. It will show that you have done work related the required position or not.</h4>''',unsafe_allow_html=True)
+                ### Predicting Whether these key points are added to the resume (one scan over the text, rules in scoring.py)
+                resume_scoring = score_resume(resume_text)
+                resume_score = resume_scoring.score
+                for rule in SCORING_RULES:
+                    if rule.name in resume_scoring.matched:
+                        st.markdown(f'''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added {rule.added}</h4>''',unsafe_allow_html=True)
+                    else:
+                        st.markdown(f'''<h5 style='text-align: left; color: #000000;'>[-] {rule.missing}</h4>''',unsafe_allow_html=True)
 
                 st.subheader("**Resume Score 📝**")
                 
@@ -625,11 +492,8 @@ def run():
 
                 ### Score Bar
                 my_bar = st.progress(0)
-                score = 0
-                for percent_complete in range(resume_score):
-                    score +=1
-                    time.sleep(0.1)
-                    my_bar.progress(percent_complete + 1)
+                score = resume_score
+                my_bar.progress(min(score, 100))
 
                 ### Score
                 st.success('** Your Resume Writing Score: ' + str(score)+'**')
@@ -644,8 +508,10 @@ def run():
                 else:
                     st.warning("No suggestions available at this time.")
 
-                # print(str(sec_token), str(ip_add), (host_name), (dev_user), (os_name_ver), (latlong), (city), (state), (country), (act_name), (act_mail), (act_mob), resume_data['name'], resume_data['email'], str(resume_score), timestamp, str(resume_data['no_of_pages']), reco_field, cand_level, str(resume_data['skills']), str(recommended_skills), str(rec_course), pdf_name)
-
+                ### Location of the user, collected with a strict timeout (empty when not known in time)
+                location = geo_resolver.result(st.session_state.get('geo_lookup'))
+                latlong = location.latlng
+                city, state, country = location.city, location.state, location.country
 
                 ### Getting Current Date and Time
                 ts = time.time()
@@ -653,6 +519,13 @@ def run():
                 cur_time = datetime.datetime.fromtimestamp(ts).strftime('%H:%M:%S')
                 timestamp = str(cur_date+'_'+cur_time)
 
+                ## Calling insert_data to add all the data into user_data, once per analysed upload
+                ## (the row is queued and written in the background)
+                ## keyed on the content: a job that expired and was submitted again does not save a second row
+                if st.session_state.get('analysis_saved') != document.sha256:
+                    insert_data(str(sec_token), str(ip_add), (host_name), (dev_user), (os_name_ver), (latlong), (city), (state), (country), (act_name), (act_mail), (act_mob), resume_data['name'], resume_data['email'], str(resume_score), timestamp, str(resume_data['no_of_pages']), reco_field, cand_level, str(resume_data['skills']), str(recommended_skills), str(rec_course), pdf_name)
+                    st.session_state['analysis_saved'] = document.sha256
+
 
  
 
@@ -670,7 +543,7 @@ def run():
                 st.balloons()
 
             else:
-                st.error('Something went wrong..')                
+                st.error('Something went wrong..' + (' ' + job.error if job.error else ''))
 
 
     ###### CODE FOR FEEDBACK SIDE ######
@@ -700,14 +573,15 @@ def run():
                 st.balloons()    
 
 
-        # query to fetch data from user feedback table
+        # query to fetch data from user feedback table (cached, so typing in the form does not hit the database)
         query = 'select * from user_feedback'        
-        plotfeed_data = pd.read_sql(query, connection)                        
+        plotfeed_data = cached_read_sql(query, ['user_feedback'])
 
 
-        # fetching feed_score from the query and getting the unique values and total value count 
-        labels = plotfeed_data.feed_score.unique()
-        values = plotfeed_data.feed_score.value_counts()
+        # fetching feed_score from the query and getting the values with their total value count 
+        feed_counts = plotfeed_data.feed_score.value_counts()
+        labels = feed_counts.index
+        values = feed_counts.values
 
 
         # plotting pie chart for user ratings
@@ -716,12 +590,9 @@ def run():
         st.plotly_chart(fig)
 
 
-        #  Fetching Comment History
-        cursor.execute('select feed_name, comments from user_feedback')
-        plfeed_cmt_data = cursor.fetchall()
-
+        #  Comment History, from the same (cached) query
         st.subheader("**User Comment's**")
-        dff = pd.DataFrame(plfeed_cmt_data, columns=['User', 'Comment'])
+        dff = pd.DataFrame({'User': plotfeed_data.feed_name, 'Comment': plotfeed_data.comments})
         st.dataframe(dff, width=1000)
 
     
@@ -767,123 +638,171 @@ def run():
 
         if st.button('Login'):
             
-            ## Credentials 
-            if ad_user == 'admin' and ad_password == 'admin@resume-analyzer':
-                
-                ### Fetch miscellaneous data from user_data(table) and convert it into dataframe
-                cursor.execute('''SELECT ID, ip_add, resume_score, convert(Predicted_Field using utf8), convert(User_level using utf8), city, state, country from user_data''')
-                datanalys = cursor.fetchall()
-                plot_data = pd.DataFrame(datanalys, columns=['Idt', 'IP_add', 'resume_score', 'Predicted_Field', 'User_Level', 'City', 'State', 'Country'])
-                
-                ### Total Users Count with a Welcome Message
-                values = plot_data.Idt.count()
-                st.success("Welcome Deepak ! Total %d " % values + " User's Have Used Our Tool : )")                
-                
-                ### Fetch user data from user_data(table) and convert it into dataframe
-                cursor.execute('''SELECT ID, sec_token, ip_add, act_name, act_mail, act_mob, convert(Predicted_Field using utf8), Timestamp, Name, Email_ID, resume_score, Page_no, pdf_name, convert(User_level using utf8), convert(Actual_skills using utf8), convert(Recommended_skills using utf8), convert(Recommended_courses using utf8), city, state, country, latlong, os_name_ver, host_name, dev_user from user_data''')
-                data = cursor.fetchall()                
-
-                st.header("**User's Data**")
-                df = pd.DataFrame(data, columns=['ID', 'Token', 'IP Address', 'Name', 'Mail', 'Mobile Number', 'Predicted Field', 'Timestamp',
-                                                 'Predicted Name', 'Predicted Mail', 'Resume Score', 'Total Page',  'File Name',   
-                                                 'User Level', 'Actual Skills', 'Recommended Skills', 'Recommended Course',
-                                                 'City', 'State', 'Country', 'Lat Long', 'Server OS', 'Server Name', 'Server User',])
-                
-                ### Viewing the dataframe
-                st.dataframe(df)
-                
-                ### Downloading Report of user_data in csv file
-                st.markdown(get_csv_download_link(df,'User_Data.csv','Download Report'), unsafe_allow_html=True)
-
-                ### Fetch feedback data from user_feedback(table) and convert it into dataframe
-                cursor.execute('''SELECT * from user_feedback''')
-                data = cursor.fetchall()
-
-                st.header("**User's Feedback Data**")
-                df = pd.DataFrame(data, columns=['ID', 'Name', 'Email', 'Feedback Score', 'Comments', 'Timestamp'])
-                st.dataframe(df)
-
-                ### query to fetch data from user_feedback(table)
-                query = 'select * from user_feedback'
-                plotfeed_data = pd.read_sql(query, connection)                        
-
-                ### Analyzing All the Data's in pie charts
+            ## Credentials, kept in the session so that paging through the data does not log out again
+            st.session_state['admin_logged_in'] = (ad_user == 'admin' and ad_password == 'admin@resume-analyzer')
+            if not st.session_state['admin_logged_in']:
+                ## For Wrong Credentials
+                st.error("Wrong ID & Password Provided")
 
-                # fetching feed_score from the query and getting the unique values and total value count 
-                labels = plotfeed_data.feed_score.unique()
-                values = plotfeed_data.feed_score.value_counts()
-                
-                # Pie chart for user ratings
-                st.subheader("**User Rating's**")
-                fig = px.pie(values=values, names=labels, title="Chart of User Rating Score From 1 - 5 🤗", color_discrete_sequence=px.colors.sequential.Aggrnyl)
-                st.plotly_chart(fig)
-
-                # fetching Predicted_Field from the query and getting the unique values and total value count                 
-                labels = plot_data.Predicted_Field.unique()
-                values = plot_data.Predicted_Field.value_counts()
-
-                # Pie chart for predicted field recommendations
-                st.subheader("**Pie-Chart for Predicted Field Recommendation**")
-                fig = px.pie(df, values=values, names=labels, title='Predicted Field according to the Skills 👽', color_discrete_sequence=px.colors.sequential.Aggrnyl_r)
-                st.plotly_chart(fig)
-
-                # fetching User_Level from the query and getting the unique values and total value count                 
-                labels = plot_data.User_Level.unique()
-                values = plot_data.User_Level.value_counts()
-
-                # Pie chart for User's👨‍💻 Experienced Level
-                st.subheader("**Pie-Chart for User's Experienced Level**")
-                fig = px.pie(df, values=values, names=labels, title="Pie-Chart 📈 for User's 👨‍💻 Experienced Level", color_discrete_sequence=px.colors.sequential.RdBu)
-                st.plotly_chart(fig)
-
-                # fetching resume_score from the query and getting the unique values and total value count                 
-                labels = plot_data.resume_score.unique()                
-                values = plot_data.resume_score.value_counts()
-
-                # Pie chart for Resume Score
-                st.subheader("**Pie-Chart for Resume Score**")
-                fig = px.pie(df, values=values, names=labels, title='From 1 to 100 💯', color_discrete_sequence=px.colors.sequential.Agsunset)
-                st.plotly_chart(fig)
-
-                # fetching IP_add from the query and getting the unique values and total value count 
-                labels = plot_data.IP_add.unique()
-                values = plot_data.IP_add.value_counts()
-
-                # Pie chart for Users
-                st.subheader("**Pie-Chart for Users App Used Count**")
-                fig = px.pie(df, values=values, names=labels, title='Usage Based On IP Address 👥', color_discrete_sequence=px.colors.sequential.matter_r)
-                st.plotly_chart(fig)
-
-                # fetching City from the query and getting the unique values and total value count 
-                labels = plot_data.City.unique()
-                values = plot_data.City.value_counts()
-
-                # Pie chart for City
-                st.subheader("**Pie-Chart for City**")
-                fig = px.pie(df, values=values, names=labels, title='Usage Based On City 🌆', color_discrete_sequence=px.colors.sequential.Jet)
-                st.plotly_chart(fig)
-
-                # fetching State from the query and getting the unique values and total value count 
-                labels = plot_data.State.unique()
-                values = plot_data.State.value_counts()
-
-                # Pie chart for State
-                st.subheader("**Pie-Chart for State**")
-                fig = px.pie(df, values=values, names=labels, title='Usage Based on State 🚉', color_discrete_sequence=px.colors.sequential.PuBu_r)
-                st.plotly_chart(fig)
-
-                # fetching Country from the query and getting the unique values and total value count 
-                labels = plot_data.Country.unique()
-                values = plot_data.Country.value_counts()
-
-                # Pie chart for Country
-                st.subheader("**Pie-Chart for Country**")
-                fig = px.pie(df, values=values, names=labels, title='Usage Based on Country 🌏', color_discrete_sequence=px.colors.sequential.Purpor_r)
-                st.plotly_chart(fig)
-
-            ## For Wrong Credentials
+        if st.session_state.get('admin_logged_in'):
+            
+            ### Fetch the pre-aggregated counts of every chart (a few rows per category, not the whole history)
+            plot_counts = query_cache.get('analytics_counts', ('user_data', 'user_feedback'), lambda: aggregates.read_counts(db_pool))
+            
+            ### Total Users Count with a Welcome Message
+            values = sum(count for value, count in plot_counts['field'])
+            st.success("Welcome Deepak ! Total %d " % values + " User's Have Used Our Tool : )")                
+            cache_stats = query_cache.stats()
+            st.caption("Dashboard query cache: %.0f%% hit rate (%d hits, %d misses, %d invalidations)" % (cache_stats['hit_rate'] * 100, cache_stats['hits'], cache_stats['misses'], cache_stats['invalidations']))
+            
+            st.header("**User's Data**")
+
+            ### Filters and page size of the grid, changing them starts again from the first page
+            filter_cols = st.columns(4)
+            grid_filters = {
+                'field': filter_cols[0].selectbox('Predicted Field', [''] + [v for v, c in plot_counts['field'] if v], format_func=lambda v: v or 'All'),
+                'level': filter_cols[1].selectbox('User Level', [''] + [v for v, c in plot_counts['level'] if v], format_func=lambda v: v or 'All'),
+                'country': filter_cols[2].selectbox('Country', [''] + [v for v, c in plot_counts['country'] if v], format_func=lambda v: v or 'All'),
+                'search': filter_cols[3].text_input('Search name, mail or file'),
+            }
+            page_size = st.select_slider('Rows per page', options=[25, 50, 100, 250], value=50)
+            if st.session_state.get('grid_filters') != (grid_filters, page_size):
+                st.session_state['grid_filters'] = (grid_filters, page_size)
+                ## last ID before every page visited so far (keyset pagination)
+                st.session_state['grid_pages'] = [0]
+            grid_pages = st.session_state['grid_pages']
+
+            ### Fetch one page of user data from user_data(table) and convert it into dataframe
+            data = admin_data.fetch_page(db_pool, after_id=grid_pages[-1], page_size=page_size, filters=grid_filters)
+            df = pd.DataFrame(data, columns=admin_data.USER_DATA_LABELS)
+            
+            ### Viewing the dataframe
+            st.dataframe(df)
+            prev_col, page_col, next_col = st.columns([1, 2, 1])
+            page_col.caption(f"Page {len(grid_pages)}")
+            if prev_col.button('Previous', disabled=len(grid_pages) == 1):
+                grid_pages.pop()
+                st.experimental_rerun()
+            if next_col.button('Next', disabled=len(data) < page_size):
+                grid_pages.append(data[-1][0])
+                st.experimental_rerun()
+            
+            ### Downloading Report of user_data (with the grid filters): streamed from the database by the preview server
+            ### when one is reachable (RESUME_PREVIEW_URL), otherwise streamed to temporary files served by download buttons
+            export_server = get_preview_server()
+            if export_server is not None:
+                csv_url = export_server.stream_url('User_Data.csv', 'text/csv', functools.partial(admin_data.write_csv, db_pool, filters=grid_filters))
+                parquet_url = export_server.stream_url('User_Data.parquet', 'application/octet-stream', functools.partial(admin_data.write_parquet, db_pool, filters=grid_filters))
+                st.markdown(f'<a href="{csv_url}">Download Report (csv)</a> | <a href="{parquet_url}">Download Report (parquet)</a>', unsafe_allow_html=True)
             else:
-                st.error("Wrong ID & Password Provided")
+                ## written on request to temporary files, chunk by chunk, and served from there: only their
+                ## paths are kept in the session, the files are replaced when the filters change
+                export_files = st.session_state.setdefault('export_files', {})
+                if st.session_state.get('export_filters') != grid_filters:
+                    for export_path in export_files.values():
+                        admin_data.discard_export(export_path)
+                    export_files.clear()
+                    st.session_state['export_filters'] = grid_filters
+                export_cols = st.columns(len(admin_data.EXPORT_FORMATS))
+                for export_col, (export_format, (_, export_ext, export_mime)) in zip(export_cols, admin_data.EXPORT_FORMATS.items()):
+                    if export_format not in export_files and export_col.button(f'Prepare Report ({export_format})'):
+                        export_files[export_format] = admin_data.export_file(db_pool, export_format, filters=grid_filters)
+                    if export_format in export_files and os.path.exists(export_files[export_format]):
+                        with open(export_files[export_format], 'rb') as export_fh:
+                            export_col.download_button(f'Download Report ({export_format})', export_fh, file_name='User_Data' + export_ext, mime=export_mime)
+
+            ### Re-running the field classifier over the stored skills (e.g. after changing the keyword lists)
+            with st.expander("Reclassify the history with the current keyword lists"):
+                apply_reclassify = st.checkbox('Write the new predicted fields to user_data')
+                if st.button('Reclassify'):
+                    field_changes = admin_data.reclassify(db_pool, field_classifier, apply=apply_reclassify)
+                    if apply_reclassify and field_changes:
+                        aggregates.rebuild(db_pool, db_writes)
+                        query_cache.invalidate('user_data')
+                    st.write("%d users would change field" % sum(field_changes.values()) if not apply_reclassify else "%d users changed field" % sum(field_changes.values()))
+                    st.dataframe(pd.DataFrame([(old, new, n) for (old, new), n in field_changes.most_common()], columns=['Previous Field', 'New Field', 'Users']))
+
+            ### Fetch feedback data from user_feedback(table) and convert it into dataframe
+            data = query_cache.get('admin_feedback', ('user_feedback',), lambda: db_pool.fetchall('''SELECT * from user_feedback'''))
+
+            st.header("**User's Feedback Data**")
+            df = pd.DataFrame(data, columns=['ID', 'Name', 'Email', 'Feedback Score', 'Comments', 'Timestamp'])
+            st.dataframe(df)
+
+            ### Analyzing All the Data's in pie charts
+
+            # fetching the feed_score categories and their counts from the aggregates
+            labels = [value for value, count in plot_counts['rating']]
+            values = [count for value, count in plot_counts['rating']]
+            
+            # Pie chart for user ratings
+            st.subheader("**User Rating's**")
+            fig = px.pie(values=values, names=labels, title="Chart of User Rating Score From 1 - 5 🤗", color_discrete_sequence=px.colors.sequential.Aggrnyl)
+            st.plotly_chart(fig)
+
+            # fetching the Predicted_Field categories and their counts from the aggregates
+            labels = [value for value, count in plot_counts['field']]
+            values = [count for value, count in plot_counts['field']]
+
+            # Pie chart for predicted field recommendations
+            st.subheader("**Pie-Chart for Predicted Field Recommendation**")
+            fig = px.pie(values=values, names=labels, title='Predicted Field according to the Skills 👽', color_discrete_sequence=px.colors.sequential.Aggrnyl_r)
+            st.plotly_chart(fig)
+
+            # fetching the User_Level categories and their counts from the aggregates
+            labels = [value for value, count in plot_counts['level']]
+            values = [count for value, count in plot_counts['level']]
+
+            # Pie chart for User's👨‍💻 Experienced Level
+            st.subheader("**Pie-Chart for User's Experienced Level**")
+            fig = px.pie(values=values, names=labels, title="Pie-Chart 📈 for User's 👨‍💻 Experienced Level", color_discrete_sequence=px.colors.sequential.RdBu)
+            st.plotly_chart(fig)
+
+            # fetching the resume_score categories and their counts from the aggregates
+            labels = [value for value, count in plot_counts['score']]
+            values = [count for value, count in plot_counts['score']]
+
+            # Pie chart for Resume Score
+            st.subheader("**Pie-Chart for Resume Score**")
+            fig = px.pie(values=values, names=labels, title='From 1 to 100 💯', color_discrete_sequence=px.colors.sequential.Agsunset)
+            st.plotly_chart(fig)
+
+            # fetching the IP_add categories and their counts from the aggregates
+            labels = [value for value, count in plot_counts['ip']]
+            values = [count for value, count in plot_counts['ip']]
+
+            # Pie chart for Users
+            st.subheader("**Pie-Chart for Users App Used Count**")
+            fig = px.pie(values=values, names=labels, title='Usage Based On IP Address 👥', color_discrete_sequence=px.colors.sequential.matter_r)
+            st.plotly_chart(fig)
+
+            # fetching the City categories and their counts from the aggregates
+            labels = [value for value, count in plot_counts['city']]
+            values = [count for value, count in plot_counts['city']]
+
+            # Pie chart for City
+            st.subheader("**Pie-Chart for City**")
+            fig = px.pie(values=values, names=labels, title='Usage Based On City 🌆', color_discrete_sequence=px.colors.sequential.Jet)
+            st.plotly_chart(fig)
+
+            # fetching the State categories and their counts from the aggregates
+            labels = [value for value, count in plot_counts['state']]
+            values = [count for value, count in plot_counts['state']]
+
+            # Pie chart for State
+            st.subheader("**Pie-Chart for State**")
+            fig = px.pie(values=values, names=labels, title='Usage Based on State 🚉', color_discrete_sequence=px.colors.sequential.PuBu_r)
+            st.plotly_chart(fig)
+
+            # fetching the Country categories and their counts from the aggregates
+            labels = [value for value, count in plot_counts['country']]
+            values = [count for value, count in plot_counts['country']]
+
+            # Pie chart for Country
+            st.subheader("**Pie-Chart for Country**")
+            fig = px.pie(values=values, names=labels, title='Usage Based on Country 🌏', color_discrete_sequence=px.colors.sequential.Purpor_r)
+            st.plotly_chart(fig)
+
 
 # Calling the main (run()) function to make the whole process run
 run()
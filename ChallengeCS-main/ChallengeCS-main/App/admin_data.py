@@ -0,0 +1,248 @@
+###### Admin views of the user_data table ######
+
+# The grid reads one page at a time with keyset pagination (ID > last
+# seen ID, never OFFSET) and the exports stream rows from an unbuffered
+# server-side cursor, so neither ever holds the whole table in memory.
+# Without a reachable streaming endpoint, exports are streamed to a
+# temporary file under RESUME_EXPORT_DIR that the page serves.
+
+import io
+import os
+import csv
+import tempfile
+import collections
+import pymysql
+
+# (select expression, column label) of every column shown to the admin
+USER_DATA_COLUMNS = [
+    ('ID', 'ID'),
+    ('sec_token', 'Token'),
+    ('ip_add', 'IP Address'),
+    ('act_name', 'Name'),
+    ('act_mail', 'Mail'),
+    ('act_mob', 'Mobile Number'),
+    ('convert(Predicted_Field using utf8)', 'Predicted Field'),
+    ('Timestamp', 'Timestamp'),
+    ('Name', 'Predicted Name'),
+    ('Email_ID', 'Predicted Mail'),
+    ('resume_score', 'Resume Score'),
+    ('Page_no', 'Total Page'),
+    ('pdf_name', 'File Name'),
+    ('convert(User_level using utf8)', 'User Level'),
+    ('convert(Actual_skills using utf8)', 'Actual Skills'),
+    ('convert(Recommended_skills using utf8)', 'Recommended Skills'),
+    ('convert(Recommended_courses using utf8)', 'Recommended Course'),
+    ('city', 'City'),
+    ('state', 'State'),
+    ('country', 'Country'),
+    ('latlong', 'Lat Long'),
+    ('os_name_ver', 'Server OS'),
+    ('host_name', 'Server Name'),
+    ('dev_user', 'Server User'),
+]
+
+USER_DATA_LABELS = [label for _, label in USER_DATA_COLUMNS]
+
+# filter name -> column it is compared with for equality
+EQUALITY_FILTERS = {
+    'field': 'Predicted_Field',
+    'level': 'User_level',
+    'country': 'country',
+}
+
+# columns searched by the free-text filter
+SEARCH_COLUMNS = ['act_name', 'act_mail', 'Name', 'Email_ID', 'pdf_name']
+
+
+def where_clause(filters=None, after_id=None):
+    '''
+    Helper function to turn the grid filters into SQL
+
+    :param filters: dictionary with any of the `EQUALITY_FILTERS` keys
+                    and 'search'; empty values are ignored
+    :param after_id: only rows with a larger ID (keyset pagination)
+    :return: tuple of (sql starting with ' WHERE' or empty, arguments)
+    '''
+    filters = filters or {}
+    conditions, args = [], []
+    for name, column in sorted(EQUALITY_FILTERS.items()):
+        if filters.get(name):
+            conditions.append(column + ' = %s')
+            args.append(filters[name])
+    if filters.get('search'):
+        pattern = '%' + filters['search'].replace('\\', '\\\\') \
+            .replace('%', '\\%').replace('_', '\\_') + '%'
+        conditions.append('(' + ' OR '.join(c + ' LIKE %s'
+                                             for c in SEARCH_COLUMNS) + ')')
+        args.extend([pattern] * len(SEARCH_COLUMNS))
+    if after_id is not None:
+        conditions.append('ID > %s')
+        args.append(after_id)
+    if not conditions:
+        return '', args
+    return ' WHERE ' + ' AND '.join(conditions), args
+
+
+def _select(filters=None, after_id=None):
+    where, args = where_clause(filters, after_id)
+    sql = ('SELECT ' + ', '.join(expr for expr, _ in USER_DATA_COLUMNS)
+           + ' FROM user_data' + where + ' ORDER BY ID')
+    return sql, args
+
+
+def fetch_page(pool, after_id=0, page_size=50, filters=None):
+    '''
+    One page of the grid
+
+    :param after_id: ID of the last row of the previous page, 0 for the
+                     first page
+    :return: list of row tuples in `USER_DATA_COLUMNS` order; the ID of
+             the last row is the `after_id` of the next page
+    '''
+    sql, args = _select(filters, after_id)
+    return pool.fetchall(sql + ' LIMIT %s', args + [page_size])
+
+
+def iter_rows(pool, filters=None, chunk_rows=1000):
+    '''
+    Stream the filtered table in chunks through an unbuffered cursor
+
+    :return: generator of lists of at most `chunk_rows` row tuples
+    '''
+    sql, args = _select(filters)
+    return _iter_query(pool, sql, args, chunk_rows)
+
+
+def _iter_query(pool, sql, args, chunk_rows):
+    with pool.connection() as conn:
+        cursor = conn.cursor(pymysql.cursors.SSCursor)
+        try:
+            cursor.execute(sql, args)
+            while True:
+                rows = cursor.fetchmany(chunk_rows)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            # an unbuffered result must be drained before the
+            # connection can be reused
+            cursor.close()
+
+
+def write_csv(pool, fh, filters=None, chunk_rows=1000):
+    '''
+    Write the filtered table as csv to a binary file object, one chunk
+    at a time
+
+    :return: number of rows written
+    '''
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(USER_DATA_LABELS)
+    count = 0
+    for rows in iter_rows(pool, filters, chunk_rows):
+        writer.writerows(rows)
+        count += len(rows)
+        fh.write(buffer.getvalue().encode('utf-8'))
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        fh.write(buffer.getvalue().encode('utf-8'))
+    return count
+
+
+def write_parquet(pool, fh, filters=None, chunk_rows=10000):
+    '''
+    Write the filtered table as parquet, one row group per chunk
+
+    :return: number of rows written
+    '''
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    schema = pa.schema([pa.field('ID', pa.int64())] + [
+        pa.field(label, pa.string()) for label in USER_DATA_LABELS[1:]])
+    count = 0
+    with pq.ParquetWriter(fh, schema) as writer:
+        for rows in iter_rows(pool, filters, chunk_rows):
+            columns = list(zip(*rows))
+            arrays = [pa.array(columns[0], pa.int64())] + [
+                pa.array([None if v is None else str(v) for v in column],
+                         pa.string())
+                for column in columns[1:]]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            count += len(rows)
+    return count
+
+
+# format -> (writer, file extension, content type)
+EXPORT_FORMATS = collections.OrderedDict([
+    ('csv', (write_csv, '.csv', 'text/csv')),
+    ('parquet', (write_parquet, '.parquet', 'application/octet-stream')),
+])
+
+DEFAULT_EXPORT_DIR = os.environ.get(
+    'RESUME_EXPORT_DIR', os.path.join(tempfile.gettempdir(), 'resume_exports'))
+
+
+def export_file(pool, fmt, filters=None, directory=DEFAULT_EXPORT_DIR):
+    '''
+    Stream the filtered table to a new temporary file, chunk by chunk
+
+    :param fmt: one of `EXPORT_FORMATS`
+    :return: path of the file; remove it with `discard_export`
+    '''
+    write, extension, _ = EXPORT_FORMATS[fmt]
+    os.makedirs(directory, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=extension, prefix='User_Data_',
+                                dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            write(pool, fh, filters=filters)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+def discard_export(path):
+    '''
+    Helper function to remove a file written by `export_file`
+    '''
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def reclassify(pool, classifier, apply=False, chunk_rows=5000):
+    '''
+    Run the field classifier again over the stored skills of every user,
+    e.g. after the keyword lists changed
+
+    :param classifier: object of `field_classifier.FieldClassifier`
+    :param apply: also write the new fields to user_data
+    :return: Counter of (previous field, new field) -> number of users
+             whose field changes
+    '''
+    import pandas as pd
+    changes = collections.Counter()
+    updates = []
+    sql = ('SELECT ID, convert(Predicted_Field using utf8), '
+           'convert(Actual_skills using utf8) FROM user_data ORDER BY ID')
+    for rows in _iter_query(pool, sql, None, chunk_rows):
+        frame = pd.DataFrame(rows, columns=['ID', 'Previous', 'Skills'])
+        frame = frame.set_index('ID')
+        frame['New'] = classifier.classify_frame(frame['Skills'])['Predicted_Field']
+        # a NULL field is reported as '' rather than NaN
+        frame['Previous'] = frame['Previous'].fillna('')
+        changed = frame[frame['Previous'] != frame['New']]
+        for previous, new in zip(changed['Previous'], changed['New']):
+            changes[(previous, new)] += 1
+        updates.extend(zip(changed['New'], changed.index.tolist()))
+    if apply and updates:
+        with pool.cursor() as cursor:
+            for start in range(0, len(updates), chunk_rows):
+                cursor.executemany(
+                    'UPDATE user_data SET Predicted_Field = %s WHERE ID = %s',
+                    updates[start:start + chunk_rows])
+    return changes
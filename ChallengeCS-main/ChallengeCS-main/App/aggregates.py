@@ -0,0 +1,182 @@
+###### Pre-aggregated counts for the Admin dashboard ######
+
+# The Admin pie charts only need "how many rows per value" of a handful of
+# columns. Those counts live in `analytics_counts`, one row per
+# (dimension, value), and are bumped in the same transaction that writes
+# new rows (see `storage.WriteBehindQueue.add_listener`). The dashboard
+# then reads O(number of categories) rows instead of the whole history;
+# `rebuild` recomputes the table from scratch, e.g. after manual edits.
+# The counts are derived data: when they cannot be updated the new rows
+# are written anyway and the counts are rebuilt later.
+#
+#     python aggregates.py        # rebuild the counts
+
+import logging
+import threading
+import collections
+
+logger = logging.getLogger(__name__)
+
+AGGREGATES_TABLE = 'analytics_counts'
+
+# dimension -> (source table, index in the inserted row, source column)
+DIMENSIONS = collections.OrderedDict([
+    ('field', ('user_data', 17, 'convert(Predicted_Field using utf8)')),
+    ('level', ('user_data', 18, 'convert(User_level using utf8)')),
+    ('score', ('user_data', 14, 'resume_score')),
+    ('ip', ('user_data', 1, 'ip_add')),
+    ('city', ('user_data', 6, 'city')),
+    ('state', ('user_data', 7, 'state')),
+    ('country', ('user_data', 8, 'country')),
+    ('rating', ('user_feedback', 2, 'feed_score')),
+])
+
+CREATE_SQL = '''CREATE TABLE IF NOT EXISTS ''' + AGGREGATES_TABLE + ''' (
+    dimension VARCHAR(16) NOT NULL,
+    value VARCHAR(255) NOT NULL,
+    count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (dimension, value)
+)'''
+
+
+def _value(value):
+    return '' if value is None else str(value)[:255]
+
+
+# set when a flush could not update the counts, see `install`
+_stale = threading.Event()
+
+
+def ensure_table(cursor):
+    cursor.execute(CREATE_SQL)
+
+
+def apply_rows(cursor, table, rows):
+    '''
+    Add freshly inserted rows to the counts; signature of a
+    `WriteBehindQueue` listener
+
+    :param table: table the rows were inserted into
+    :param rows: list of inserted value tuples (without the ID)
+    '''
+    counts = collections.Counter()
+    for dimension, (source, index, _) in DIMENSIONS.items():
+        if source != table:
+            continue
+        for row in rows:
+            counts[(dimension, _value(row[index]))] += 1
+    if not counts:
+        return
+    args = []
+    for (dimension, value), count in counts.items():
+        args.extend((dimension, value, count))
+    # a failure only undoes the counts, the source rows are still written
+    cursor.execute('SAVEPOINT aggregates')
+    try:
+        cursor.execute(
+            'INSERT INTO ' + AGGREGATES_TABLE + ' (dimension, value, count) VALUES '
+            + ','.join(['(%s,%s,%s)'] * len(counts))
+            + ' ON DUPLICATE KEY UPDATE count = count + VALUES(count)',
+            args
+        )
+    except Exception:
+        # raises in turn when the transaction itself is gone (deadlock,
+        # lost connection), and the queue retries the whole flush
+        cursor.execute('ROLLBACK TO SAVEPOINT aggregates')
+        logger.exception('could not update %s, it will be rebuilt',
+                         AGGREGATES_TABLE)
+        _stale.set()
+
+
+def rebuild(pool, write_queue=None):
+    '''
+    Recompute every count from the source tables (compaction job). Held
+    under `write_queue.exclusive()` so that no flush is counted twice.
+
+    :return: number of (dimension, value) rows written
+    '''
+    def _rebuild():
+        with pool.cursor() as cursor:
+            ensure_table(cursor)
+            cursor.execute('DELETE FROM ' + AGGREGATES_TABLE)
+            total = 0
+            for dimension, (source, _, column) in DIMENSIONS.items():
+                total += cursor.execute(
+                    'INSERT INTO ' + AGGREGATES_TABLE + ' (dimension, value, count) '
+                    'SELECT %s, COALESCE(LEFT(' + column + ', 255), \'\'), COUNT(*) '
+                    'FROM ' + source + ' GROUP BY 2',
+                    (dimension,)
+                )
+            return total
+
+    if write_queue is None:
+        return _rebuild()
+    with write_queue.exclusive():
+        return _rebuild()
+
+
+def read_counts(pool, dimensions=None):
+    '''
+    :param dimensions: names to read, all of `DIMENSIONS` by default
+    :return: dictionary of dimension -> list of (value, count), largest first
+    '''
+    dimensions = list(dimensions or DIMENSIONS)
+    rows = pool.fetchall(
+        'SELECT dimension, value, count FROM ' + AGGREGATES_TABLE
+        + ' WHERE dimension IN (' + ','.join(['%s'] * len(dimensions)) + ')'
+        + ' AND count > 0 ORDER BY dimension, count DESC, value',
+        dimensions
+    )
+    result = dict((dimension, []) for dimension in dimensions)
+    for dimension, value, count in rows:
+        result[dimension].append((value, count))
+    return result
+
+
+_installed = set()
+_install_lock = threading.Lock()
+
+
+def install(pool, write_queue):
+    '''
+    Create the table, filled from the history, if it does not exist yet,
+    then keep the counts current with every flush of `write_queue`. The
+    listener is only registered once the table is in place, so a missing
+    table never fails the inserts. Cheap to call on every rerun; a
+    database error is logged and retried on the next call, as is the
+    rebuild after a flush that could not update the counts.
+
+    :return: True once the table is in place
+    '''
+    with _install_lock:
+        if ('table', id(pool)) in _installed:
+            if _stale.is_set():
+                _stale.clear()
+                try:
+                    rebuild(pool, write_queue)
+                except Exception:
+                    _stale.set()
+                    logger.exception('could not rebuild %s', AGGREGATES_TABLE)
+            return True
+        try:
+            # no flush runs until the listener counts the new rows
+            with write_queue.exclusive():
+                with pool.cursor() as cursor:
+                    ensure_table(cursor)
+                    cursor.execute('SELECT COUNT(*) FROM ' + AGGREGATES_TABLE)
+                    empty = cursor.fetchone()[0] == 0
+                if empty:
+                    rebuild(pool)
+                if ('listener', id(write_queue)) not in _installed:
+                    write_queue.add_listener(apply_rows)
+                    _installed.add(('listener', id(write_queue)))
+        except Exception:
+            logger.exception('could not set up %s', AGGREGATES_TABLE)
+            return False
+        _installed.add(('table', id(pool)))
+        return True
+
+
+if __name__ == '__main__':
+    from storage import get_pool, get_write_queue
+    print('%d counts rebuilt' % rebuild(get_pool(), get_write_queue()))
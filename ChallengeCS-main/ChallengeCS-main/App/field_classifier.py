@@ -0,0 +1,156 @@
+###### Job field prediction from the extracted skills ######
+
+# A skill counts for a field when one of the field's keywords is part of
+# the skill or the skill is part of a keyword (the old `k in s or s in k`
+# test). Both directions are answered from indexes built once: every
+# substring of every keyword for "skill in keyword", and the keywords by
+# length for "keyword in skill", so classifying costs a few dictionary
+# lookups per skill whatever the number of fields and keywords. All fields
+# are scored together and returned ranked.
+
+import ast
+import collections
+
+JobField = collections.namedtuple('JobField',
+                                  ['name', 'keywords', 'recommended_skills'])
+
+JOB_FIELDS = [
+    JobField('Data Science',
+             ['tensorflow', 'keras', 'pytorch', 'machine learning', 'deep learning', 'flask', 'streamlit'],
+             ['Data Visualization', 'Predictive Analysis', 'Statistical Modeling', 'Data Mining',
+              'Clustering & Classification', 'Data Analytics', 'Quantitative Analysis',
+              'Web Scraping', 'ML Algorithms', 'Keras', 'Pytorch', 'Tensorflow', 'Scikit-learn', 'Streamlit']),
+    JobField('Web Development',
+             ['react', 'django', 'node js', 'react js', 'php', 'laravel', 'magento', 'wordpress', 'javascript', 'angular js', 'c#', 'asp.net', 'flask'],
+             ['React', 'Django', 'Node JS', 'Laravel', 'PHP', 'WordPress', 'Angular JS', 'Flask', 'JavaScript']),
+    JobField('Android Development',
+             ['android', 'flutter', 'kotlin', 'xml', 'kivy'],
+             ['Kotlin', 'Flutter', 'XML', 'Java', 'Kivy', 'SDK', 'SQLite']),
+    JobField('iOS Development',
+             ['ios', 'swift', 'cocoa', 'xcode'],
+             ['Swift', 'Cocoa', 'Xcode', 'Objective-C', 'UIKit', 'StoreKit']),
+    JobField('UI/UX Design',
+             ['ux', 'adobe xd', 'figma', 'zeplin', 'balsamiq', 'ui', 'prototyping', 'wireframes', 'photoshop', 'illustrator', 'after effects', 'indesign', 'user experience'],
+             ['Figma', 'Adobe XD', 'Prototyping', 'Wireframes', 'User Research', 'Photoshop', 'Illustrator']),
+]
+
+
+def parse_skills(value):
+    '''
+    Helper function to read a skills column of user_data, stored as the
+    str() of a python list
+
+    :return: list of skills
+    '''
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    if not value:
+        return []
+    try:
+        skills = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return []
+    return list(skills) if isinstance(skills, (list, tuple)) else []
+
+
+class FieldClassifier(object):
+    '''
+    Scores every field by the number of distinct skills that match one of
+    its keywords; ties go to the field listed first
+    '''
+
+    def __init__(self, fields=JOB_FIELDS):
+        self.fields = list(fields)
+        self.order = dict((f.name, i) for i, f in enumerate(self.fields))
+        # keyword -> fields, for "keyword in skill"
+        self.__keywords = collections.defaultdict(set)
+        # substring of a keyword -> fields, for "skill in keyword"
+        self.__fragments = collections.defaultdict(set)
+        for field in self.fields:
+            for keyword in field.keywords:
+                keyword = keyword.lower()
+                self.__keywords[keyword].add(field.name)
+                for start in range(len(keyword)):
+                    for stop in range(start + 1, len(keyword) + 1):
+                        self.__fragments[keyword[start:stop]].add(field.name)
+        self.__lengths = sorted(set(len(k) for k in self.__keywords))
+        self.__cache = {}
+
+    def skill_fields(self, skill):
+        '''
+        :return: frozenset of the fields a single skill counts for
+        '''
+        skill = skill.strip().lower()
+        if skill in self.__cache:
+            return self.__cache[skill]
+        fields = set(self.__fragments.get(skill, ())) if skill else set()
+        for length in self.__lengths:
+            if length > len(skill):
+                break
+            for start in range(len(skill) - length + 1):
+                matched = self.__keywords.get(skill[start:start + length])
+                if matched:
+                    fields |= matched
+        fields = frozenset(fields)
+        if len(self.__cache) < 100000:
+            self.__cache[skill] = fields
+        return fields
+
+    def rank(self, skills):
+        '''
+        Score all fields in one pass over the skills
+
+        :param skills: list of extracted skills
+        :return: list of (field name, score) with a score above 0, best first
+        '''
+        scores = collections.Counter()
+        for skill in set(s.strip().lower() for s in skills or ()):
+            for field in self.skill_fields(skill):
+                scores[field] += 1
+        return sorted(scores.items(), key=lambda item: (-item[1], self.order[item[0]]))
+
+    def predict(self, skills):
+        '''
+        :return: name of the best field, or '' when nothing matches
+        '''
+        ranked = self.rank(skills)
+        return ranked[0][0] if ranked else ''
+
+    def field(self, name):
+        return self.fields[self.order[name]]
+
+    def classify_frame(self, skills):
+        '''
+        Vectorized batch mode, e.g. to reclassify the whole history
+
+        :param skills: pandas Series of skill lists (or their str()),
+                       indexed by row id
+        :return: DataFrame indexed like `skills` with one score column
+                 per field and the predicted field in 'Predicted_Field'
+        '''
+        import pandas as pd
+        names = [f.name for f in self.fields]
+        exploded = skills.map(parse_skills).explode().dropna()
+        exploded = exploded.astype(str).str.strip().str.lower()
+        exploded = exploded[exploded != '']
+        pairs = exploded.reset_index().drop_duplicates()
+        pairs.columns = ['row', 'skill']
+        # every distinct skill is looked up once
+        uniques = pairs['skill'].drop_duplicates()
+        lookup = pd.Series([sorted(self.skill_fields(s)) for s in uniques],
+                           index=uniques.values)
+        pairs['field'] = pairs['skill'].map(lookup)
+        pairs = pairs.explode('field').dropna(subset=['field'])
+        if len(pairs):
+            scores = pairs.groupby(['row', 'field']).size().unstack(fill_value=0)
+            scores = scores.reindex(index=skills.index, columns=names, fill_value=0)
+        else:
+            scores = pd.DataFrame(0, index=skills.index, columns=names)
+        # idxmax keeps the first column on ties, which is the field order
+        best = scores.idxmax(axis=1).where(scores.max(axis=1) > 0, '')
+        result = scores.copy()
+        result['Predicted_Field'] = best
+        return result
+
+
+default_classifier = FieldClassifier()
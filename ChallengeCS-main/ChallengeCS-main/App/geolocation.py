@@ -0,0 +1,339 @@
+###### Geolocation of app users ######
+
+# The User page used to call geocoder.ip('me') and Nominatim on every
+# rerun, i.e. two blocking HTTP requests before anything was drawn.
+# Lookups now go through a provider (a local IP-range file by default)
+# on a small thread pool: the page submits the lookup when it renders and
+# only collects the result, with a strict timeout, when the row is
+# written. Results are kept in an in-process LRU shared by all sessions.
+# The address located is the client's one, taken from the forwarded-for
+# header named by RESUME_CLIENT_IP_HEADER when a proxy sets it; without
+# it (or on a Streamlit that does not expose the headers) geolocation
+# resolves the server's own address, as the original page did.
+
+import os
+import abc
+import csv
+import math
+import bisect
+import logging
+import ipaddress
+import threading
+import collections
+from concurrent.futures import Future, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GEO_DIR = os.environ.get(
+    'RESUME_GEO_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'resume_parser', 'geo')
+)
+
+Location = collections.namedtuple('Location',
+                                  ['city', 'state', 'country', 'latlng'])
+
+UNKNOWN = Location('', '', '', None)
+
+
+def _ip_key(ip):
+    '''
+    Helper function to turn an address into a sortable (version, int) key
+
+    :return: tuple, or None for addresses that cannot be located
+    '''
+    try:
+        address = ipaddress.ip_address(ip.strip())
+    except (ValueError, AttributeError):
+        return None
+    if address.is_private or address.is_loopback or address.is_unspecified:
+        return None
+    return address.version, int(address)
+
+
+def client_address(headers, header=None):
+    '''
+    Helper function to read the client address from the request headers
+
+    :param headers: mapping of the request headers, may be None
+    :param header: name of the forwarded-for header, by default
+                   RESUME_CLIENT_IP_HEADER (e.g. X-Forwarded-For)
+    :return: the first address of the header, or None if it is not
+             configured, missing or not an address
+    '''
+    header = header or os.environ.get('RESUME_CLIENT_IP_HEADER')
+    if not header or not headers:
+        return None
+    value = None
+    for name, content in headers.items():
+        if name.lower() == header.lower():
+            value = content
+            break
+    if not value:
+        return None
+    # "client, proxy1, proxy2": the left-most entry is the original client
+    address = value.split(',')[0].strip()
+    try:
+        return str(ipaddress.ip_address(address))
+    except ValueError:
+        return None
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class GeoProvider(abc.ABC):
+    '''
+    Interface of the geolocation backends
+    '''
+
+    @abc.abstractmethod
+    def lookup(self, ip):
+        '''
+        :param ip: address to locate, or 'me' for the public address of
+                   the server (network providers only)
+        :return: object of `Location`, or None when unknown; private and
+                 loopback addresses are unknown to the file provider
+        '''
+
+
+class StubGeoProvider(GeoProvider):
+    '''
+    Fixed answers, for tests and for deployments without a database
+    '''
+
+    def __init__(self, locations=None, default=None):
+        self.locations = dict(locations or {})
+        self.default = default
+
+    def lookup(self, ip):
+        return self.locations.get(ip, self.default)
+
+
+class CityDatabase(object):
+    '''
+    Reverse geocoding from a local csv with the columns
+    city,state,country,latitude,longitude. Rows are sorted by latitude
+    so a lookup only compares the cities of a narrow band.
+    '''
+
+    def __init__(self, path, band=1.0):
+        self.band = band
+        rows = []
+        with open(path, newline='', encoding='utf-8') as fh:
+            for row in csv.DictReader(fh):
+                lat, lng = _float(row.get('latitude')), _float(row.get('longitude'))
+                if lat is None or lng is None:
+                    continue
+                rows.append((lat, lng, Location(row.get('city', ''),
+                                                row.get('state', ''),
+                                                row.get('country', ''),
+                                                [lat, lng])))
+        rows.sort(key=lambda r: r[0])
+        self.__lats = [r[0] for r in rows]
+        self.__rows = rows
+
+    def nearest(self, lat, lng):
+        '''
+        :return: object of `Location` of the closest city within the
+                 latitude band, or None
+        '''
+        lo = bisect.bisect_left(self.__lats, lat - self.band)
+        hi = bisect.bisect_right(self.__lats, lat + self.band)
+        best, best_distance = None, None
+        cos_lat = math.cos(math.radians(lat))
+        for row_lat, row_lng, location in self.__rows[lo:hi]:
+            # equirectangular approximation, plenty for picking a city
+            d_lng = (row_lng - lng + 180) % 360 - 180
+            distance = (row_lat - lat) ** 2 + (d_lng * cos_lat) ** 2
+            if best_distance is None or distance < best_distance:
+                best, best_distance = location, distance
+        return best
+
+
+class IPRangeDatabase(GeoProvider):
+    '''
+    Offline provider backed by a csv of address ranges with the columns
+    start,end,city,state,country,latitude,longitude (IPv4 or IPv6, as
+    found in the free "IP to city" databases). Ranges whose city is
+    empty are completed from an optional `CityDatabase`.
+    '''
+
+    def __init__(self, path, cities=None):
+        self.cities = cities
+        ranges = []
+        with open(path, newline='', encoding='utf-8') as fh:
+            for row in csv.DictReader(fh):
+                start, end = _ip_key(row['start']), _ip_key(row['end'])
+                if start is None or end is None:
+                    continue
+                lat, lng = _float(row.get('latitude')), _float(row.get('longitude'))
+                ranges.append((start, end, Location(
+                    row.get('city', ''), row.get('state', ''),
+                    row.get('country', ''),
+                    [lat, lng] if lat is not None and lng is not None else None
+                )))
+        ranges.sort(key=lambda r: r[0])
+        self.__starts = [r[0] for r in ranges]
+        self.__ranges = ranges
+
+    def lookup(self, ip):
+        key = _ip_key(ip)
+        if key is None:
+            return None
+        index = bisect.bisect_right(self.__starts, key) - 1
+        if index < 0:
+            return None
+        _, end, location = self.__ranges[index]
+        if key > end:
+            return None
+        if not location.city and location.latlng and self.cities:
+            city = self.cities.nearest(*location.latlng)
+            if city is not None:
+                location = location._replace(city=city.city,
+                                             state=location.state or city.state)
+        return location
+
+
+class NetworkGeoProvider(GeoProvider):
+    '''
+    The former behaviour, geocoder.ip followed by a Nominatim reverse
+    lookup; only used when explicitly configured
+    '''
+
+    def __init__(self, user_agent='http', timeout=5):
+        import geocoder
+        from geopy.geocoders import Nominatim
+        self.__geocoder = geocoder
+        self.__geolocator = Nominatim(user_agent=user_agent, timeout=timeout)
+
+    def lookup(self, ip):
+        # private addresses are located through the server's public one
+        latlng = self.__geocoder.ip(ip if _ip_key(ip) else 'me').latlng
+        if not latlng:
+            return None
+        location = self.__geolocator.reverse(latlng, language='en')
+        address = location.raw['address'] if location else {}
+        return Location(address.get('city', ''), address.get('state', ''),
+                        address.get('country', ''), latlng)
+
+
+class GeoResolver(object):
+    '''
+    Non-blocking front end of a provider: `submit` starts a lookup in
+    the background, `result` waits at most `timeout` seconds for it and
+    answers `UNKNOWN` otherwise. Answers (including misses) are kept in
+    an LRU of `cache_size` addresses.
+    '''
+
+    def __init__(self, provider, timeout=0.25, cache_size=4096, max_workers=2):
+        self.provider = provider
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.__cache = collections.OrderedDict()
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __cached(self, ip):
+        with self.__lock:
+            if ip in self.__cache:
+                self.__cache.move_to_end(ip)
+                self.hits += 1
+                return self.__cache[ip]
+            self.misses += 1
+        return None
+
+    def __lookup(self, ip):
+        try:
+            location = self.provider.lookup(ip) or UNKNOWN
+        except Exception:
+            # a failing backend is the same as an unknown address, but
+            # it is not cached so that the next session tries again
+            return UNKNOWN
+        with self.__lock:
+            self.__cache[ip] = location
+            self.__cache.move_to_end(ip)
+            while len(self.__cache) > self.cache_size:
+                self.__cache.popitem(last=False)
+        return location
+
+    def submit(self, ip):
+        '''
+        Start locating `ip` without waiting
+
+        :return: `concurrent.futures.Future` resolving to a `Location`
+        '''
+        location = self.__cached(ip)
+        if location is None:
+            return self.__executor.submit(self.__lookup, ip)
+        future = Future()
+        future.set_result(location)
+        return future
+
+    def result(self, future, timeout=None):
+        '''
+        :param future: value returned by `submit`, may be None
+        :return: object of `Location`, `UNKNOWN` if not ready in time
+        '''
+        if future is None:
+            return UNKNOWN
+        try:
+            return future.result(self.timeout if timeout is None else timeout)
+        except Exception:
+            return UNKNOWN
+
+    def stats(self):
+        with self.__lock:
+            entries = len(self.__cache)
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': entries,
+        }
+
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def get_geo_resolver():
+    '''
+    Return the process-wide resolver. RESUME_GEO_PROVIDER selects the
+    backend: 'file' (default; RESUME_GEO_DB and the optional
+    RESUME_GEO_CITIES csv, by default under RESUME_GEO_DIR), 'network'
+    or 'stub'. A missing database falls back to the stub, which locates
+    nothing, with a warning. RESUME_GEO_TIMEOUT bounds the wait in seconds.
+    '''
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            kind = os.environ.get('RESUME_GEO_PROVIDER', 'file')
+            ip_db = os.environ.get('RESUME_GEO_DB',
+                                   os.path.join(DEFAULT_GEO_DIR, 'ip_ranges.csv'))
+            city_db = os.environ.get('RESUME_GEO_CITIES',
+                                     os.path.join(DEFAULT_GEO_DIR, 'cities.csv'))
+            if kind == 'network':
+                provider = NetworkGeoProvider()
+            elif kind == 'file' and os.path.exists(ip_db):
+                cities = CityDatabase(city_db) if os.path.exists(city_db) else None
+                provider = IPRangeDatabase(ip_db, cities)
+            else:
+                if kind == 'file':
+                    logger.warning('no geolocation database at %s, users '
+                                   'will not be located', ip_db)
+                elif kind != 'stub':
+                    logger.warning('unknown RESUME_GEO_PROVIDER %r, users '
+                                   'will not be located', kind)
+                provider = StubGeoProvider()
+            _resolver = GeoResolver(
+                provider,
+                timeout=float(os.environ.get('RESUME_GEO_TIMEOUT', 0.25))
+            )
+    return _resolver
@@ -0,0 +1,110 @@
+###### Background jobs for the Streamlit app ######
+
+# Streamlit re-executes App.py on every interaction, but imported modules
+# stay loaded, so the worker pool and the job table below are shared by
+# every session of the process. A session only keeps the job id in
+# st.session_state and polls the job until its result is ready.
+
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Job(object):
+    '''
+    State of one submitted job. `progress` goes from 0 to 1 as the
+    expected stages report completion.
+    '''
+
+    def __init__(self, stages=()):
+        self.id = uuid.uuid4().hex
+        self.status = 'queued'
+        self.stage = None
+        self.expected = list(stages)
+        self.completed = set()
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.finished = None
+
+    @property
+    def done(self):
+        return self.status in ('done', 'failed')
+
+    @property
+    def progress(self):
+        if self.status == 'done':
+            return 1.0
+        if not self.expected:
+            return 0.0
+        return len(self.completed) / float(len(self.expected))
+
+    def advance(self, stage, seconds=None):
+        '''
+        Progress callback handed to the job function, signature
+        compatible with `utils.timing.StageTimer`
+        '''
+        self.stage = stage
+        if stage in self.expected:
+            self.completed.add(stage)
+
+
+class JobManager(object):
+    '''
+    Runs jobs on a bounded thread pool and keeps finished jobs around
+    for `ttl` seconds so that sessions can collect their results
+    '''
+
+    def __init__(self, max_workers=4, ttl=30 * 60):
+        self.ttl = ttl
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.__jobs = {}
+        self.__lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        '''
+        Run `fn(*args, progress=job.advance, **kwargs)` in the background
+
+        :param stages: optional list of stage names used for progress
+        :return: object of `Job`
+        '''
+        job = Job(kwargs.pop('stages', ()))
+        with self.__lock:
+            self.__expire()
+            self.__jobs[job.id] = job
+        self.__executor.submit(self.__run, job, fn, args, kwargs)
+        return job
+
+    def __run(self, job, fn, args, kwargs):
+        job.status = 'running'
+        try:
+            job.result = fn(*args, progress=job.advance, **kwargs)
+            job.status = 'done'
+        except Exception as exc:
+            job.error = '%s: %s' % (type(exc).__name__, exc)
+            job.status = 'failed'
+        finally:
+            job.finished = time.time()
+
+    def get(self, job_id):
+        with self.__lock:
+            return self.__jobs.get(job_id)
+
+    def __expire(self):
+        now = time.time()
+        for job_id, job in list(self.__jobs.items()):
+            if job.finished is not None and now - job.finished > self.ttl:
+                del self.__jobs[job_id]
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager():
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager()
+    return _manager
@@ -0,0 +1,307 @@
+###### Resume previews for the Streamlit app ######
+
+# Inlining the pdf as a base64 data URI re-sends the whole file (plus a
+# third) on every rerun. Instead the file is published once under its
+# content hash and served by a small http server running next to the
+# app; the page only carries an <iframe> pointing at it, and browsers
+# keep the file in their cache because the URL never changes content.
+# The server is only used when RESUME_PREVIEW_URL says where browsers
+# reach it; otherwise the page shows the text view, and the inline data
+# URI only when the user asks for the original pdf.
+# The text preview pages through `ParsedDocument.pages`, which the
+# analysis has already extracted. The same server streams admin exports
+# through single-use links, so a download never sits in memory.
+
+import os
+import re
+import base64
+import time
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PREVIEW_DIR = os.environ.get(
+    'RESUME_PREVIEW_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'resume_parser',
+                 'previews')
+)
+
+CONTENT_TYPES = {
+    '.pdf': 'application/pdf',
+    '.docx': 'application/vnd.openxmlformats-officedocument.'
+             'wordprocessingml.document',
+    '.doc': 'application/msword',
+}
+
+# /files/<sha256><extension>
+_PATH_RE = re.compile(r'^/files/([0-9a-f]{64})(\.[a-z]{1,5})$')
+# /streams/<token>/<filename>
+_STREAM_RE = re.compile(r'^/streams/([A-Za-z0-9_-]{16,})/[^/]+$')
+
+
+class _StreamWriter(object):
+    '''
+    Write-only file object over the response body that keeps track of
+    its position, which pyarrow asks for
+    '''
+
+    def __init__(self, wfile):
+        self.__wfile = wfile
+        self.__position = 0
+        self.closed = False
+
+    def write(self, data):
+        self.__wfile.write(data)
+        self.__position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.__position
+
+    def flush(self):
+        self.__wfile.flush()
+
+    def close(self):
+        self.closed = True
+
+
+class _PreviewHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        self.__serve(body=True)
+
+    def do_HEAD(self):
+        self.__serve(body=False)
+
+    def __serve(self, body):
+        stream = _STREAM_RE.match(self.path.split('?', 1)[0])
+        if stream is not None:
+            self.__stream(stream.group(1), body)
+            return
+        match = _PATH_RE.match(self.path.split('?', 1)[0])
+        if match is None:
+            self.send_error(404)
+            return
+        digest, extension = match.groups()
+        path = self.server.store.path(digest, extension)
+        if path is None:
+            self.send_error(404)
+            return
+        etag = '"%s"' % digest
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type',
+                         CONTENT_TYPES.get(extension, 'application/octet-stream'))
+        self.send_header('Content-Length', str(os.path.getsize(path)))
+        # content-addressed: the body behind a URL never changes
+        self.send_header('Cache-Control', 'public, max-age=31536000, immutable')
+        self.send_header('ETag', etag)
+        self.end_headers()
+        if body:
+            with open(path, 'rb') as fh:
+                while True:
+                    chunk = fh.read(64 * 1024)
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+
+    def __stream(self, token, body):
+        # a HEAD request does not use up the link
+        entry = self.server.streams.take(token, consume=body)
+        if entry is None:
+            self.send_error(404)
+            return
+        filename, content_type, write = entry
+        # HTTP/1.0 without Content-Length: the body ends when the
+        # connection closes, so nothing has to be buffered
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Disposition',
+                         'attachment; filename="%s"' % filename)
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        if body:
+            write(_StreamWriter(self.wfile))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PreviewStore(object):
+    '''
+    Content-addressed directory of published documents. Writes go
+    through `ParsedDocument.persist_async`, requests for a file that is
+    still being written wait for it.
+    '''
+
+    def __init__(self, directory=DEFAULT_PREVIEW_DIR):
+        self.directory = directory
+        self.__pending = {}
+        self.__lock = threading.Lock()
+
+    def filename(self, digest, extension):
+        return digest + extension
+
+    def publish(self, document):
+        '''
+        Make a document available to the preview server, at most once
+        per content hash
+
+        :param document: object of `ParsedDocument`
+        :return: file name under which the document is served
+        '''
+        extension = document.extension or '.pdf'
+        filename = self.filename(document.sha256, extension)
+        with self.__lock:
+            if filename in self.__pending:
+                return filename
+            if os.path.exists(os.path.join(self.directory, filename)):
+                return filename
+            self.__pending[filename] = document.persist_async(
+                self.directory, filename)
+        return filename
+
+    def path(self, digest, extension, timeout=10):
+        '''
+        :return: path of a published file, or None if it is unknown
+        '''
+        filename = self.filename(digest, extension)
+        with self.__lock:
+            future = self.__pending.get(filename)
+        if future is not None:
+            try:
+                future.result(timeout)
+            except Exception:
+                return None
+            with self.__lock:
+                self.__pending.pop(filename, None)
+        path = os.path.join(self.directory, filename)
+        return path if os.path.exists(path) else None
+
+
+class StreamRegistry(object):
+    '''
+    Single-use download links: each token maps to a function that writes
+    the response body to a file object, and expires after `ttl` seconds
+    '''
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self.__entries = {}
+        self.__lock = threading.Lock()
+
+    def add(self, filename, content_type, write):
+        token = secrets.token_urlsafe(24)
+        with self.__lock:
+            now = time.time()
+            for key, (created, _) in list(self.__entries.items()):
+                if now - created > self.ttl:
+                    del self.__entries[key]
+            self.__entries[token] = (now, (filename, content_type, write))
+        return token
+
+    def take(self, token, consume=True):
+        with self.__lock:
+            if consume:
+                created, entry = self.__entries.pop(token, (None, None))
+            else:
+                created, entry = self.__entries.get(token, (None, None))
+        if entry is None or time.time() - created > self.ttl:
+            return None
+        return entry
+
+
+class PreviewServer(object):
+    '''
+    Serves a `PreviewStore` over http from a daemon thread. `base_url`
+    is what the browser uses; set RESUME_PREVIEW_URL when the app sits
+    behind a proxy that forwards a path to this server.
+    '''
+
+    def __init__(self, store, host='127.0.0.1', port=0, base_url=None):
+        self.store = store
+        self.__httpd = ThreadingHTTPServer((host, port), _PreviewHandler)
+        self.__httpd.daemon_threads = True
+        self.__httpd.store = store
+        self.streams = self.__httpd.streams = StreamRegistry()
+        self.port = self.__httpd.server_address[1]
+        self.base_url = (base_url or 'http://localhost:%d' % self.port).rstrip('/')
+        self.__thread = threading.Thread(target=self.__httpd.serve_forever)
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def url(self, document):
+        '''
+        Publish a document and return the URL it is served from
+        '''
+        return '%s/files/%s' % (self.base_url, self.store.publish(document))
+
+    def stream_url(self, filename, content_type, write):
+        '''
+        Register a single-use download
+
+        :param write: function called with a binary file object, it
+                      writes the body in as many pieces as it likes
+        :return: URL of the download
+        '''
+        token = self.streams.add(filename, content_type, write)
+        return '%s/streams/%s/%s' % (self.base_url, token, filename)
+
+    def shutdown(self):
+        self.__httpd.shutdown()
+        self.__httpd.server_close()
+
+
+def inline_url(document):
+    '''
+    The document as a base64 data URI, for when no preview server is
+    configured; the whole file goes into the page, so only on request
+    '''
+    content_type = CONTENT_TYPES.get(document.extension or '.pdf',
+                                     'application/octet-stream')
+    return 'data:%s;base64,%s' % (content_type,
+                                  base64.b64encode(document.data).decode('ascii'))
+
+
+def text_page(document, page):
+    '''
+    One page of the extracted text layer
+
+    :param page: page number, starting at 1
+    :return: tuple of (page text, number of pages)
+    '''
+    pages = document.pages or ['']
+    page = min(max(page, 1), len(pages))
+    return pages[page - 1].strip('\f'), len(pages)
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def get_preview_server():
+    '''
+    Return the process-wide preview server, configured from the
+    RESUME_PREVIEW_DIR, RESUME_PREVIEW_HOST, RESUME_PREVIEW_PORT and
+    RESUME_PREVIEW_URL environment variables
+
+    :return: None when RESUME_PREVIEW_URL is not set: the server listens
+             on the app host only, so its default URL is unreachable from
+             a remote browser
+    '''
+    global _server
+    if not os.environ.get('RESUME_PREVIEW_URL'):
+        return None
+    with _server_lock:
+        if _server is None:
+            _server = PreviewServer(
+                PreviewStore(),
+                host=os.environ.get('RESUME_PREVIEW_HOST', '127.0.0.1'),
+                port=int(os.environ.get('RESUME_PREVIEW_PORT', 0)),
+                base_url=os.environ.get('RESUME_PREVIEW_URL')
+            )
+    return _server
@@ -0,0 +1,114 @@
+###### Shared cache of dashboard query results ######
+
+# Streamlit reruns the whole page on every interaction (each keystroke in
+# the feedback form included), and every rerun used to query the
+# database again. Results are now kept for `ttl` seconds, shared by all
+# sessions of the process, and dropped as soon as a write to one of the
+# tables they were read from is committed.
+
+import os
+import time
+import threading
+import collections
+
+
+class QueryCache(object):
+    '''
+    TTL cache of query results with per-table invalidation. Every entry
+    records the tables it depends on; `invalidate(table)` drops those
+    entries and bumps the table's generation, so a load that was already
+    running when the write happened is not stored.
+
+    Cached values are shared between sessions and must be treated as
+    read-only.
+    '''
+
+    def __init__(self, ttl=60, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.__entries = collections.OrderedDict()
+        self.__generations = collections.Counter()
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key, tables, loader):
+        '''
+        Return the cached value of `key`, calling `loader()` on a miss
+
+        :param key: hashable identifier of the query (e.g. the sql)
+        :param tables: names of the tables the query reads
+        :param loader: function without arguments running the query
+        '''
+        now = time.time()
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.__entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            generations = tuple(self.__generations[t] for t in tables)
+        value = loader()
+        with self.__lock:
+            if generations == tuple(self.__generations[t] for t in tables):
+                self.__entries[key] = (now + self.ttl, tuple(tables), value)
+                self.__entries.move_to_end(key)
+                while len(self.__entries) > self.max_entries:
+                    self.__entries.popitem(last=False)
+        return value
+
+    def invalidate(self, table):
+        '''
+        Drop every entry that depends on `table`
+        '''
+        with self.__lock:
+            self.__generations[table] += 1
+            stale = [key for key, entry in self.__entries.items()
+                     if table in entry[1]]
+            for key in stale:
+                del self.__entries[key]
+            self.invalidations += 1
+
+    def on_commit(self, table, rows):
+        '''
+        `WriteBehindQueue` commit listener
+        '''
+        self.invalidate(table)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def stats(self):
+        with self.__lock:
+            entries = len(self.__entries)
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'invalidations': self.invalidations,
+            'entries': entries,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_query_cache(write_queue=None):
+    '''
+    Return the process-wide cache, with the TTL from RESUME_QUERY_CACHE_TTL
+    (seconds); when given, `write_queue` invalidates it on every commit
+    '''
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = QueryCache(
+                ttl=float(os.environ.get('RESUME_QUERY_CACHE_TTL', 60))
+            )
+            if write_queue is not None:
+                write_queue.add_listener(_cache.on_commit, after_commit=True)
+    return _cache
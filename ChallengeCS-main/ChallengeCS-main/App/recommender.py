@@ -0,0 +1,101 @@
+###### Course recommendations ######
+
+# The course lists of Courses.py are indexed once at import: every course
+# is tagged with its field and with the skills of that field its title
+# mentions. A recommendation ranks the field's courses by how many of the
+# candidate's missing skills (the skill gap) they cover, keeping the
+# catalog order among equals, so the same resume always gets the same
+# list. The shared lists are never modified.
+
+import re
+import heapq
+import collections
+from Courses import ds_course, web_course, android_course, ios_course, uiux_course
+from field_classifier import JOB_FIELDS
+
+FIELD_COURSES = collections.OrderedDict([
+    ('Data Science', ds_course),
+    ('Web Development', web_course),
+    ('Android Development', android_course),
+    ('iOS Development', ios_course),
+    ('UI/UX Design', uiux_course),
+])
+
+Course = collections.namedtuple('Course',
+                                ['name', 'link', 'field', 'skills', 'position'])
+
+
+def _field_skills(field):
+    '''
+    Helper function listing the skills of a field, lowercase: its
+    keywords and its recommended skills
+    '''
+    return sorted(set(s.lower() for s in field.keywords) |
+                  set(s.lower() for s in field.recommended_skills))
+
+
+class CourseCatalog(object):
+    '''
+    Courses tagged by field and skill, with a per-field inverted index
+    skill -> courses
+    '''
+
+    def __init__(self, field_courses=FIELD_COURSES, fields=JOB_FIELDS):
+        self.skills = {}
+        self.courses = {}
+        self.__index = {}
+        for field in fields:
+            if field.name not in field_courses:
+                continue
+            skills = _field_skills(field)
+            patterns = [(s, re.compile(r'(?<!\w)%s(?!\w)' % re.escape(s)))
+                        for s in skills]
+            courses = []
+            index = collections.defaultdict(list)
+            for position, (name, link) in enumerate(field_courses[field.name]):
+                tags = frozenset(s for s, p in patterns if p.search(name.lower()))
+                course = Course(name, link, field.name, tags, position)
+                courses.append(course)
+                for skill in tags:
+                    index[skill].append(course)
+            self.skills[field.name] = skills
+            self.courses[field.name] = courses
+            self.__index[field.name] = index
+
+    def skill_gap(self, field, candidate_skills):
+        '''
+        :return: set of the field's skills the candidate does not list
+        '''
+        have = set(s.strip().lower() for s in candidate_skills or ())
+        return set(self.skills.get(field, ())) - have
+
+    def recommend(self, field, candidate_skills, k=10):
+        '''
+        Relevance-ranked courses of a field
+
+        :param field: predicted field
+        :param candidate_skills: skills extracted from the resume
+        :param k: number of courses
+        :return: list of at most `k` objects of `Course`, the ones covering
+                 most of the skill gap first, then in catalog order
+        '''
+        courses = self.courses.get(field, [])
+        gap = self.skill_gap(field, candidate_skills)
+        # only the courses tagged with a missing skill can rank above the
+        # catalog order, they come straight from the index
+        relevance = collections.Counter()
+        index = self.__index.get(field, {})
+        for skill in gap:
+            for course in index.get(skill, ()):
+                relevance[course.position] += 1
+        top = heapq.nsmallest(k, relevance, key=lambda p: (-relevance[p], p))
+        ranked = [courses[p] for p in top]
+        for course in courses:
+            if len(ranked) >= k:
+                break
+            if course.position not in relevance:
+                ranked.append(course)
+        return ranked
+
+
+default_catalog = CourseCatalog()
@@ -0,0 +1,192 @@
+###### Resume writing score ######
+
+# The score is the sum of the weights of the sections a resume mentions.
+# The rules are data (`SCORING_RULES`): every section has its aliases,
+# matched case-sensitively as substrings of the text exactly like the old
+# `'X' in resume_text` checks, and the tips shown to the candidate. They
+# are compiled into a single regular expression, so a resume is scanned
+# once instead of once per alias.
+#
+#     python scoring.py resumes/ --docbin-dir ~/.cache/resume_parser/docbins
+
+import re
+import collections
+
+ScoringRule = collections.namedtuple(
+    'ScoringRule', ['name', 'aliases', 'weight', 'added', 'missing'])
+
+ResumeScore = collections.namedtuple('ResumeScore',
+                                     ['score', 'matched', 'missing'])
+
+SCORING_RULES = [
+    ScoringRule('objective', ('Objective', 'Summary'), 6,
+                'Objective/Summary',
+                'Please add your career objective, it will give your career intension to the Recruiters.'),
+    ScoringRule('education', ('Education', 'School', 'College'), 12,
+                'Education Details',
+                'Please add Education. It will give Your Qualification level to the recruiter'),
+    ScoringRule('experience', ('EXPERIENCE', 'Experience'), 16,
+                'Experience',
+                'Please add Experience. It will help you to stand out from crowd'),
+    ScoringRule('internships', ('INTERNSHIPS', 'INTERNSHIP', 'Internships', 'Internship'), 6,
+                'Internships',
+                'Please add Internships. It will help you to stand out from crowd'),
+    ScoringRule('skills', ('SKILLS', 'SKILL', 'Skills', 'Skill'), 7,
+                'Skills',
+                'Please add Skills. It will help you a lot'),
+    ScoringRule('hobbies', ('HOBBIES', 'Hobbies'), 4,
+                'your Hobbies',
+                'Please add Hobbies. It will show your personality to the Recruiters and give the assurance that you are fit for this role or not.'),
+    ScoringRule('interests', ('INTERESTS', 'Interests'), 5,
+                'your Interest',
+                'Please add Interest. It will show your interest other that job.'),
+    ScoringRule('achievements', ('ACHIEVEMENTS', 'Achievements'), 13,
+                'your Achievements ',
+                'Please add Achievements. It will show that you are capable for the required position.'),
+    ScoringRule('certifications', ('CERTIFICATIONS', 'Certifications', 'Certification'), 12,
+                'your Certifications ',
+                'Please add Certifications. It will show that you have done some specialization for the required position.'),
+    ScoringRule('projects', ('PROJECTS', 'PROJECT', 'Projects', 'Project'), 19,
+                'your Projects',
+                'Please add Projects. It will show that you have done work related the required position or not.'),
+]
+
+
+class ResumeScorer(object):
+    '''
+    Scores texts against a rule table compiled into one pattern
+    '''
+
+    def __init__(self, rules=SCORING_RULES):
+        self.rules = list(rules)
+        self.__aliases = collections.defaultdict(set)
+        for rule in self.rules:
+            for alias in rule.aliases:
+                self.__aliases[alias].add(rule.name)
+        self.__ordered = sorted(self.__aliases, key=len, reverse=True)
+        self.__by_start = collections.defaultdict(list)
+        for alias in self.__ordered:
+            self.__by_start[alias[0]].append(alias)
+        # pattern of the aliases still worth looking for, by found sections
+        self.__patterns = {}
+
+    def __pattern(self, found):
+        key = frozenset(found)
+        if key not in self.__patterns:
+            remaining = [a for a in self.__ordered
+                         if not self.__aliases[a] <= key]
+            # a plain alternation of literals (no groups) lets the regex
+            # engine skip ahead to the possible first characters
+            self.__patterns[key] = re.compile(
+                '|'.join(re.escape(a) for a in remaining)) if remaining else None
+        return self.__patterns[key]
+
+    def matched_sections(self, text):
+        '''
+        :return: set of the names of the rules found in `text`
+        '''
+        found = set()
+        wanted = len(self.rules)
+        pos = 0
+        pattern = self.__pattern(found)
+        while pattern is not None and len(found) < wanted:
+            match = pattern.search(text, pos)
+            if match is None:
+                break
+            start = match.start()
+            # every alias starting here, so that overlapping aliases of
+            # different sections are all seen, as with `alias in text`
+            before = len(found)
+            for alias in self.__by_start[text[start]]:
+                if text.startswith(alias, start):
+                    found.update(self.__aliases[alias])
+            if len(found) != before and len(found) < wanted:
+                # sections already found are not searched for again
+                pattern = self.__pattern(found)
+            pos = start + 1
+        return found
+
+    def score(self, text):
+        '''
+        :return: object of `ResumeScore` with the score and the matched
+                 and missing section names, in rule order
+        '''
+        found = self.matched_sections(text or '')
+        matched = [r.name for r in self.rules if r.name in found]
+        missing = [r.name for r in self.rules if r.name not in found]
+        score = sum(r.weight for r in self.rules if r.name in found)
+        return ResumeScore(score, matched, missing)
+
+    def score_many(self, texts):
+        '''
+        Batch API, e.g. to backtest a rule change on stored resumes
+
+        :param texts: iterable of resume texts
+        :return: generator of `ResumeScore`
+        '''
+        for text in texts:
+            yield self.score(text)
+
+
+def summarise(scores, rules=SCORING_RULES):
+    '''
+    Score distribution and per-section hit rate of a batch
+
+    :param scores: list of `ResumeScore`
+    '''
+    total = len(scores)
+    values = sorted(s.score for s in scores)
+    sections = collections.Counter(name for s in scores for name in s.matched)
+    return {
+        'resumes': total,
+        'mean_score': round(sum(values) / total, 2) if total else None,
+        'median_score': values[total // 2] if total else None,
+        'section_hit_rate': dict((r.name, round(sections[r.name] / total, 4)
+                                  if total else None) for r in rules),
+    }
+
+
+default_scorer = ResumeScorer()
+
+
+def score_resume(text):
+    '''
+    Score one resume text with the default rules
+    '''
+    return default_scorer.score(text)
+
+
+def _stored_texts(paths, docbin_dir=None):
+    import os
+    from utils.document import ParsedDocument
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                for name in sorted(names):
+                    if name.lower().endswith(('.pdf', '.docx')):
+                        yield ParsedDocument(os.path.join(root, name)).text
+        else:
+            yield ParsedDocument(path).text
+    if docbin_dir:
+        from utils.docbin_cache import DocBinStore
+        store = DocBinStore(docbin_dir)
+        for digest in store.digests():
+            yield ParsedDocument.from_snapshot(store.snapshot(digest)).text
+
+
+if __name__ == '__main__':
+    import os
+    import sys
+    import json
+    import argparse
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser = argparse.ArgumentParser(
+        description='Score stored resumes with the current rules')
+    parser.add_argument('paths', nargs='*',
+                        help='resume files or directories of resumes')
+    parser.add_argument('--docbin-dir', default=None,
+                        help='also score every resume kept in a DocBin store')
+    args = parser.parse_args()
+    batch = list(default_scorer.score_many(
+        _stored_texts(args.paths, args.docbin_dir)))
+    print(json.dumps(summarise(batch), indent=2))
@@ -0,0 +1,356 @@
+###### Database access for the Streamlit app ######
+
+# Every Streamlit session runs in its own thread, so a single module-level
+# connection/cursor serialised all users (and is not thread-safe to begin
+# with). Reads now borrow a connection from a bounded pool and use their
+# own cursor; inserts are queued and written in multi-row statements by a
+# background thread, so a page never waits on a commit.
+
+import os
+import queue
+import atexit
+import logging
+import threading
+import contextlib
+import pymysql
+
+logger = logging.getLogger(__name__)
+
+# number of %s placeholders after the auto-increment ID of each table
+TABLE_COLUMNS = {
+    'user_data': 23,
+    'user_feedback': 5,
+}
+
+
+def db_config():
+    '''
+    Connection settings, from the RESUME_DB_HOST, RESUME_DB_PORT,
+    RESUME_DB_USER, RESUME_DB_PASSWORD and RESUME_DB_NAME environment
+    variables
+    '''
+    return {
+        'host': os.environ.get('RESUME_DB_HOST', 'localhost'),
+        'port': int(os.environ.get('RESUME_DB_PORT', 3306)),
+        'user': os.environ.get('RESUME_DB_USER', 'root'),
+        'password': os.environ.get('RESUME_DB_PASSWORD', ''),
+        'db': os.environ.get('RESUME_DB_NAME', 'cv'),
+        'charset': 'utf8mb4',
+    }
+
+
+class ConnectionPool(object):
+    '''
+    At most `size` pymysql connections, opened on first use and handed
+    out one at a time; `connection()` waits up to `timeout` seconds for
+    a free one
+    '''
+
+    def __init__(self, size=4, timeout=10, **connect_kwargs):
+        self.size = size
+        self.timeout = timeout
+        self.connect_kwargs = connect_kwargs
+        # None marks a slot whose connection has not been opened yet
+        self.__slots = queue.LifoQueue(maxsize=size)
+        for _ in range(size):
+            self.__slots.put(None)
+
+    @contextlib.contextmanager
+    def connection(self):
+        '''
+        Borrow a connection; the transaction is committed when the block
+        succeeds and rolled back otherwise
+        '''
+        try:
+            conn = self.__slots.get(timeout=self.timeout)
+        except queue.Empty:
+            raise RuntimeError('no database connection available after %ss'
+                               % self.timeout)
+        try:
+            if conn is None:
+                conn = pymysql.connect(**self.connect_kwargs)
+            else:
+                conn.ping(reconnect=True)
+            yield conn
+            conn.commit()
+        except pymysql.err.OperationalError:
+            # the connection is in an unknown state, open a new one next time
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            conn = None
+            raise
+        except BaseException:
+            if conn is not None:
+                conn.rollback()
+            raise
+        finally:
+            self.__slots.put(conn)
+
+    @contextlib.contextmanager
+    def cursor(self):
+        '''
+        A cursor of its own on a pooled connection
+        '''
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+    def fetchall(self, sql, args=None):
+        with self.cursor() as cursor:
+            cursor.execute(sql, args)
+            return cursor.fetchall()
+
+    def close(self):
+        while True:
+            try:
+                conn = self.__slots.get_nowait()
+            except queue.Empty:
+                break
+            if conn is not None:
+                conn.close()
+
+
+def insert_statement(table, rows):
+    '''
+    Helper function to build one multi-row insert for `rows`, in the
+    positional `values (0, %s, ...)` form used by the app
+
+    :return: tuple of (sql, flat list of arguments)
+    '''
+    row_sql = '(0,' + ','.join(['%s'] * TABLE_COLUMNS[table]) + ')'
+    sql = 'insert into ' + table + ' values ' + ','.join([row_sql] * len(rows))
+    args = []
+    for row in rows:
+        if len(row) != TABLE_COLUMNS[table]:
+            raise ValueError('%s expects %d values, got %d'
+                             % (table, TABLE_COLUMNS[table], len(row)))
+        args.extend(row)
+    return sql, args
+
+
+class WriteBehindQueue(object):
+    '''
+    Buffers inserts and writes them from a background thread every
+    `interval` seconds, or as soon as `max_rows` rows are waiting, in
+    statements of at most `max_rows` rows. When the database is
+    unreachable (`OperationalError`) the rows are kept for the next
+    flush; beyond `max_pending` rows the oldest are dropped so an outage
+    cannot exhaust memory. A batch rejected for any other reason (bad
+    data, constraint) is written again row by row and the rows that still
+    fail are logged and dropped, so one bad row cannot block the queue. Pending rows are
+    flushed when the process exits.
+
+    Listeners registered with `add_listener` are called as
+    `listener(cursor, table, rows)` inside the transaction that writes
+    the rows, so derived tables commit (or roll back) together with them.
+    With `after_commit=True` they are called as `listener(table, rows)`
+    once the rows are visible to readers, e.g. to invalidate caches.
+    '''
+
+    def __init__(self, pool, interval=1.0, max_rows=200, max_pending=10000):
+        self.pool = pool
+        self.interval = interval
+        self.max_rows = max_rows
+        self.max_pending = max_pending
+        self.__pending = dict((table, []) for table in TABLE_COLUMNS)
+        self.__lock = threading.Lock()
+        self.__flush_lock = threading.Lock()
+        self.__wake = threading.Event()
+        self.__closed = False
+        self.__listeners = []
+        self.__commit_listeners = []
+        self.rows_written = 0
+        self.batches = 0
+        self.failures = 0
+        self.dropped = 0
+        self.__thread = threading.Thread(target=self.__loop)
+        self.__thread.daemon = True
+        self.__thread.start()
+        atexit.register(self.close)
+
+    def put(self, table, row):
+        '''
+        Queue one row for `table`, returns immediately
+
+        :param row: tuple of column values, without the ID
+        '''
+        if table not in TABLE_COLUMNS:
+            raise ValueError('unknown table: %r' % (table,))
+        with self.__lock:
+            rows = self.__pending[table]
+            rows.append(tuple(row))
+            self.__trim(rows)
+            full = self.__count() >= self.max_rows
+        if full:
+            self.__wake.set()
+
+    def add_listener(self, listener, after_commit=False):
+        if after_commit:
+            self.__commit_listeners.append(listener)
+        else:
+            self.__listeners.append(listener)
+
+    @contextlib.contextmanager
+    def exclusive(self):
+        '''
+        Hold back flushes while the block runs, e.g. while a derived table
+        is rebuilt from scratch
+        '''
+        with self.__flush_lock:
+            yield
+
+    def __count(self):
+        return sum(len(rows) for rows in self.__pending.values())
+
+    def __trim(self, rows):
+        excess = len(rows) - self.max_pending
+        if excess > 0:
+            del rows[:excess]
+            self.dropped += excess
+            logger.warning('write-behind queue full, dropped %d rows', excess)
+
+    def pending(self):
+        with self.__lock:
+            return self.__count()
+
+    def flush(self):
+        '''
+        Write every queued row now
+
+        :return: number of rows written
+        '''
+        with self.__flush_lock:
+            with self.__lock:
+                batches = [(table, rows) for table, rows
+                           in self.__pending.items() if rows]
+                for table, _ in batches:
+                    self.__pending[table] = []
+            written = 0
+            for table, rows in batches:
+                try:
+                    self.__write(table, rows)
+                except pymysql.err.OperationalError:
+                    # connection lost or server gone, worth retrying later
+                    self.failures += 1
+                    logger.exception('could not write %d rows to %s',
+                                     len(rows), table)
+                    self.__requeue(table, rows)
+                    continue
+                except Exception:
+                    # a bad row rolled back the whole batch: write the rows
+                    # one by one and drop only those that still fail
+                    self.failures += 1
+                    logger.exception('batch of %d rows rejected by %s, '
+                                     'retrying row by row', len(rows), table)
+                    written += self.__write_rows(table, rows)
+                    continue
+                written += len(rows)
+                self.__notify(table, rows)
+            self.rows_written += written
+            return written
+
+    def __write(self, table, rows):
+        with self.pool.cursor() as cursor:
+            for start in range(0, len(rows), self.max_rows):
+                chunk = rows[start:start + self.max_rows]
+                cursor.execute(*insert_statement(table, chunk))
+                self.batches += 1
+            for listener in self.__listeners:
+                listener(cursor, table, rows)
+
+    def __write_rows(self, table, rows):
+        written = 0
+        for i, row in enumerate(rows):
+            try:
+                self.__write(table, [row])
+            except pymysql.err.OperationalError:
+                self.failures += 1
+                logger.exception('could not write %d rows to %s',
+                                 len(rows) - i, table)
+                self.__requeue(table, rows[i:])
+                break
+            except Exception:
+                self.dropped += 1
+                logger.exception('dropped row rejected by %s: %r', table, row)
+                continue
+            written += 1
+            self.__notify(table, [row])
+        return written
+
+    def __requeue(self, table, rows):
+        with self.__lock:
+            # the whole transaction was rolled back
+            self.__pending[table][:0] = rows
+            self.__trim(self.__pending[table])
+
+    def __notify(self, table, rows):
+        for listener in self.__commit_listeners:
+            try:
+                listener(table, rows)
+            except Exception:
+                logger.exception('commit listener failed for %s', table)
+
+    def __loop(self):
+        while not self.__closed:
+            self.__wake.wait(self.interval)
+            self.__wake.clear()
+            if self.pending():
+                self.flush()
+
+    def close(self):
+        if self.__closed:
+            return
+        self.__closed = True
+        self.__wake.set()
+        self.__thread.join(self.interval + 5)
+        self.flush()
+
+    def stats(self):
+        return {
+            'pending': self.pending(),
+            'rows_written': self.rows_written,
+            'batches': self.batches,
+            'failures': self.failures,
+            'dropped': self.dropped,
+        }
+
+
+_pool = None
+_write_queue = None
+_lock = threading.Lock()
+
+
+def get_pool():
+    '''
+    Return the process-wide connection pool, sized by RESUME_DB_POOL_SIZE
+    '''
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ConnectionPool(
+                size=int(os.environ.get('RESUME_DB_POOL_SIZE', 4)),
+                **db_config()
+            )
+    return _pool
+
+
+def get_write_queue():
+    '''
+    Return the process-wide write-behind queue, flushed every
+    RESUME_DB_FLUSH_INTERVAL seconds
+    '''
+    global _write_queue
+    pool = get_pool()
+    with _lock:
+        if _write_queue is None:
+            _write_queue = WriteBehindQueue(
+                pool,
+                interval=float(os.environ.get('RESUME_DB_FLUSH_INTERVAL', 1.0))
+            )
+    return _write_queue
@@ -0,0 +1,12 @@
+def percentile(values, q):
+    '''
+    Helper function for nearest-rank percentiles of small samples
+
+    :param values: iterable of numbers
+    :param q: quantile between 0 and 1
+    :return: the percentile, or None for an empty sample
+    '''
+    values = sorted(values)
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
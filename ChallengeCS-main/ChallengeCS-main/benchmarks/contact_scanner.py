@@ -0,0 +1,117 @@
+'''
+Runtime of the contact scanner on adversarial inputs.
+
+Every input family is generated at doubling sizes and scanned with
+`utils.contact_scanner` and, for comparison, with the email and phone
+patterns it replaced. The growth column is the time ratio between the
+two largest sizes: about 2 for a linear scan, about 4 for a quadratic
+one. The legacy patterns are skipped above --legacy-max characters.
+
+    python -m benchmarks.contact_scanner -s 4000 -n 6 -o contacts.json
+'''
+import re
+import sys
+import json
+import time
+import argparse
+from utils.contact_scanner import default_scanner
+from benchmarks import percentile
+
+LEGACY_EMAIL = re.compile(r"([^@|\s]+@[^@]+\.[^@|\s]+)")
+LEGACY_PHONE = re.compile(r"""
+    (?:(?:\+|00)?\d{1,3}[\s\-\(\)]*)?
+    (?:\(?\d{1,4}\)?[\s\-\(\)]*){2,5}
+    (?:\#|x|ext\.?|extension)?\s*\d{0,5}
+""", re.VERBOSE)
+
+# name -> function building an input of about n characters
+FAMILIES = {
+    # one long local part and no domain
+    'local_part': lambda n: 'a' * n,
+    # many @ without a dot after them: `[^@]+\.` retries from each one
+    'at_without_dot': lambda n: ('x@' + 'y' * 30 + ' ') * (n // 33),
+    # a domain that never ends in a valid tld
+    'dotted_domain': lambda n: 'a@' + 'b.' * (n // 2),
+    # a single digit run, longer than any phone number
+    'digit_run': lambda n: '1' * n,
+    # digits and separators, every split of the groups is possible
+    'digit_groups': lambda n: '1 (2) ' * (n // 6),
+    'separators': lambda n: '1' + ' -()' * (n // 4),
+    # url prefixes without a body
+    'url_prefixes': lambda n: 'http://' * (n // 7),
+    # realistic resume header repeated
+    'resume_header': lambda n: ('John Doe john.doe@mail.com +1 (202) 555-0189 '
+                                'https://github.com/jd ') * (n // 80),
+}
+
+
+def _time(function, text, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(text)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def scan(text):
+    return default_scanner.scan(text)
+
+
+def legacy(text):
+    LEGACY_EMAIL.findall(text)
+    LEGACY_PHONE.findall(text)
+
+
+def bench_family(name, start_size, steps, repeat=3, legacy_max=16000):
+    '''
+    Time one input family at `steps` doubling sizes
+
+    :return: dictionary with the per-size timings and growth ratios
+    '''
+    build = FAMILIES[name]
+    rows = []
+    size = start_size
+    for _ in range(steps):
+        text = build(size)
+        row = {'chars': len(text),
+               'scanner_seconds': _time(scan, text, repeat)}
+        if len(text) <= legacy_max:
+            row['legacy_seconds'] = _time(legacy, text, repeat)
+        rows.append(row)
+        size *= 2
+    result = {'family': name, 'sizes': rows}
+    for key in ('scanner_seconds', 'legacy_seconds'):
+        timed = [r[key] for r in rows if key in r]
+        if len(timed) >= 2 and timed[-2] > 0:
+            result[key.replace('seconds', 'growth')] = round(timed[-1] / timed[-2], 2)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('families', nargs='*', default=sorted(FAMILIES),
+                        help='input families, default all')
+    parser.add_argument('-s', '--start-size', type=int, default=4000)
+    parser.add_argument('-n', '--steps', type=int, default=6)
+    parser.add_argument('-r', '--repeat', type=int, default=3)
+    parser.add_argument('--legacy-max', type=int, default=16000)
+    parser.add_argument('-o', '--output', default=None)
+    args = parser.parse_args(argv)
+
+    results = [bench_family(f, args.start_size, args.steps, args.repeat,
+                            args.legacy_max) for f in args.families]
+    growth = [r['scanner_growth'] for r in results if 'scanner_growth' in r]
+    report = {'families': results,
+              'summary': {'max_scanner_growth': max(growth) if growth else None,
+                          'p50_scanner_growth': percentile(growth, 0.5)}}
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as fh:
+            fh.write(payload)
+    else:
+        sys.stdout.write(payload + '\n')
+
+
+if __name__ == '__main__':
+    main()
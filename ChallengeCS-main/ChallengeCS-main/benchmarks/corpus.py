@@ -0,0 +1,277 @@
+'''
+Deterministic generator of synthetic resumes for benchmarking.
+
+The same seed always produces byte-identical files, so timings from
+different runs are comparable. Resumes vary in page count, section
+order/header style and skill density, and are written as PDF (plain
+Type1 text, no external dependencies) or DOCX.
+
+    python -m benchmarks.corpus corpus/ -n 60 --pages 1 2 4 8
+'''
+import os
+import sys
+import json
+import random
+import zipfile
+import argparse
+
+FIRST_NAMES = ['Aarav', 'Maya', 'Lucas', 'Sofia', 'Omar', 'Chen', 'Priya',
+               'Jonas', 'Amara', 'Diego', 'Yuki', 'Fatima', 'Noah', 'Leila']
+LAST_NAMES = ['Sharma', 'Garcia', 'Muller', 'Okafor', 'Nguyen', 'Haddad',
+              'Kowalski', 'Silva', 'Tanaka', 'Ben Ali', 'Smith', 'Ivanova']
+SKILLS = ['python', 'java', 'javascript', 'react', 'django', 'flask', 'sql',
+          'machine learning', 'deep learning', 'tensorflow', 'keras',
+          'pytorch', 'android', 'kotlin', 'swift', 'figma', 'adobe xd',
+          'docker', 'kubernetes', 'aws', 'html', 'css', 'node js', 'php',
+          'data analysis', 'communication', 'leadership', 'excel', 'git']
+FILLER = ['Collaborated with cross-functional teams on delivery',
+          'Maintained documentation and onboarding material',
+          'Participated in code reviews and sprint planning',
+          'Improved reporting for internal stakeholders',
+          'Coordinated releases with the operations team',
+          'Presented results to management every quarter']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Hooli',
+             'Stark Industries', 'Wayne Enterprises', 'Tyrell Systems']
+TITLES = ['Software Engineer', 'Data Scientist', 'Web Developer',
+          'Android Developer', 'UI Designer', 'Research Intern']
+SCHOOLS = ['University of Tunis', 'Stanford University', 'IIT Bombay',
+           'Technical University of Munich', 'National Institute of Science']
+DEGREES = ['Bachelor of Science in Computer Science',
+           'Master of Engineering', 'Diploma in Applied Mathematics',
+           'PhD in Machine Learning']
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep',
+          'Oct', 'Nov', 'Dec']
+SECTIONS = ['summary', 'education', 'experience', 'internships', 'skills',
+            'projects', 'certifications', 'achievements', 'hobbies',
+            'interests']
+HEADER_STYLES = ('upper', 'title', 'colon')
+
+LINES_PER_PAGE = 48
+
+
+def _header(section, style):
+    if style == 'upper':
+        return section.upper()
+    if style == 'colon':
+        return section.title() + ':'
+    return section.title()
+
+
+def _sentence(rng, density):
+    words = rng.choice(FILLER)
+    if rng.random() < density:
+        words += ' using ' + ', '.join(rng.sample(SKILLS, rng.randint(1, 3)))
+    return words
+
+
+def _period(rng):
+    year = rng.randint(2008, 2022)
+    return '%s %d - %s %d' % (rng.choice(MONTHS), year,
+                              rng.choice(MONTHS), year + rng.randint(0, 3))
+
+
+def _section_lines(rng, section, density):
+    if section == 'summary':
+        return [_sentence(rng, density) + '.' for _ in range(2)]
+    if section == 'education':
+        return ['%s - %s' % (rng.choice(DEGREES), rng.choice(SCHOOLS)),
+                _period(rng)]
+    if section in ('experience', 'internships'):
+        lines = ['%s at %s' % (rng.choice(TITLES), rng.choice(COMPANIES)),
+                 _period(rng)]
+        return lines + ['- ' + _sentence(rng, density) for _ in range(3)]
+    if section == 'skills':
+        count = max(2, int(len(SKILLS) * density))
+        return [', '.join(rng.sample(SKILLS, count))]
+    if section == 'projects':
+        return ['Project %d: %s' % (rng.randint(1, 99),
+                                    _sentence(rng, density))]
+    return [_sentence(rng, density * 0.5)]
+
+
+def generate_resume(seed, pages=1, density=0.3):
+    '''
+    Build the text lines of one synthetic resume
+
+    :param seed: seed of the random generator
+    :param pages: target number of pages
+    :param density: probability of a sentence mentioning skills
+    :return: tuple of (list of lines, dictionary describing the layout)
+    '''
+    rng = random.Random(seed)
+    style = rng.choice(HEADER_STYLES)
+    order = ['summary'] + rng.sample(SECTIONS[1:], len(SECTIONS) - 1)
+    name = '%s %s' % (rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES))
+    lines = [
+        name,
+        '%s@example.com' % name.lower().replace(' ', '.'),
+        '+%d %d %03d %03d' % (rng.randint(1, 99), rng.randint(10, 99),
+                             rng.randint(0, 999), rng.randint(0, 999)),
+        '',
+    ]
+    for section in order:
+        lines.append(_header(section, style))
+        lines.extend(_section_lines(rng, section, density))
+        lines.append('')
+    # pad long resumes with further experience/project entries
+    target = pages * LINES_PER_PAGE
+    while len(lines) < target - 6:
+        lines.extend(_section_lines(
+            rng, rng.choice(['experience', 'projects']), density))
+    layout = {'header_style': style, 'section_order': order}
+    return lines, layout
+
+
+def _pdf_escape(line):
+    line = line.encode('latin-1', 'replace').decode('latin-1')
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path, lines):
+    '''
+    Write `lines` as a minimal multi-page pdf with Helvetica text
+    '''
+    pages = [lines[i:i + LINES_PER_PAGE]
+             for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        None,  # page tree, filled in once the page objects are known
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    kids = []
+    for page_lines in pages:
+        stream = ['BT /F1 10 Tf 14 TL 50 790 Td']
+        for line in page_lines:
+            stream.append('(%s) Tj T*' % _pdf_escape(line))
+        stream.append('ET')
+        content = '\n'.join(stream).encode('latin-1')
+        objects.append(b'<< /Length %d >>\nstream\n' % len(content)
+                       + content + b'\nendstream')
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] '
+            b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>'
+            % (len(objects))
+        )
+        kids.append(len(objects))
+    objects[1] = (b'<< /Type /Pages /Kids [%s] /Count %d >>'
+                  % (b' '.join(b'%d 0 R' % k for k in kids), len(kids)))
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        out += b'%010d 00000 n \n' % offset
+    out += (b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+            % (len(objects) + 1, xref))
+    with open(path, 'wb') as fh:
+        fh.write(bytes(out))
+
+
+def _xml_escape(text):
+    return (text.replace('&', '&amp;').replace('<', '&lt;')
+            .replace('>', '&gt;'))
+
+
+def write_docx(path, lines):
+    '''
+    Write `lines` as a minimal docx, with a page break every
+    `LINES_PER_PAGE` lines
+    '''
+    paragraphs = []
+    for i, line in enumerate(lines):
+        run = '<w:r><w:t xml:space="preserve">%s</w:t></w:r>' % \
+            _xml_escape(line)
+        if i and i % LINES_PER_PAGE == 0:
+            run = '<w:r><w:br w:type="page"/></w:r>' + run
+        paragraphs.append('<w:p>%s</w:p>' % run)
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/'
+        'wordprocessingml/2006/main"><w:body>%s</w:body></w:document>'
+        % ''.join(paragraphs)
+    )
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/'
+        'content-types"><Default Extension="rels" ContentType="application/'
+        'vnd.openxmlformats-package.relationships+xml"/><Default '
+        'Extension="xml" ContentType="application/xml"/><Override '
+        'PartName="/word/document.xml" ContentType="application/vnd.'
+        'openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '</Types>'
+    )
+    rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/'
+        '2006/relationships"><Relationship Id="rId1" Type="http://schemas.'
+        'openxmlformats.org/officeDocument/2006/relationships/'
+        'officeDocument" Target="word/document.xml"/></Relationships>'
+    )
+    # fixed timestamps keep the archive byte-identical across runs
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in (('[Content_Types].xml', content_types),
+                           ('_rels/.rels', rels),
+                           ('word/document.xml', document)):
+            info = zipfile.ZipInfo(name, date_time=(2020, 1, 1, 0, 0, 0))
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, data)
+
+
+def generate_corpus(
+    directory,
+    count=30,
+    pages=(1, 2, 4),
+    densities=(0.1, 0.3, 0.6),
+    formats=('pdf', 'docx'),
+    seed=0
+):
+    '''
+    Write `count` synthetic resumes, cycling through every combination
+    of page count, skill density and format
+
+    :param directory: output directory, created if missing
+    :return: list of manifest entries, one per file
+    '''
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    combos = [(p, d, f) for p in pages for d in densities for f in formats]
+    manifest = []
+    for i in range(count):
+        n_pages, density, fmt = combos[i % len(combos)]
+        lines, layout = generate_resume(seed * 100003 + i, n_pages, density)
+        path = os.path.join(directory, 'resume_%04d.%s' % (i, fmt))
+        if fmt == 'pdf':
+            write_pdf(path, lines)
+        else:
+            write_docx(path, lines)
+        entry = {'file': path, 'format': fmt, 'pages': n_pages,
+                 'skill_density': density}
+        entry.update(layout)
+        manifest.append(entry)
+    with open(os.path.join(directory, 'manifest.json'), 'w') as fh:
+        json.dump(manifest, fh, indent=2)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('directory')
+    parser.add_argument('-n', '--count', type=int, default=30)
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--densities', type=float, nargs='+',
+                        default=[0.1, 0.3, 0.6])
+    parser.add_argument('--formats', nargs='+', default=['pdf', 'docx'])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    manifest = generate_corpus(args.directory, args.count, args.pages,
+                               args.densities, args.formats, args.seed)
+    sys.stderr.write('wrote %d resumes to %s\n'
+                     % (len(manifest), args.directory))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+'''
+Latency/accuracy trade-off of the pdf extraction modes.
+
+Every pdf is extracted in each mode of `utils.custom_utils.PDF_MODES`;
+accuracy is the word-level F1 against the full-layout text and the
+share of lines that survive, since section detection works line by
+line.
+
+    python -m benchmarks.pdf_modes resumes/ -r 5 -o pdf_modes.json
+'''
+import os
+import sys
+import json
+import time
+import argparse
+import collections
+from utils.custom_utils import PDF_MODES
+from utils.document import ParsedDocument
+from benchmarks import percentile
+
+
+def word_f1(reference, candidate):
+    '''
+    Helper function to compare two texts as bags of words
+
+    :return: F1 score between 0 and 1
+    '''
+    ref = collections.Counter(reference.split())
+    cand = collections.Counter(candidate.split())
+    overlap = sum((ref & cand).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(cand.values())
+    recall = overlap / sum(ref.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def line_ratio(reference, candidate):
+    ref = set(l.strip() for l in reference.splitlines() if l.strip())
+    cand = set(l.strip() for l in candidate.splitlines() if l.strip())
+    if not ref:
+        return 1.0
+    return len(ref & cand) / len(ref)
+
+
+def bench_file(path, repeat=3):
+    '''
+    Time every extraction mode on one pdf
+
+    :param path: path of the pdf
+    :param repeat: timed runs per mode
+    :return: dictionary of per-mode results
+    '''
+    with open(path, 'rb') as fh:
+        data = fh.read()
+    texts = {}
+    result = {'file': path, 'modes': {}}
+    for mode in PDF_MODES:
+        timings = []
+        for _ in range(repeat):
+            document = ParsedDocument(data, name=path, mode=mode)
+            start = time.perf_counter()
+            texts[mode] = document.text
+            timings.append(time.perf_counter() - start)
+        result['pages'] = document.page_count
+        result['modes'][mode] = {'seconds': min(timings)}
+    reference = texts['layout']
+    for mode in PDF_MODES:
+        result['modes'][mode]['word_f1'] = round(
+            word_f1(reference, texts[mode]), 4)
+        result['modes'][mode]['line_ratio'] = round(
+            line_ratio(reference, texts[mode]), 4)
+    return result
+
+
+def summarise(results):
+    summary = {}
+    for mode in PDF_MODES:
+        rows = [r['modes'][mode] for r in results]
+        base = [r['modes']['layout']['seconds'] for r in results]
+        summary[mode] = {
+            'p50_seconds': percentile([r['seconds'] for r in rows], 0.5),
+            'p95_seconds': percentile([r['seconds'] for r in rows], 0.95),
+            'speedup': round(sum(base) / max(sum(r['seconds'] for r in rows),
+                                             1e-9), 2),
+            'mean_word_f1': round(
+                sum(r['word_f1'] for r in rows) / max(len(rows), 1), 4),
+            'mean_line_ratio': round(
+                sum(r['line_ratio'] for r in rows) / max(len(rows), 1), 4),
+        }
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('paths', nargs='+',
+                        help='pdf files or directories of pdf files')
+    parser.add_argument('-r', '--repeat', type=int, default=3)
+    parser.add_argument('--min-pages', type=int, default=2,
+                        help='only benchmark multi-page documents')
+    parser.add_argument('-o', '--output', default=None)
+    args = parser.parse_args(argv)
+
+    files = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in sorted(names)
+                             if n.lower().endswith('.pdf'))
+        else:
+            files.append(path)
+
+    results = [bench_file(f, args.repeat) for f in files]
+    results = [r for r in results if (r['pages'] or 0) >= args.min_pages]
+    report = {'files': results, 'summary': summarise(results)}
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as fh:
+            fh.write(payload)
+    else:
+        sys.stdout.write(payload + '\n')
+
+
+if __name__ == '__main__':
+    main()
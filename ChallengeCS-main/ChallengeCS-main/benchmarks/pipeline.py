@@ -0,0 +1,186 @@
+'''
+Stage-by-stage benchmark of `ResumeParser`.
+
+Generates (or reuses) a synthetic corpus, parses every resume with the
+models already warm, and reports throughput, p50/p95 latency per stage
+and current and peak memory as JSON. Pass an earlier report with --baseline to get
+the relative change of every p50.
+
+    python -m benchmarks.pipeline -n 60 -o bench.json
+    python -m benchmarks.pipeline --corpus corpus/ --baseline bench.json
+    python -m benchmarks.pipeline --corpus corpus/ --lazy --baseline bench.json
+    python -m benchmarks.pipeline --corpus corpus/ --pages 16 --parallel-pages 4
+'''
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import tracemalloc
+from utils.model_registry import registry, DEFAULT_MODEL
+from utils.model_registry import rss_bytes, peak_rss_bytes
+from utils.timing import StageTimer
+from utils.document import ParsedDocument, shutdown_page_pool
+from pyresparser.resume_parser import ResumeParser, CUSTOM_MODEL
+from pyresparser.resume_parser import PARSER_VERSION
+from benchmarks.corpus import generate_corpus
+from benchmarks import percentile
+
+
+def _latency(values):
+    return {
+        'p50': percentile(values, 0.5),
+        'p95': percentile(values, 0.95),
+        'mean': sum(values) / len(values) if values else None,
+    }
+
+
+def bench_corpus(files, skills_file=None, trace_memory=False, lazy=False,
+                 parallel_pages=None):
+    '''
+    Parse every file once and collect per-stage timings
+
+    :param files: list of manifest entries (dicts with a 'file' key)
+    :param trace_memory: also record the python heap peak per parse,
+                         which slows parsing down noticeably
+    :param lazy: use the section-scoped lazy mode of `ResumeParser`
+    :param parallel_pages: extract long pdfs with their pages spread over
+                           this many processes
+    :return: list of per-file results
+    '''
+    results = []
+    for entry in files:
+        timer = StageTimer()
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        error = None
+        try:
+            document = ParsedDocument(entry['file'],
+                                      parallel=bool(parallel_pages),
+                                      workers=parallel_pages)
+            ResumeParser(document, skills_file, timer=timer, lazy=lazy)
+        except Exception as exc:
+            error = '%s: %s' % (type(exc).__name__, exc)
+        elapsed = time.perf_counter() - start
+        result = dict(entry)
+        result.update({'seconds': elapsed, 'stages': timer.as_dict()})
+        if error:
+            result['error'] = error
+        if trace_memory:
+            result['heap_peak_bytes'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        results.append(result)
+    return results
+
+
+def summarise(results, wall_seconds):
+    ok = [r for r in results if 'error' not in r]
+    stages = {}
+    for result in ok:
+        for name, seconds in result['stages'].items():
+            stages.setdefault(name, []).append(seconds)
+    by_pages = {}
+    for result in ok:
+        by_pages.setdefault(str(result.get('pages')), []).append(
+            result['seconds'])
+    summary = {
+        'documents': len(results),
+        'failed': len(results) - len(ok),
+        'throughput_docs_per_s': round(len(ok) / wall_seconds, 3)
+        if wall_seconds else None,
+        'latency': _latency([r['seconds'] for r in ok]),
+        'stages': dict((k, _latency(v)) for k, v in stages.items()),
+        'latency_by_pages': dict((k, _latency(v))
+                                 for k, v in by_pages.items()),
+        'rss_bytes': rss_bytes(),
+        'peak_rss_bytes': peak_rss_bytes(),
+    }
+    heap = [r['heap_peak_bytes'] for r in ok if 'heap_peak_bytes' in r]
+    if heap:
+        summary['heap_peak_bytes'] = max(heap)
+    return summary
+
+
+def compare(summary, baseline):
+    '''
+    Relative change of every p50 against an earlier summary
+    '''
+    changes = {}
+    old = baseline.get('latency', {}).get('p50')
+    if old:
+        changes['total'] = round(summary['latency']['p50'] / old - 1, 4)
+    for name, stats in summary['stages'].items():
+        old = baseline.get('stages', {}).get(name, {}).get('p50')
+        if old:
+            changes[name] = round(stats['p50'] / old - 1, 4)
+    return changes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--corpus', default=None,
+                        help='directory with a manifest.json; generated '
+                             'into a temporary directory when omitted')
+    parser.add_argument('-n', '--count', type=int, default=30)
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--skills-file', default=None)
+    parser.add_argument('--trace-memory', action='store_true')
+    parser.add_argument('--lazy', action='store_true',
+                        help='run the pipelines only over the sections '
+                             'that need them')
+    parser.add_argument('--parallel-pages', type=int, default=None,
+                        metavar='WORKERS',
+                        help='extract long pdfs with their pages spread '
+                             'over this many processes')
+    parser.add_argument('--baseline', default=None)
+    parser.add_argument('-o', '--output', default=None)
+    args = parser.parse_args(argv)
+
+    if args.corpus and os.path.exists(
+            os.path.join(args.corpus, 'manifest.json')):
+        with open(os.path.join(args.corpus, 'manifest.json')) as fh:
+            manifest = json.load(fh)
+    else:
+        directory = args.corpus or tempfile.mkdtemp(prefix='resume-bench-')
+        manifest = generate_corpus(directory, args.count, args.pages,
+                                   seed=args.seed)
+
+    # model loading is reported separately from parse latency
+    load = registry.warmup(DEFAULT_MODEL, CUSTOM_MODEL)
+    start = time.perf_counter()
+    try:
+        results = bench_corpus(manifest, args.skills_file, args.trace_memory,
+                               args.lazy, args.parallel_pages)
+    finally:
+        shutdown_page_pool()
+    wall = time.perf_counter() - start
+
+    summary = summarise(results, wall)
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'parser_version': PARSER_VERSION,
+        'lazy': args.lazy,
+        'parallel_pages': args.parallel_pages,
+        'model_load': load,
+        'summary': summary,
+        'files': results,
+    }
+    if args.baseline:
+        with open(args.baseline) as fh:
+            report['change_vs_baseline'] = compare(
+                summary, json.load(fh)['summary'])
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as fh:
+            fh.write(payload)
+    else:
+        sys.stdout.write(payload + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,356 @@
+import os
+import sys
+import json
+import argparse
+import traceback
+import collections
+import multiprocessing as mp
+from utils.model_registry import registry, DEFAULT_MODEL
+from utils.document import ParsedDocument, shutdown_page_pool
+from utils.docbin_cache import DocBinStore
+from pyresparser.resume_parser import ResumeParser, CUSTOM_MODEL, reextract
+
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.doc')
+
+# per-worker settings, filled in by `_init_worker`
+_worker_options = {}
+
+
+def _init_worker(skills_file, custom_regex, batch_size, docbin_dir=None):
+    '''
+    Pool initializer: load both pipelines once per worker process
+    '''
+    _worker_options['skills_file'] = skills_file
+    _worker_options['custom_regex'] = custom_regex
+    _worker_options['batch_size'] = batch_size
+    _worker_options['docbin_store'] = \
+        DocBinStore(docbin_dir) if docbin_dir else None
+    registry.warmup(DEFAULT_MODEL, CUSTOM_MODEL)
+
+
+def _error_record(path, exc):
+    return {
+        'file': path,
+        'error': '%s: %s' % (type(exc).__name__, exc),
+        'traceback': traceback.format_exc(),
+    }
+
+
+def _parse_one(path, document, nlp_text=None, custom_nlp_text=None):
+    try:
+        parser = ResumeParser(
+            document,
+            _worker_options.get('skills_file'),
+            _worker_options.get('custom_regex'),
+            nlp_text=nlp_text,
+            custom_nlp_text=custom_nlp_text
+        )
+        store = _worker_options.get('docbin_store')
+        if store is not None:
+            store.save(document.sha256, *parser.get_docs(),
+                       snapshot=document.snapshot())
+        return {'file': path, 'sha256': document.sha256,
+                'data': parser.get_extracted_data()}
+    except Exception as exc:
+        return _error_record(path, exc)
+
+
+def parse_chunk(paths):
+    '''
+    Parse a chunk of resumes, running each spaCy pipeline over the whole
+    chunk with `nlp.pipe`
+
+    :param paths: list of resume paths, or of (path, snapshot, sha256)
+                  for the documents already extracted by `extract_chunk`
+    :return: list of result records, one per path
+    '''
+    results = []
+    documents = []
+    for item in paths:
+        path = item[0] if isinstance(item, tuple) else item
+        try:
+            if isinstance(item, tuple):
+                document = ParsedDocument.from_snapshot(item[1],
+                                                        sha256=item[2])
+            else:
+                document = ParsedDocument(path)
+            # extract up-front so unreadable files are reported per file
+            document.text
+            documents.append((path, document))
+        except Exception as exc:
+            results.append(_error_record(path, exc))
+
+    nlp = registry.get(DEFAULT_MODEL)
+    custom_nlp = registry.get(CUSTOM_MODEL)
+    batch_size = _worker_options.get('batch_size', 8)
+    raw_texts = [document.text for _, document in documents]
+    texts = [' '.join(text.split()) for text in raw_texts]
+    try:
+        nlp_docs = list(nlp.pipe(texts, batch_size=batch_size))
+        custom_docs = list(custom_nlp.pipe(raw_texts, batch_size=batch_size))
+    except Exception:
+        # one bad document must not fail the chunk: go file by file
+        for path, document in documents:
+            results.append(_parse_one(path, document))
+        return results
+
+    for (path, document), nlp_doc, custom_doc in zip(
+            documents, nlp_docs, custom_docs):
+        results.append(_parse_one(path, document, nlp_doc, custom_doc))
+    return results
+
+
+def extract_chunk(paths, page_workers):
+    '''
+    Extract the pdfs of a chunk in this process, the long ones with
+    their pages spread over `page_workers` processes. Pool workers are
+    daemonic and cannot start processes of their own, so page-parallel
+    extraction happens here and the workers only receive the text.
+
+    :return: list of (path, snapshot, sha256), or of the path itself for
+             the files the worker should read (other formats, errors)
+    '''
+    items = []
+    for path in paths:
+        if os.path.splitext(path)[1].lower() != '.pdf':
+            items.append(path)
+            continue
+        try:
+            document = ParsedDocument(path, parallel=True,
+                                      workers=page_workers)
+            items.append((path, document.snapshot(), document.sha256))
+        except Exception:
+            # the worker reads it again and reports the error
+            items.append(path)
+    return items
+
+
+def find_resumes(directory):
+    '''
+    Helper function to list resume files under `directory` in a stable
+    order, so that checkpoints stay meaningful across runs
+    '''
+    resumes = []
+    for root, directories, filenames in os.walk(directory):
+        directories.sort()
+        for filename in sorted(filenames):
+            if os.path.splitext(filename)[1].lower() in RESUME_EXTENSIONS:
+                resumes.append(os.path.join(root, filename))
+    return resumes
+
+
+def load_checkpoint(path):
+    '''
+    Helper function to read the set of files listed in a checkpoint
+
+    :param path: checkpoint (or failures) file, one path per line
+    :return: set of paths
+    '''
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, encoding='utf-8') as fh:
+        return set(line.rstrip('\n') for line in fh if line.strip())
+
+
+def failures_path(checkpoint):
+    '''
+    Helper function to name the file listing the failed files of a
+    checkpoint
+    '''
+    return checkpoint + '.failed' if checkpoint else None
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(
+    resumes,
+    output,
+    checkpoint=None,
+    workers=None,
+    chunk_size=16,
+    max_in_flight=None,
+    batch_size=8,
+    skills_file=None,
+    custom_regex=None,
+    docbin_dir=None,
+    retry_failed=False,
+    parallel_pages=None
+):
+    '''
+    Parse many resumes with a process pool, streaming one JSON line per
+    resume to `output`. Files parsed successfully are listed in
+    `checkpoint` and skipped, so an interrupted run picks up where it
+    stopped; files that failed are listed in `failures_path(checkpoint)`
+    and skipped as well unless `retry_failed` is set.
+
+    :param resumes: iterable of resume paths
+    :param output: path of the JSONL file, appended to
+    :param checkpoint: path of the checkpoint file
+    :param workers: number of worker processes
+    :param chunk_size: resumes per task
+    :param max_in_flight: maximum number of tasks queued at once
+    :param batch_size: `nlp.pipe` batch size
+    :param docbin_dir: when given, the spaCy Docs of every resume are
+                       persisted there for later re-extraction
+    :param retry_failed: parse again the files that failed in a
+                         previous run
+    :param parallel_pages: when given, the pdfs are extracted by this
+                           process, the long ones with their pages spread
+                           over `parallel_pages` processes (see
+                           `extract_chunk`)
+    :return: dictionary with counts of parsed, failed and skipped files
+    '''
+    workers = workers or mp.cpu_count()
+    max_in_flight = max_in_flight or workers * 2
+    done = load_checkpoint(checkpoint)
+    if not retry_failed:
+        done |= load_checkpoint(failures_path(checkpoint))
+    counts = {'parsed': 0, 'failed': 0, 'skipped': 0}
+
+    def pending():
+        for path in resumes:
+            if path in done:
+                counts['skipped'] += 1
+            else:
+                yield path
+
+    pool = mp.Pool(
+        workers,
+        initializer=_init_worker,
+        initargs=(skills_file, custom_regex, batch_size, docbin_dir)
+    )
+    out = open(output, 'a', encoding='utf-8')
+    ckpt = open(checkpoint, 'a', encoding='utf-8') if checkpoint else None
+    failed = open(failures_path(checkpoint), 'a', encoding='utf-8') \
+        if checkpoint else None
+
+    def drain(task):
+        records = task.get()
+        for record in records:
+            out.write(json.dumps(record, default=str) + '\n')
+            counts['failed' if 'error' in record else 'parsed'] += 1
+        out.flush()
+        # only mark files done once their results are on disk; a failed
+        # file is not done, it is parsed again with retry_failed
+        if ckpt is not None:
+            ckpt.write(''.join(r['file'] + '\n' for r in records
+                               if 'error' not in r))
+            ckpt.flush()
+            failed.write(''.join(r['file'] + '\n' for r in records
+                                 if 'error' in r))
+            failed.flush()
+
+    try:
+        in_flight = collections.deque()
+        for chunk in _chunks(pending(), chunk_size):
+            if len(in_flight) >= max_in_flight:
+                drain(in_flight.popleft())
+            if parallel_pages:
+                chunk = extract_chunk(chunk, parallel_pages)
+            in_flight.append(pool.apply_async(parse_chunk, (chunk,)))
+        while in_flight:
+            drain(in_flight.popleft())
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+        if parallel_pages:
+            shutdown_page_pool()
+        out.close()
+        if ckpt is not None:
+            ckpt.close()
+            failed.close()
+    return counts
+
+
+def run_reextract(docbin_dir, output, skills_file=None, custom_regex=None):
+    '''
+    Re-run the rule-based extractors over every stored Doc, streaming
+    one JSON line per resume to `output`; no NLP pipeline is executed
+
+    :param docbin_dir: directory of a `DocBinStore`
+    :param output: path of the JSONL file, appended to
+    :return: dictionary with counts of parsed and failed resumes
+    '''
+    store = DocBinStore(docbin_dir)
+    counts = {'parsed': 0, 'failed': 0}
+    with open(output, 'a', encoding='utf-8') as out:
+        for digest in store.digests():
+            try:
+                record = {
+                    'sha256': digest,
+                    'data': reextract(digest, store, skills_file,
+                                      custom_regex),
+                }
+                counts['parsed'] += 1
+            except Exception as exc:
+                record = _error_record(digest, exc)
+                counts['failed'] += 1
+            out.write(json.dumps(record, default=str) + '\n')
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Parse a directory of resumes into a JSONL file'
+    )
+    parser.add_argument('directory', nargs='?', default='resumes')
+    parser.add_argument('-o', '--output', default='resumes.jsonl')
+    parser.add_argument('--checkpoint', default=None,
+                        help='defaults to <output>.checkpoint')
+    parser.add_argument('--retry-failed', action='store_true',
+                        help='parse again the files that failed in a '
+                             'previous run')
+    parser.add_argument('--parallel-pages', type=int, default=None,
+                        metavar='WORKERS',
+                        help='extract long pdfs with their pages spread '
+                             'over this many processes')
+    parser.add_argument('-w', '--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=16)
+    parser.add_argument('--max-in-flight', type=int, default=None)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--skills-file', default=None)
+    parser.add_argument('--docbin-dir', default=None,
+                        help='persist spaCy Docs here for --reextract')
+    parser.add_argument('--reextract', action='store_true',
+                        help='re-run rule-based extractors over the Docs '
+                             'in --docbin-dir instead of parsing files')
+    args = parser.parse_args(argv)
+
+    if args.reextract:
+        if not args.docbin_dir:
+            parser.error('--reextract needs --docbin-dir')
+        counts = run_reextract(args.docbin_dir, args.output,
+                               args.skills_file)
+        sys.stderr.write(json.dumps(counts) + '\n')
+        return
+
+    counts = run_batch(
+        find_resumes(args.directory),
+        args.output,
+        checkpoint=args.checkpoint or args.output + '.checkpoint',
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        max_in_flight=args.max_in_flight,
+        batch_size=args.batch_size,
+        skills_file=args.skills_file,
+        docbin_dir=args.docbin_dir,
+        retry_failed=args.retry_failed,
+        parallel_pages=args.parallel_pages
+    )
+    sys.stderr.write(json.dumps(counts) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+import threading
+import collections
+from utils.document import ParsedDocument
+from utils.sections import split_sections, section_digest
+from utils.timing import StageTimer
+from pyresparser.resume_parser import (DETAIL_FIELDS, section_fields,
+                                       merge_fields, build_details)
+
+# owners (session or email) whose parser is kept, see `get_incremental_parser`
+MAX_OWNERS = 256
+
+
+class IncrementalParser(object):
+    '''
+    Parses successive revisions of the same resume. The text is split
+    into sections and the results of the NLP extractors (custom entities,
+    name, skills, ORG entities) are kept per section, keyed by the hash of
+    its text: a revision only runs the spaCy pipelines over the sections
+    that changed and reuses the other results. The rule-based extractors
+    (contacts, sections, education, experience) run on the whole text,
+    they cost a fraction of the pipelines.
+
+    Results can differ slightly from `ResumeParser` on entities and
+    skills spanning two sections. With `lazy`, the changed sections go
+    through the pipelines as in the lazy mode of `ResumeParser`.
+    '''
+
+    def __init__(self, skills_file=None, custom_regex=None, max_sections=64,
+                 lazy=False):
+        self.skills_file = skills_file
+        self.custom_regex = custom_regex
+        self.lazy = lazy
+        self.max_sections = max_sections
+        self.__sections = collections.OrderedDict()
+        self.__lock = threading.Lock()
+        self.revisions = 0
+        self.last_stats = {}
+
+    def fields(self, text_raw, timer=None):
+        '''
+        NLP fields of a text, running the pipelines only over the
+        sections not seen before
+
+        :param text_raw: raw text, with its line breaks
+        :return: dictionary returned by `merge_fields`
+        '''
+        timer = timer if timer is not None else StageTimer()
+        with timer.stage('split_sections'):
+            sections = split_sections(text_raw)
+            digests = [section_digest(s) for s in sections]
+        with self.__lock:
+            known = dict((d, self.__sections[d]) for d in digests
+                         if d in self.__sections)
+        # identical sections are analysed once
+        changed = collections.OrderedDict()
+        for section, digest in zip(sections, digests):
+            if digest not in known and digest not in changed:
+                changed[digest] = section
+        if changed:
+            # spans are kept relative to their section, which may move
+            fresh = section_fields(list(changed.values()), self.skills_file,
+                                   timer, self.lazy)
+            known.update(zip(changed, fresh))
+        with self.__lock:
+            for digest in digests:
+                if digest in self.__sections:
+                    self.__sections.move_to_end(digest)
+                else:
+                    self.__sections[digest] = known[digest]
+            while len(self.__sections) > self.max_sections:
+                self.__sections.popitem(last=False)
+        self.last_stats = {'sections': len(sections),
+                           'analysed': len(changed),
+                           'reused': len(sections) - len(changed)}
+        return merge_fields([known[d] for d in digests],
+                            [section.start for section in sections])
+
+    def parse(self, resume, timer=None):
+        '''
+        Parse a revision of the resume
+
+        :param resume: path, buffer or `ParsedDocument` of the resume
+        :param timer: optional `StageTimer` receiving the stage timings
+        :return: dictionary of extracted details, as `ResumeParser`
+        '''
+        timer = timer if timer is not None else StageTimer()
+        if isinstance(resume, ParsedDocument):
+            document = resume
+        else:
+            document = ParsedDocument(resume)
+        with timer.stage('extract_text'):
+            text_raw = document.text
+            text = ' '.join(text_raw.split())
+        fields = self.fields(text_raw, timer)
+        self.revisions += 1
+        return build_details(dict.fromkeys(DETAIL_FIELDS), document, text_raw,
+                             text, fields, self.custom_regex, timer)
+
+
+_parsers = collections.OrderedDict()
+_parsers_lock = threading.Lock()
+
+
+def get_incremental_parser(owner, skills_file=None, custom_regex=None,
+                           lazy=False):
+    '''
+    Return the parser of `owner` (e.g. the candidate's email), creating
+    it on first use; the least recently used owners are dropped beyond
+    `MAX_OWNERS`
+    '''
+    key = (owner, skills_file, custom_regex, lazy)
+    with _parsers_lock:
+        parser = _parsers.get(key)
+        if parser is None:
+            parser = _parsers[key] = IncrementalParser(skills_file,
+                                                       custom_regex,
+                                                       lazy=lazy)
+        _parsers.move_to_end(key)
+        while len(_parsers) > MAX_OWNERS:
+            _parsers.popitem(last=False)
+    return parser
@@ -1,146 +1,349 @@
 # Author: Omkar Pathak
 
 import os
-import multiprocessing as mp
-import io
-import spacy
-import pprint
-from spacy.matcher import Matcher
+import collections
 import utils.custom_utils as utils
+from utils.model_registry import registry, DEFAULT_MODEL
+from utils.document import ParsedDocument
+from utils.skills_index import get_skills_index
+from utils.result_cache import cache_key
+from utils.timing import StageTimer
+from utils.contact_scanner import default_scanner
+from utils.sections import split_sections, NormalisedText
 import re
 
+# the custom NER model is stored next to this module
+CUSTOM_MODEL = os.path.dirname(os.path.abspath(__file__))
+
+# bump whenever extraction logic changes so cached results are refreshed
+PARSER_VERSION = '1.4'
+
+DETAIL_FIELDS = [
+    'name',
+    'email',
+    'mobile_number',
+    'skills',
+    'college_name',
+    'degree',
+    'designation',
+    'experience',
+    'company_names',
+    'no_of_pages',
+    'total_experience',
+    'suggestions',  # <-- added field to hold CV improvement suggestions
+    'organisations',  # ORG entities, reused by the app's education table
+]
+
+# lazy mode: the sections that go through each pipeline; the other
+# sections are only tokenized, for the skills
+NLP_SECTIONS = ('header', 'education', 'skills')
+CUSTOM_NER_SECTIONS = ('header', 'objective', 'education', 'experience',
+                       'internships')
+
+
 class ResumeParser(object):
 
     def __init__(
         self,
         resume,
         skills_file=None,
-        custom_regex=None
+        custom_regex=None,
+        nlp_text=None,
+        custom_nlp_text=None,
+        timer=None,
+        lazy=False
     ):
-        nlp = spacy.load('en_core_web_sm')
-        custom_nlp = spacy.load(os.path.dirname(os.path.abspath(__file__)))
+        # `nlp_text`/`custom_nlp_text` let batch callers hand in Docs
+        # produced by `nlp.pipe` instead of running the models here;
+        # `lazy` runs the models only over the sections that need them
+        self.__timer = timer if timer is not None else StageTimer()
+        nlp = registry.get(DEFAULT_MODEL)
+        custom_nlp = registry.get(CUSTOM_MODEL)
         self.__skills_file = skills_file
         self.__custom_regex = custom_regex
-        self.__matcher = Matcher(nlp.vocab)
-        self.__details = {
-            'name': None,
-            'email': None,
-            'mobile_number': None,
-            'skills': None,
-            'college_name': None,
-            'degree': None,
-            'designation': None,
-            'experience': None,
-            'company_names': None,
-            'no_of_pages': None,
-            'total_experience': None,
-            'suggestions': None,  # <-- added field to hold CV improvement suggestions
-        }
-        self.__resume = resume
-        if not isinstance(self.__resume, io.BytesIO):
-            ext = os.path.splitext(self.__resume)[1].split('.')[1]
+        self.__details = dict.fromkeys(DETAIL_FIELDS)
+        if isinstance(resume, ParsedDocument):
+            self.__document = resume
+        else:
+            self.__document = ParsedDocument(resume)
+        with self.__timer.stage('extract_text'):
+            self.__text_raw = self.__document.text
+            self.__text = ' '.join(self.__text_raw.split())
+        self.__nlp = self.__custom_nlp = None
+        if lazy and nlp_text is None and custom_nlp_text is None:
+            with self.__timer.stage('split_sections'):
+                sections = split_sections(self.__text_raw)
+            self.__fields = merge_fields(
+                section_fields(sections, self.__skills_file, self.__timer),
+                [section.start for section in sections])
         else:
-            ext = self.__resume.name.split('.')[1]
-        self.__text_raw = utils.extract_text(self.__resume, '.' + ext)
-        self.__text = ' '.join(self.__text_raw.split())
-        self.__nlp = nlp(self.__text)
-        self.__custom_nlp = custom_nlp(self.__text_raw)
-        self.__noun_chunks = list(self.__nlp.noun_chunks)
+            with self.__timer.stage('nlp'):
+                if nlp_text is None:
+                    nlp_text = nlp(self.__text)
+                self.__nlp = nlp_text
+                self.__noun_chunks = list(self.__nlp.noun_chunks)
+            with self.__timer.stage('custom_nlp'):
+                if custom_nlp_text is None:
+                    custom_nlp_text = custom_nlp(self.__text_raw)
+                self.__custom_nlp = custom_nlp_text
+            self.__fields = nlp_fields(self.__nlp, self.__custom_nlp,
+                                       self.__skills_file, self.__noun_chunks,
+                                       self.__timer,
+                                       NormalisedText(self.__text_raw))
         self.__get_basic_details()
 
     def get_extracted_data(self):
         return self.__details
 
-    def __get_basic_details(self):
-        cust_ent = utils.extract_entities_wih_custom_model(
-                            self.__custom_nlp
-                        )
-        name = utils.extract_name(self.__nlp, matcher=self.__matcher)
-        email = utils.extract_email(self.__text)
-        mobile = utils.extract_mobile_number(self.__text, self.__custom_regex)
-        skills = utils.extract_skills(
-                    self.__nlp,
-                    self.__noun_chunks,
-                    self.__skills_file
-                )
-        # edu = utils.extract_education(
-        #               [sent.string.strip() for sent in self.__nlp.sents]
-        #       )
-        entities = utils.extract_entity_sections_grad(self.__text_raw)
-        education = extract_education_from_resume(self.__nlp)
-        self.__details['education'] = education
-        # extract name
-        try:
-            self.__details['name'] = cust_ent['Name'][0]
-        except (IndexError, KeyError):
-            self.__details['name'] = name
-
-        # extract email
-        self.__details['email'] = email
-
-        # extract mobile number
-        self.__details['mobile_number'] = mobile
-
-        # extract skills
-        self.__details['skills'] = skills
+    def get_document(self):
+        return self.__document
 
-        # extract college name
-        try:
-            self.__details['college_name'] = entities['College Name']
-        except KeyError:
-            pass
+    def get_stage_timings(self):
+        return self.__timer.as_dict()
 
-        # extract education Degree
-        try:
-            self.__details['degree'] = cust_ent['Degree']
-        except KeyError:
-            pass
+    def get_docs(self):
+        # (None, None) in lazy mode, no Doc covers the whole text
+        return self.__nlp, self.__custom_nlp
 
-        # extract designation
-        try:
-            self.__details['designation'] = cust_ent['Designation']
-        except KeyError:
-            pass
-
-        # extract company names
-        try:
-            self.__details['company_names'] = cust_ent['Companies worked at']
-        except KeyError:
-            pass
+    def get_entity_spans(self):
+        '''
+        :return: list of (label, start, end) of the custom entities and the
+                 ORG entities, as offsets in the raw text
+        '''
+        return self.__fields['spans']
 
+    def __get_basic_details(self):
+        build_details(self.__details, self.__document, self.__text_raw,
+                      self.__text, self.__fields, self.__custom_regex,
+                      self.__timer)
+
+
+def nlp_fields(nlp_doc, custom_doc, skills_file=None, noun_chunks=None,
+               timer=None, offsets=None, tagged=True):
+    '''
+    Run the extractors that need the spaCy Docs
+
+    :param nlp_doc: `en_core_web_sm` Doc of the normalised text
+    :param custom_doc: custom NER Doc of the raw text, or None
+    :param offsets: `NormalisedText` of the raw text, to map the offsets
+                    of `nlp_doc` back to it
+    :param tagged: False when `nlp_doc` was only tokenized; the name and
+                   the ORG entities need the tagger and are skipped
+    :return: dictionary with the custom 'entities' (label -> texts), the
+             matched 'name', the 'skills', the 'organisations' (ORG
+             entities) and the 'spans' (label, start, end) of both kinds of
+             entities in the raw text; plain data, so it can be cached and
+             merged
+    '''
+    timer = timer if timer is not None else StageTimer()
+    if not tagged:
+        # noun chunks need the parser too
+        noun_chunks = []
+    elif noun_chunks is None:
+        noun_chunks = list(nlp_doc.noun_chunks)
+    with timer.stage('custom_entities'):
+        if custom_doc is None:
+            entities, spans = {}, []
+        else:
+            entities = utils.extract_entities_wih_custom_model(custom_doc)
+            spans = [(ent.label_, ent.start_char, ent.end_char)
+                     for ent in custom_doc.ents]
+    with timer.stage('name'):
+        name = utils.extract_name(nlp_doc) if tagged else None
+    with timer.stage('skills'):
+        skills = utils.extract_skills(nlp_doc, noun_chunks, skills_file)
+    organisations = [ent for ent in nlp_doc.ents
+                     if ent.label_ == 'ORG'] if tagged else []
+    if offsets is not None:
+        spans.extend(('ORG',) + offsets.raw_span(ent.start_char, ent.end_char)
+                     for ent in organisations)
+    return {
+        'entities': entities,
+        'name': name,
+        'skills': skills,
+        'organisations': [ent.text for ent in organisations],
+        'spans': sorted(spans, key=lambda span: span[1:]),
+    }
+
+
+def section_fields(sections, skills_file=None, timer=None, lazy=True):
+    '''
+    Run the pipelines over the windows of a document and the extractors
+    over each window. In lazy mode `en_core_web_sm` only tags and parses
+    the `NLP_SECTIONS` (the others are only tokenized) and the custom NER
+    model only reads the `CUSTOM_NER_SECTIONS`.
+
+    :param sections: list of `utils.sections.Section`
+    :return: list of `nlp_fields`, one per section, with spans relative to
+             the start of the section (see `merge_fields`)
+    '''
+    timer = timer if timer is not None else StageTimer()
+    nlp = registry.get(DEFAULT_MODEL)
+    custom_nlp = registry.get(CUSTOM_MODEL)
+    normalised = [NormalisedText(section.text) for section in sections]
+    tagged = [i for i, section in enumerate(sections)
+              if not lazy or section.name in NLP_SECTIONS]
+    recognised = [i for i, section in enumerate(sections)
+                  if not lazy or section.name in CUSTOM_NER_SECTIONS]
+    docs = [None] * len(sections)
+    custom_docs = [None] * len(sections)
+    with timer.stage('nlp'):
+        for i, doc in zip(tagged, nlp.pipe(normalised[i].text
+                                           for i in tagged)):
+            docs[i] = doc
+        for i, doc in enumerate(docs):
+            if doc is None:
+                docs[i] = nlp.make_doc(normalised[i].text)
+    with timer.stage('custom_nlp'):
+        for i, doc in zip(recognised, custom_nlp.pipe(sections[i].text
+                                                      for i in recognised)):
+            custom_docs[i] = doc
+    tagged = set(tagged)
+    return [nlp_fields(docs[i], custom_docs[i], skills_file, None, timer,
+                       normalised[i], tagged=i in tagged)
+            for i in range(len(sections))]
+
+
+def merge_fields(parts, starts=None):
+    '''
+    Merge the `nlp_fields` of consecutive parts of a document, e.g. its
+    sections, in document order
+
+    :param parts: list of dictionaries returned by `nlp_fields`
+    :param starts: offset of every part in the document, added to its spans
+    :return: dictionary of the same shape
+    '''
+    entities = collections.OrderedDict()
+    name = None
+    skills = collections.OrderedDict()
+    organisations = []
+    spans = []
+    for i, part in enumerate(parts):
+        start = starts[i] if starts else 0
+        spans.extend((label, start + begin, start + end)
+                     for label, begin, end in part.get('spans', ()))
+        for label, texts in part['entities'].items():
+            merged = entities.setdefault(label, [])
+            merged.extend(t for t in texts if t not in merged)
+        if name is None:
+            name = part['name']
+        for skill in part['skills']:
+            skills.setdefault(skill.lower(), skill)
+        organisations.extend(part['organisations'])
+    return {
+        'entities': dict(entities),
+        'name': name,
+        'skills': list(skills.values()),
+        'organisations': organisations,
+        'spans': spans,
+    }
+
+
+def build_details(details, document, text_raw, text, fields,
+                  custom_regex=None, timer=None):
+    '''
+    Fill `details` from the NLP fields and the rule-based extractors,
+    which only need the text
+
+    :param details: dictionary with the `DETAIL_FIELDS` keys
+    :param document: object of `ParsedDocument`
+    :param text_raw: raw text, with its line breaks
+    :param text: normalised text (single spaces)
+    :param fields: dictionary returned by `nlp_fields` or `merge_fields`
+    :return: `details`
+    '''
+    timer = timer if timer is not None else StageTimer()
+    cust_ent = fields['entities']
+    with timer.stage('contacts'):
+        # urls, emails and phone numbers in a single pass
+        contacts = default_scanner.scan(text)
+    with timer.stage('email'):
+        email = utils.extract_email(text, contacts)
+    with timer.stage('mobile_number'):
+        mobile = utils.extract_mobile_number(text, custom_regex, contacts)
+    # edu = utils.extract_education(
+    #               [sent.string.strip() for sent in self.__nlp.sents]
+    #       )
+    with timer.stage('sections'):
+        entities = utils.extract_entity_sections_grad(text_raw)
+    with timer.stage('education'):
+        education = extract_education(text, fields['organisations'])
+    details['education'] = education
+    details['organisations'] = fields['organisations']
+    # extract name
+    try:
+        details['name'] = cust_ent['Name'][0]
+    except (IndexError, KeyError):
+        details['name'] = fields['name']
+
+    # extract email
+    details['email'] = email
+
+    # extract mobile number
+    details['mobile_number'] = mobile
+
+    # extract skills
+    details['skills'] = fields['skills']
+
+    # extract college name
+    try:
+        details['college_name'] = entities['College Name']
+    except KeyError:
+        pass
+
+    # extract education Degree
+    try:
+        details['degree'] = cust_ent['Degree']
+    except KeyError:
+        pass
+
+    # extract designation
+    try:
+        details['designation'] = cust_ent['Designation']
+    except KeyError:
+        pass
+
+    # extract company names
+    try:
+        details['company_names'] = cust_ent['Companies worked at']
+    except KeyError:
+        pass
+
+    with timer.stage('experience'):
         try:
-            self.__details['experience'] = entities['experience']
+            details['experience'] = entities['experience']
             try:
                 exp = round(
-                    utils.get_total_experience(entities['experience']) / 12,
+                    utils.get_total_experience(
+                        entities['experience']) / 12,
                     2
                 )
-                self.__details['total_experience'] = exp
+                details['total_experience'] = exp
             except KeyError:
-                self.__details['total_experience'] = 0
+                details['total_experience'] = 0
         except KeyError:
-            self.__details['total_experience'] = 0
-        self.__details['no_of_pages'] = utils.get_number_of_pages(
-                                            self.__resume
-                                        )
-
-        # Build a minimal CV dict and request improvement suggestions
-        cv_data = {
-            "name": self.__details.get("name"),
-            "email": self.__details.get("email"),
-            "phone": self.__details.get("mobile_number"),
-            "education": self.__details.get("education") or [],
-            "skills": self.__details.get("skills") or [],
-            "experience": self.__details.get("experience") or [],
-            "projects": [],      # not extracted here, keep empty
-            "languages": []      # not extracted here, keep empty
-        }
+            details['total_experience'] = 0
+    details['no_of_pages'] = document.page_count
+
+    # Build a minimal CV dict and request improvement suggestions
+    cv_data = {
+        "name": details.get("name"),
+        "email": details.get("email"),
+        "phone": details.get("mobile_number"),
+        "education": details.get("education") or [],
+        "skills": details.get("skills") or [],
+        "experience": details.get("experience") or [],
+        "projects": [],      # not extracted here, keep empty
+        "languages": []      # not extracted here, keep empty
+    }
+    with timer.stage('suggestions'):
         try:
-            self.__details['suggestions'] = utils.suggest_cv_improvements(cv_data)
+            details['suggestions'] = \
+                utils.suggest_cv_improvements(cv_data)
         except Exception:
             # ensure parser doesn't fail if suggestions helper has issues
-            self.__details['suggestions'] = None
-        return
+            details['suggestions'] = None
+    return details
 
 
 def resume_result_wrapper(resume):
@@ -148,6 +351,120 @@ def resume_result_wrapper(resume):
     return parser.get_extracted_data()
 
 
+def _run_parser(document, skills_file, custom_regex, profiler, timer,
+                docbin_store=None, incremental=None, lazy=False):
+    if timer is None:
+        timer = StageTimer()
+    if incremental is not None:
+        if profiler is None:
+            return incremental.parse(document, timer)
+        with profiler.capture(document.sha256, timer):
+            return incremental.parse(document, timer)
+    if profiler is None:
+        parser = ResumeParser(document, skills_file, custom_regex,
+                              timer=timer, lazy=lazy)
+    else:
+        with profiler.capture(document.sha256, timer):
+            parser = ResumeParser(document, skills_file, custom_regex,
+                                  timer=timer, lazy=lazy)
+    if docbin_store is not None and not lazy:
+        nlp_doc, custom_doc = parser.get_docs()
+        docbin_store.save(document.sha256, nlp_doc, custom_doc,
+                          document.snapshot())
+    return parser.get_extracted_data()
+
+
+def _section_mode(incremental, lazy):
+    if lazy or (incremental is not None and incremental.lazy):
+        return 'lazy'
+    return 'sections' if incremental is not None else ''
+
+
+def parse_resume(
+    resume,
+    skills_file=None,
+    custom_regex=None,
+    cache=None,
+    profiler=None,
+    timer=None,
+    docbin_store=None,
+    incremental=None,
+    lazy=False
+):
+    '''
+    Parse a resume, serving repeated uploads of the same file from
+    `cache` without extracting text or running the NLP pipelines
+
+    :param resume: path, buffer or `ParsedDocument` of the resume
+    :param skills_file: optional path to a custom skills csv
+    :param custom_regex: optional regex for mobile numbers
+    :param cache: object of `utils.result_cache.ResultCache`
+    :param profiler: object of `utils.profiler.ProfileSampler`, used to
+                     capture profiles of slow or sampled parses
+    :param timer: optional `StageTimer` receiving the stage timings
+    :param docbin_store: object of `utils.docbin_cache.DocBinStore`; when
+                         given, the spaCy Docs are persisted for `reextract`
+    :param incremental: object of `pyresparser.incremental.IncrementalParser`
+                        holding the previous revisions of this resume; only
+                        its changed sections go through the pipelines (no
+                        Docs are persisted then)
+    :param lazy: run the pipelines only over the sections that need them
+                 (see `section_fields`); no Docs are persisted either
+    :return: dictionary of extracted details
+    '''
+    if isinstance(resume, ParsedDocument):
+        document = resume
+    else:
+        document = ParsedDocument(resume)
+    if cache is None:
+        return _run_parser(document, skills_file, custom_regex,
+                           profiler, timer, docbin_store, incremental, lazy)
+
+    key = cache_key(
+        document.sha256,
+        PARSER_VERSION,
+        document.mode,
+        registry.version(DEFAULT_MODEL),
+        registry.version(CUSTOM_MODEL),
+        get_skills_index(skills_file).version,
+        custom_regex or '',
+        # per-section results may differ from a whole-document parse
+        _section_mode(incremental, lazy)
+    )
+    cached = cache.get(key)
+    if cached is not None:
+        document.restore(cached['document'])
+        return cached['details']
+    details = _run_parser(document, skills_file, custom_regex,
+                          profiler, timer, docbin_store, incremental, lazy)
+    cache.put(key, {'details': details, 'document': document.snapshot()})
+    return details
+
+
+def reextract(digest, docbin_store, skills_file=None, custom_regex=None):
+    '''
+    Re-run only the rule-based extractors over the Docs stored for a
+    resume; neither spaCy pipeline is executed
+
+    :param digest: SHA-256 of the resume file
+    :param docbin_store: object of `utils.docbin_cache.DocBinStore`
+    :return: dictionary of extracted details
+    '''
+    nlp_doc, custom_doc, snapshot = docbin_store.load(
+        digest,
+        registry.get(DEFAULT_MODEL).vocab,
+        registry.get(CUSTOM_MODEL).vocab
+    )
+    document = ParsedDocument.from_snapshot(snapshot, sha256=digest)
+    return ResumeParser(
+        document,
+        skills_file,
+        custom_regex,
+        nlp_text=nlp_doc,
+        custom_nlp_text=custom_doc
+    ).get_extracted_data()
+
+
 # def extract_education_from_resume(doc):
 #     import re
 #     education_keywords = [
@@ -186,13 +503,27 @@ def resume_result_wrapper(resume):
 
 #     return list(set(education_entries))
 
-import re
+# 2+ digit runs (dates, phone fragments, grades) mark a line as noise
+_EDUCATION_NOISE = re.compile(r"@|\d{2}")
+_LINK = re.compile(r"@|https?://|www\.")
+_SPACES = re.compile(r"\s{2,}")
+_WHITESPACE = re.compile(r"\s+")
+
 
 def extract_education_from_resume(doc):
     """
     Extracts education info (degree + institution) from a parsed resume (spaCy Doc).
     Handles broken line merges (e.g., URLs + education text in same line).
     """
+    return extract_education(
+        doc.text, [ent.text for ent in doc.ents if ent.label_ == "ORG"])
+
+
+def extract_education(text, organisations=()):
+    """
+    Same as `extract_education_from_resume`, from the text and the ORG
+    entities of the Doc, e.g. merged from the Docs of its sections.
+    """
 
     education_keywords = [
         "university", "college", "institute", "faculty", "school", "academy",
@@ -204,17 +535,27 @@ def extract_education_from_resume(doc):
         "certifications", "languages", "contact"
     ]
 
-    # Clean raw text
-    text = doc.text
-
-    # 👉 Split URL-attached lines into separate parts
-    text = re.sub(r"(https?://\S+)", r"\1\n", text)
-
-    # 👉 Remove raw URLs (completely drop them)
-    text = re.sub(r"https?://\S+|www\.\S+", "", text)
+    # 👉 Drop raw URLs, splitting the line where they were attached to text
+    # (only there: an extra blank line would be collapsed below and merge
+    # the lines around the url)
+    pieces, last = [], 0
+    for start, end in default_scanner.spans(text, kinds=('url',)):
+        before = text[last:start].rstrip(" \t")
+        pieces.append(before)
+        last = end
+        while last < len(text) and text[last] in " \t":
+            last += 1
+        if not before or before[-1] == "\n":
+            # a url alone on its line goes with its line break
+            if text[last:last + 1] == "\n":
+                last += 1
+        elif text[last:last + 1] not in ("", "\n"):
+            pieces.append("\n")
+    pieces.append(text[last:])
+    text = "".join(pieces)
 
     # 👉 Normalize spacing
-    text = re.sub(r"\s{2,}", " ", text)
+    text = _SPACES.sub(" ", text)
 
     # Split into clean lines
     lines = [l.strip() for l in text.splitlines() if l.strip()]
@@ -234,7 +575,7 @@ def extract_education_from_resume(doc):
             break
 
         # Skip obvious noise lines (emails, phone numbers, etc.)
-        if re.search(r"@|\d{7,}|[+]?\d{2,}", line):
+        if _EDUCATION_NOISE.search(line):
             continue
 
         # Detect education-related lines
@@ -242,44 +583,27 @@ def extract_education_from_resume(doc):
             # Merge with next line only if likely related (school name)
             next_line = lines[i+1].strip() if i+1 < len(lines) else ""
             if next_line:
-                if not re.search(r"@|https?://|www\.", next_line) and not any(h in next_line.lower() for h in section_headers):
+                if not _LINK.search(next_line) and not any(h in next_line.lower() for h in section_headers):
                     # Add next line if short and looks like institution
                     if len(next_line.split()) < 8 and any(c.isupper() for c in next_line):
                         line += " - " + next_line
             education_entries.append(line)
 
     # Backup: extract org names from spaCy entities
-    for ent in doc.ents:
-        if ent.label_ == "ORG" and any(k in ent.text.lower() for k in education_keywords):
-            education_entries.append(ent.text.strip())
+    for org in organisations:
+        if any(k in org.lower() for k in education_keywords):
+            education_entries.append(org.strip())
 
     # Deduplicate and clean
     cleaned = []
     for e in set(education_entries):
-        e = re.sub(r"\s+", " ", e).strip(" -•–")
-        if len(e) > 3 and not re.search(r"https?://|www\.|@", e):
+        e = _WHITESPACE.sub(" ", e).strip(" -•–")
+        if len(e) > 3 and not _LINK.search(e):
             cleaned.append(e)
 
     return cleaned
 
 
 if __name__ == '__main__':
-    pool = mp.Pool(mp.cpu_count())
-
-    resumes = []
-    data = []
-    for root, directories, filenames in os.walk('resumes'):
-        for filename in filenames:
-            file = os.path.join(root, filename)
-            resumes.append(file)
-
-    results = [
-        pool.apply_async(
-            resume_result_wrapper,
-            args=(x,)
-        ) for x in resumes
-    ]
-
-    results = [p.get() for p in results]
-
-    pprint.pprint(results)
+    from pyresparser.batch import main
+    main()
@@ -0,0 +1,50 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# the packages (utils, pyresparser, benchmarks) and the flat App modules
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'App')]
+
+
+@pytest.fixture
+def skills_file(tmp_path):
+    path = tmp_path / 'skills.csv'
+    path.write_text('python,java,machine learning,sql,react,docker\n',
+                    encoding='utf-8')
+    return str(path)
+
+
+@pytest.fixture
+def fake_models(monkeypatch):
+    '''
+    Small blank spaCy pipelines standing in for `en_core_web_sm` (a
+    capitalised word is a proper noun, "... University" an ORG) and for
+    the custom NER model ("Engineer" is a Designation)
+    '''
+    spacy = pytest.importorskip('spacy')
+    from spacy.language import Language
+    from utils.model_registry import registry, DEFAULT_MODEL
+    from pyresparser.resume_parser import CUSTOM_MODEL
+
+    if 'test_tagger' not in Language.factories:
+        @Language.component('test_tagger')
+        def test_tagger(doc):
+            for token in doc:
+                token.pos_ = 'PROPN' if token.text[:1].isupper() else 'NOUN'
+                token.dep_ = 'ROOT'
+            return doc
+
+    nlp = spacy.blank('en')
+    nlp.add_pipe('test_tagger')
+    ruler = nlp.add_pipe('entity_ruler')
+    ruler.add_patterns([{'label': 'ORG', 'pattern': [
+        {'IS_TITLE': True}, {'LOWER': 'university'}]}])
+    custom = spacy.blank('en')
+    custom.add_pipe('entity_ruler').add_patterns(
+        [{'label': 'Designation', 'pattern': 'Engineer'}])
+
+    models = {DEFAULT_MODEL: nlp, CUSTOM_MODEL: custom}
+    monkeypatch.setattr(registry, 'get', lambda name: models[name])
+    return models
@@ -0,0 +1,111 @@
+import os
+import csv
+import contextlib
+
+import pytest
+
+pytest.importorskip('pymysql')
+import admin_data
+from admin_data import USER_DATA_COLUMNS, fetch_page, where_clause
+
+
+def _rows(ids):
+    return [(i,) + ('x',) * (len(USER_DATA_COLUMNS) - 1) for i in ids]
+
+
+class FakeCursor(object):
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.fetches = 0
+
+    def execute(self, sql, args=None):
+        pass
+
+    def fetchmany(self, size):
+        chunk, self.rows = self.rows[:size], self.rows[size:]
+        self.fetches += 1
+        return chunk
+
+    def close(self):
+        pass
+
+
+class FakePool(object):
+    '''
+    Answers the keyset queries of `fetch_page` from a list of rows, and
+    streams them through an unbuffered cursor for the exports
+    '''
+
+    def __init__(self, ids):
+        self.ids = ids
+        self.queries = []
+        self.cursors = []
+
+    @contextlib.contextmanager
+    def connection(self):
+        yield self
+
+    def cursor(self, cursor_class=None):
+        self.cursors.append(FakeCursor(_rows(self.ids)))
+        return self.cursors[-1]
+
+    def fetchall(self, sql, args):
+        self.queries.append((sql, args))
+        assert sql.endswith(' ORDER BY ID LIMIT %s')
+        after_id, limit = args[-2], args[-1]
+        return _rows(i for i in self.ids if i > after_id)[:limit]
+
+
+def test_keyset_pages_visit_every_row_once():
+    ids = [1, 2, 5, 8, 9, 13, 21]
+    pool = FakePool(ids)
+    seen, after_id = [], 0
+    while True:
+        page = fetch_page(pool, after_id=after_id, page_size=3)
+        seen.extend(row[0] for row in page)
+        if len(page) < 3:
+            break
+        after_id = page[-1][0]
+    assert seen == ids
+    assert all('OFFSET' not in sql for sql, _ in pool.queries)
+
+
+def test_where_clause_escapes_the_search():
+    sql, args = where_clause({'field': 'Data Science', 'search': '50%_a'},
+                             after_id=10)
+    assert sql.startswith(' WHERE Predicted_Field = %s AND (')
+    assert sql.endswith(' AND ID > %s')
+    assert args[0] == 'Data Science' and args[-1] == 10
+    assert set(args[1:-1]) == {'%50\\%\\_a%'}
+
+
+def test_where_clause_ignores_empty_filters():
+    assert where_clause({'field': '', 'search': ''}) == ('', [])
+
+
+
+def test_export_file_streams_in_chunks(tmp_path):
+    pool = FakePool(list(range(1, 2501)))
+    path = admin_data.export_file(pool, 'csv', directory=str(tmp_path))
+    try:
+        with open(path, newline='', encoding='utf-8') as fh:
+            rows = list(csv.reader(fh))
+        assert rows[0] == admin_data.USER_DATA_LABELS
+        assert [int(r[0]) for r in rows[1:]] == list(range(1, 2501))
+        # 1000-row chunks and the empty fetch that ends the stream
+        assert pool.cursors[0].fetches == 4
+    finally:
+        admin_data.discard_export(path)
+    assert not os.path.exists(path)
+
+
+def test_failed_export_leaves_no_file(tmp_path, monkeypatch):
+    def broken(pool, fh, filters=None):
+        fh.write(b'partial')
+        raise RuntimeError('lost the connection')
+    monkeypatch.setitem(admin_data.EXPORT_FORMATS, 'csv',
+                        (broken, '.csv', 'text/csv'))
+    with pytest.raises(RuntimeError):
+        admin_data.export_file(FakePool([1]), 'csv', directory=str(tmp_path))
+    assert os.listdir(str(tmp_path)) == []
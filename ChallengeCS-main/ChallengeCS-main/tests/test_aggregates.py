@@ -0,0 +1,113 @@
+import contextlib
+
+import pytest
+
+pytest.importorskip('pymysql')
+import aggregates
+from storage import WriteBehindQueue
+
+
+class FakeCursor(object):
+    '''
+    Keeps the statements of one transaction; `ROLLBACK TO SAVEPOINT`
+    undoes the statements run after the savepoint
+    '''
+
+    def __init__(self, db):
+        self.db = db
+        self.statements = []
+        self.savepoint = None
+
+    def execute(self, sql, args=None):
+        verb = ' '.join(sql.split()[:3])
+        if verb.startswith('SAVEPOINT'):
+            self.savepoint = len(self.statements)
+            return 0
+        if verb.startswith('ROLLBACK TO SAVEPOINT'):
+            del self.statements[self.savepoint:]
+            return 0
+        if aggregates.AGGREGATES_TABLE in sql and self.db.aggregates_fail:
+            raise RuntimeError("Table 'cv.analytics_counts' doesn't exist")
+        self.statements.append(sql)
+        return 1
+
+    def fetchone(self):
+        return (self.db.aggregate_rows,)
+
+
+class FakePool(object):
+
+    def __init__(self, aggregates_fail=False, aggregate_rows=1):
+        self.aggregates_fail = aggregates_fail
+        self.aggregate_rows = aggregate_rows
+        self.committed = []
+
+    @contextlib.contextmanager
+    def cursor(self):
+        cursor = FakeCursor(self)
+        yield cursor
+        self.committed.extend(cursor.statements)
+
+    def statements(self, table):
+        return [s for s in self.committed if s.startswith('insert into ' + table)
+                or s.startswith('INSERT INTO ' + table)]
+
+
+FEEDBACK = ('Jane', 'jane@mail.com', '5', 'great', '2024-01-01')
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(aggregates, '_installed', set())
+    aggregates._stale.clear()
+    yield
+    aggregates._stale.clear()
+
+
+@pytest.fixture
+def make_queue():
+    queues = []
+
+    def make(pool):
+        queues.append(WriteBehindQueue(pool, interval=60))
+        return queues[-1]
+    yield make
+    for queue in queues:
+        queue.close()
+
+
+def test_missing_table_does_not_drop_inserts(make_queue):
+    pool = FakePool(aggregates_fail=True)
+    queue = make_queue(pool)
+    assert aggregates.install(pool, queue) is False
+    queue.put('user_feedback', FEEDBACK)
+    assert queue.flush() == 1
+    assert len(pool.statements('user_feedback')) == 1
+    assert queue.stats()['dropped'] == 0
+
+
+def test_failed_counts_keep_the_rows_and_rebuild_later(make_queue):
+    pool = FakePool()
+    queue = make_queue(pool)
+    assert aggregates.install(pool, queue) is True
+    pool.aggregates_fail = True
+    queue.put('user_feedback', FEEDBACK)
+    assert queue.flush() == 1
+    assert len(pool.statements('user_feedback')) == 1
+    assert pool.statements(aggregates.AGGREGATES_TABLE) == []
+    assert aggregates._stale.is_set()
+    # the next call of install rebuilds the counts from the history
+    pool.aggregates_fail = False
+    assert aggregates.install(pool, queue) is True
+    assert not aggregates._stale.is_set()
+    assert any(s.startswith('DELETE FROM ' + aggregates.AGGREGATES_TABLE)
+               for s in pool.committed)
+
+
+def test_counts_follow_the_inserts(make_queue):
+    pool = FakePool()
+    queue = make_queue(pool)
+    aggregates.install(pool, queue)
+    queue.put('user_feedback', FEEDBACK)
+    queue.flush()
+    assert len(pool.statements(aggregates.AGGREGATES_TABLE)) == 1
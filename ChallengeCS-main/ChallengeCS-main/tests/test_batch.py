@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+pytest.importorskip('spacy')
+from pyresparser import batch
+
+
+class InlinePool(object):
+    '''
+    Runs the tasks of `run_batch` in the test process
+    '''
+
+    def __init__(self, workers, initializer=None, initargs=()):
+        pass
+
+    def apply_async(self, function, args):
+        result = function(*args)
+        return type('Result', (), {'get': lambda self: result})()
+
+    def close(self):
+        pass
+
+    def terminate(self):
+        pass
+
+    def join(self):
+        pass
+
+
+@pytest.fixture
+def parse(monkeypatch, tmp_path):
+    broken = set(['b.pdf'])
+
+    def parse_chunk(paths):
+        return [{'file': p, 'error': 'PDFSyntaxError: broken'}
+                if p in broken else {'file': p, 'data': {}} for p in paths]
+    monkeypatch.setattr(batch.mp, 'Pool', InlinePool)
+    monkeypatch.setattr(batch, 'parse_chunk', parse_chunk)
+    output = str(tmp_path / 'out.jsonl')
+    checkpoint = output + '.checkpoint'
+
+    def run(**kwargs):
+        return batch.run_batch(['a.pdf', 'b.pdf', 'c.pdf'], output,
+                               checkpoint=checkpoint, workers=1,
+                               chunk_size=2, **kwargs)
+    run.broken = broken
+    run.checkpoint = checkpoint
+    run.output = output
+    return run
+
+
+def test_failed_files_are_not_checkpointed(parse):
+    assert parse() == {'parsed': 2, 'failed': 1, 'skipped': 0}
+    assert batch.load_checkpoint(parse.checkpoint) == {'a.pdf', 'c.pdf'}
+    assert batch.load_checkpoint(batch.failures_path(parse.checkpoint)) == \
+        {'b.pdf'}
+
+
+def test_failed_files_are_retried_on_request(parse):
+    parse()
+    assert parse() == {'parsed': 0, 'failed': 0, 'skipped': 3}
+    parse.broken.clear()
+    assert parse(retry_failed=True) == {'parsed': 1, 'failed': 0,
+                                        'skipped': 2}
+    assert batch.load_checkpoint(parse.checkpoint) == \
+        {'a.pdf', 'b.pdf', 'c.pdf'}
+    with open(parse.output) as fh:
+        records = [json.loads(line) for line in fh]
+    assert [r['file'] for r in records if 'error' not in r] == \
+        ['a.pdf', 'c.pdf', 'b.pdf']
+
+
+def test_parallel_pages_extract_pdfs_in_the_parent(monkeypatch, tmp_path):
+    calls = []
+
+    class Document(object):
+        sha256 = 'abc'
+
+        def __init__(self, path, parallel=False, workers=None):
+            calls.append((path, parallel, workers))
+            if path.endswith('broken.pdf'):
+                raise ValueError('broken')
+
+        def snapshot(self):
+            return {'name': 'a.pdf', 'pages': ['text\f'], 'layout': [],
+                    'page_count': 1}
+    monkeypatch.setattr(batch, 'ParsedDocument', Document)
+    items = batch.extract_chunk(['a.pdf', 'b.docx', 'broken.pdf'], 4)
+    assert items[0] == ('a.pdf', Document('a.pdf').snapshot(), 'abc')
+    # other formats and unreadable pdfs are left to the worker
+    assert items[1:] == ['b.docx', 'broken.pdf']
+    assert calls[:2] == [('a.pdf', True, 4), ('broken.pdf', True, 4)]
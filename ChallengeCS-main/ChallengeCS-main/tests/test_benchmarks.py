@@ -0,0 +1,13 @@
+import pytest
+
+pytest.importorskip('spacy')
+from benchmarks.pipeline import summarise
+
+
+def test_summary_reports_the_peak_above_the_current_rss():
+    buffer = bytearray(64 * 1024 * 1024)
+    del buffer
+    summary = summarise([{'file': 'a.pdf', 'pages': 1, 'seconds': 0.5,
+                          'stages': {'nlp': 0.3}}], 1.0)
+    assert summary['peak_rss_bytes'] >= summary['rss_bytes'] + 32 * 1024 * 1024
+    assert summary['stages']['nlp']['p50'] == 0.3
@@ -0,0 +1,85 @@
+import pytest
+
+from benchmarks.contact_scanner import LEGACY_EMAIL, LEGACY_PHONE
+from utils.contact_scanner import ContactScanner, default_scanner, normalise_phone
+
+HEADER = ('Jane Roe | jane.roe@uni.ac.uk | +1 (202) 555-0189\n'
+          'Portfolio: https://janeroe.dev/work/2023. '
+          'GitHub (www.github.com/jroe), call 0044 20 7946 0018!\n')
+
+
+def test_offsets_slice_back_to_the_match():
+    matches = default_scanner.scan(HEADER)
+    assert [m.kind for m in matches] == ['email', 'phone', 'url', 'url',
+                                         'phone']
+    for match in matches:
+        assert HEADER[match.start:match.end] == match.text
+
+
+def test_url_trailing_punctuation_is_trimmed_from_end():
+    urls = [m for m in default_scanner.scan(HEADER) if m.kind == 'url']
+    assert [u.text for u in urls] == ['https://janeroe.dev/work/2023',
+                                      'www.github.com/jroe']
+    assert HEADER[urls[0].end:urls[0].end + 2] == '. '
+    assert HEADER[urls[1].end] == ')'
+
+
+def test_spans_follow_the_kinds():
+    spans = default_scanner.spans(HEADER, kinds=('url',))
+    assert [HEADER[s:e] for s, e in spans] == ['https://janeroe.dev/work/2023',
+                                               'www.github.com/jroe']
+
+
+def test_url_digits_are_not_a_phone():
+    text = 'https://github.com/jd/12345678 phone 202 555 0189'
+    phones = [m.text for m in default_scanner.scan(text) if m.kind == 'phone']
+    assert phones == ['202 555 0189']
+
+
+def test_short_digit_runs_are_not_phones():
+    assert ContactScanner(min_phone_digits=7).scan('class of 2019, room 12-34') == []
+    assert normalise_phone('+1 (202) 555-0189') == '+12025550189'
+
+
+def legacy_email(text):
+    email = LEGACY_EMAIL.findall(text)
+    if email:
+        return email[0].split()[0].strip(';')
+
+
+def legacy_phone(text):
+    for match in LEGACY_PHONE.findall(text):
+        number = ''.join(c for c in match if c.isdigit() or c == '+')
+        if sum(c.isdigit() for c in number) >= 7:
+            return number
+
+
+@pytest.mark.parametrize('text', [
+    'John Doe john.doe@mail.com +1 (202) 555-0189',
+    'Jane Roe\nEmail: jane_roe@uni.ac.uk\nPhone: +216 23 456 789',
+    'contact me at a.b-c@sub.domain.org; 0044 20 7946 0018',
+    'Raj Kumar | raj.kumar@gmail.com | +91-9876543210',
+    'no contact details here',
+])
+def test_extractors_match_the_old_patterns(text):
+    pytest.importorskip('spacy')
+    from utils.custom_utils import extract_email, extract_mobile_number
+    assert extract_email(text) == legacy_email(text)
+    assert extract_mobile_number(text) == legacy_phone(text)
+
+
+@pytest.mark.parametrize('url', ['https://uni.edu/cs', 'www.uni.edu/cs?x=1'])
+@pytest.mark.parametrize('template', [
+    'Education\n{url} BSc Computer Science, University of Tunis\nSkills\npython',
+    'Education\nBSc Computer Science {url}\nUniversity of Tunis\nSkills\npython',
+    'Education\nBSc Computer Science\n{url}\nUniversity of Tunis\nSkills\n',
+])
+def test_education_ignores_urls(template, url):
+    pytest.importorskip('spacy')
+    from pyresparser.resume_parser import extract_education
+    with_url = extract_education(template.format(url=url))
+    without_url = extract_education(template.replace(' {url}', '')
+                                    .replace('{url} ', '')
+                                    .replace('{url}\n', ''))
+    assert sorted(with_url) == sorted(without_url)
+    assert with_url and not any('uni.edu' in e for e in with_url)
@@ -0,0 +1,64 @@
+import pytest
+
+pytest.importorskip('pdfminer')
+from utils import document
+from utils.document import ParsedDocument
+
+
+def test_page_pools_are_kept_per_worker_count():
+    try:
+        two = document._get_page_pool(2)
+        assert document._get_page_pool(2) is two
+        three = document._get_page_pool(3)
+        assert three is not two
+        assert three._max_workers == 3 and two._max_workers == 2
+    finally:
+        document.shutdown_page_pool()
+    assert document._get_page_pool(2) is not two
+    document.shutdown_page_pool()
+
+
+def test_snapshot_text_keeps_the_page_order():
+    doc = ParsedDocument.from_snapshot(
+        {'name': 'cv.txt', 'pages': ['one\n', 'two\n'], 'layout': [],
+         'page_count': 2})
+    assert doc.text == 'one\ntwo\n'
+    assert doc.page_count == 2
+
+
+def _pdf_bytes(tmp_path, pages):
+    from benchmarks.corpus import write_pdf, LINES_PER_PAGE
+    lines = ['page %d line %d' % (page, line)
+             for page in range(pages) for line in range(LINES_PER_PAGE)]
+    path = str(tmp_path / 'cv.pdf')
+    write_pdf(path, lines)
+    with open(path, 'rb') as fh:
+        return fh.read()
+
+
+def test_parallel_pages_match_the_serial_parse(tmp_path):
+    pages = document.PARALLEL_PAGE_THRESHOLD + 3
+    data = _pdf_bytes(tmp_path, pages)
+    serial = ParsedDocument(data, name='cv.pdf')
+    try:
+        parallel = ParsedDocument(data, name='cv.pdf', parallel=True,
+                                  workers=3)
+        assert parallel.page_count == pages
+        assert parallel.pages == serial.pages
+        assert parallel.text == serial.text
+        assert [info['page'] for info in parallel.layout] == \
+            list(range(1, pages + 1))
+        assert 'page %d line 0' % (pages - 1) in parallel.pages[-1]
+    finally:
+        document.shutdown_page_pool()
+
+
+def test_short_documents_stay_serial(tmp_path, monkeypatch):
+    def no_pool(workers):
+        raise AssertionError('short documents must not use the pool')
+    monkeypatch.setattr(document, '_get_page_pool', no_pool)
+    pages = document.PARALLEL_PAGE_THRESHOLD - 1
+    data = _pdf_bytes(tmp_path, pages)
+    doc = ParsedDocument(data, name='cv.pdf', parallel=True, workers=4)
+    assert doc.page_count == pages
+    assert doc.pages == ParsedDocument(data, name='cv.pdf').pages
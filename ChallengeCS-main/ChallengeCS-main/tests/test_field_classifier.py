@@ -0,0 +1,167 @@
+'''
+The indexed field classifier against the keyword checks of App.py it
+replaced
+'''
+import contextlib
+
+import pytest
+
+from field_classifier import FieldClassifier, parse_skills
+
+# copied from the baseline App.py
+ds_keyword = ['tensorflow', 'keras', 'pytorch', 'machine learning', 'deep learning', 'flask', 'streamlit']
+web_keyword = ['react', 'django', 'node js', 'react js', 'php', 'laravel', 'magento', 'wordpress', 'javascript', 'angular js', 'c#', 'asp.net', 'flask']
+android_keyword = ['android', 'flutter', 'kotlin', 'xml', 'kivy']
+ios_keyword = ['ios', 'swift', 'cocoa', 'xcode']
+uiux_keyword = ['ux', 'adobe xd', 'figma', 'zeplin', 'balsamiq', 'ui', 'prototyping', 'wireframes', 'photoshop', 'illustrator', 'after effects', 'indesign', 'user experience']
+
+LEGACY_FIELDS = [
+    ('Data Science', ds_keyword),
+    ('Web Development', web_keyword),
+    ('Android Development', android_keyword),
+    ('iOS Development', ios_keyword),
+    ('UI/UX Design', uiux_keyword),
+]
+
+
+def legacy_fields(skills):
+    skills_lower = [s.lower() for s in skills]
+
+    def match_any(keywords):
+        return any(any(k in s or s in k for k in keywords) for s in skills_lower)
+    return set(name for name, keywords in LEGACY_FIELDS if match_any(keywords))
+
+
+def legacy_predict(skills):
+    # the if/elif ladder: the first field in the list that matches
+    for name, keywords in LEGACY_FIELDS:
+        if name in legacy_fields(skills):
+            return name
+    return ''
+
+
+SKILL_SETS = [
+    ['Python', 'TensorFlow', 'SQL'],
+    ['React', 'Node JS', 'CSS'],
+    ['Kotlin', 'XML'],
+    ['Swift', 'Xcode'],
+    ['Figma', 'UI'],
+    ['Flask'],
+    ['java'],
+    ['js', 'ux design', 'machine learning engineer'],
+    ['Excel', 'Communication'],
+    ['i', 'a', 'r'],
+    ['ASP.NET', 'C#'],
+    ['After Effects', 'indesign cc'],
+    [],
+]
+
+
+@pytest.mark.parametrize('skills', SKILL_SETS)
+def test_matching_fields_are_those_of_the_keyword_checks(skills):
+    ranked = FieldClassifier().rank(skills)
+    assert set(name for name, _ in ranked) == legacy_fields(skills)
+
+
+@pytest.mark.parametrize('skills', [s for s in SKILL_SETS
+                                    if len(legacy_fields(s)) <= 1])
+def test_single_field_skills_predict_as_before(skills):
+    assert FieldClassifier().predict(skills) == legacy_predict(skills)
+
+
+def test_ties_keep_the_field_order():
+    # "flask" is a Data Science and a Web Development keyword
+    assert FieldClassifier().predict(['Flask']) == 'Data Science'
+    assert FieldClassifier().predict(['Flask', 'React']) == 'Web Development'
+
+
+def test_classify_frame_matches_predict():
+    pd = pytest.importorskip('pandas')
+    classifier = FieldClassifier()
+    skills = pd.Series({
+        1: "['Python', 'TensorFlow']",
+        2: "['React', 'Flask', 'Node JS']",
+        3: "['Excel']",
+        4: '',
+        5: ['Swift', 'swift ', 'Xcode'],
+    })
+    frame = classifier.classify_frame(skills)
+    for row, value in skills.items():
+        assert frame.loc[row, 'Predicted_Field'] == \
+            classifier.predict(parse_skills(value))
+    assert frame.loc[5, 'iOS Development'] == 2
+
+
+class FakeCursor(object):
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.updates = []
+
+    def execute(self, sql, args=None):
+        pass
+
+    def fetchmany(self, size):
+        chunk, self.rows = self.rows[:size], self.rows[size:]
+        return chunk
+
+    def executemany(self, sql, args):
+        self.updates.extend(args)
+
+    def close(self):
+        pass
+
+
+class FakePool(object):
+    '''
+    Streams (ID, Predicted_Field, Actual_skills) rows through the
+    unbuffered cursor and records the updates
+    '''
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.updates = []
+
+    @contextlib.contextmanager
+    def connection(self):
+        yield self
+
+    def cursor(self, cursor_class=None):
+        if cursor_class is not None:
+            return FakeCursor(self.rows)
+        return self.__updates()
+
+    @contextlib.contextmanager
+    def __updates(self):
+        cursor = FakeCursor()
+        yield cursor
+        self.updates.extend(cursor.updates)
+
+
+ROWS = [
+    (1, 'Data Science', "['TensorFlow', 'Keras']"),
+    (2, 'Data Science', "['React', 'Flask', 'Node JS']"),
+    (3, None, "['Kotlin']"),
+    (4, '', "['Excel']"),
+]
+
+
+def test_reclassify_reports_the_changes():
+    pytest.importorskip('pandas')
+    pytest.importorskip('pymysql')
+    import admin_data
+    pool = FakePool(ROWS)
+    changes = admin_data.reclassify(pool, FieldClassifier(), chunk_rows=3)
+    assert changes == {('Data Science', 'Web Development'): 1,
+                       ('', 'Android Development'): 1}
+    assert pool.updates == []
+
+
+def test_reclassify_applies_the_changes():
+    pytest.importorskip('pandas')
+    pytest.importorskip('pymysql')
+    import admin_data
+    pool = FakePool(ROWS)
+    admin_data.reclassify(pool, FieldClassifier(), apply=True)
+    assert sorted(pool.updates, key=lambda u: u[1]) == [
+        ('Web Development', 2), ('Android Development', 3)]
@@ -0,0 +1,51 @@
+import pytest
+
+import geolocation
+from geolocation import (GeoProvider, GeoResolver, Location, StubGeoProvider,
+                         client_address)
+
+
+def test_provider_interface_is_abstract():
+    with pytest.raises(TypeError):
+        GeoProvider()
+
+
+def test_client_address_takes_the_first_forwarded_entry():
+    headers = {'X-Forwarded-For': '203.0.113.7, 10.0.0.2'}
+    assert client_address(headers, 'x-forwarded-for') == '203.0.113.7'
+
+
+def test_client_address_needs_a_configured_header(monkeypatch):
+    monkeypatch.delenv('RESUME_CLIENT_IP_HEADER', raising=False)
+    assert client_address({'X-Forwarded-For': '203.0.113.7'}) is None
+    monkeypatch.setenv('RESUME_CLIENT_IP_HEADER', 'X-Real-IP')
+    assert client_address({'X-Real-IP': 'not an address'}) is None
+    assert client_address({'X-Real-IP': '2001:db8::1'}) == '2001:db8::1'
+
+
+def test_resolver_caches_answers():
+    paris = Location('Paris', 'IDF', 'France', [48.85, 2.35])
+    resolver = GeoResolver(StubGeoProvider({'203.0.113.7': paris}))
+    assert resolver.result(resolver.submit('203.0.113.7'), 5) == paris
+    assert resolver.result(resolver.submit('203.0.113.7'), 5) == paris
+    assert resolver.stats()['hits'] == 1
+
+
+def test_missing_database_falls_back_to_the_stub_with_a_warning(
+        monkeypatch, tmp_path, caplog):
+    monkeypatch.setattr(geolocation, '_resolver', None)
+    monkeypatch.setenv('RESUME_GEO_PROVIDER', 'file')
+    monkeypatch.setenv('RESUME_GEO_DB', str(tmp_path / 'missing.csv'))
+    with caplog.at_level('WARNING', logger='geolocation'):
+        resolver = geolocation.get_geo_resolver()
+    assert isinstance(resolver.provider, StubGeoProvider)
+    assert 'missing.csv' in caplog.text
+
+
+def test_explicit_stub_does_not_warn(monkeypatch, caplog):
+    monkeypatch.setattr(geolocation, '_resolver', None)
+    monkeypatch.setenv('RESUME_GEO_PROVIDER', 'stub')
+    with caplog.at_level('WARNING', logger='geolocation'):
+        resolver = geolocation.get_geo_resolver()
+    assert isinstance(resolver.provider, StubGeoProvider)
+    assert caplog.text == ''
@@ -0,0 +1,81 @@
+
+RESUME = (
+    'John Smith\n'
+    'john.smith@mail.com +1 202 555 0189\n'
+    'Education\n'
+    'BSc Computer Science, Boston University\n'
+    'Experience\n'
+    'Software Engineer at Acme Corp, java and sql\n'
+    'Projects\n'
+    'Recommendation Engine in python\n'
+    'Skills\n'
+    'python, java, docker\n'
+    'Hobbies\n'
+    'Chess Club\n'
+)
+
+
+def _document(text):
+    from utils.document import ParsedDocument
+    return ParsedDocument.from_snapshot(
+        {'name': 'resume.txt', 'pages': [text], 'layout': [],
+         'page_count': 1})
+
+
+def _parse(skills_file, lazy):
+    from pyresparser.resume_parser import ResumeParser
+    return ResumeParser(_document(RESUME), skills_file, lazy=lazy)
+
+
+def test_lazy_mode_parses_a_multi_section_resume(fake_models, skills_file):
+    parser = _parse(skills_file, lazy=True)
+    details = parser.get_extracted_data()
+    assert details['name'] == 'John Smith'
+    assert details['email'] == 'john.smith@mail.com'
+    assert details['designation'] == ['Engineer']
+    assert sorted(s.lower() for s in details['skills']) == \
+        ['docker', 'java', 'python', 'sql']
+    assert parser.get_docs() == (None, None)
+
+
+def test_lazy_mode_matches_full_mode(fake_models, skills_file):
+    lazy = _parse(skills_file, lazy=True).get_extracted_data()
+    full = _parse(skills_file, lazy=False).get_extracted_data()
+    for field in ('name', 'email', 'mobile_number', 'designation'):
+        assert lazy[field] == full[field]
+    assert sorted(lazy['skills']) == sorted(full['skills'])
+
+
+def test_lazy_spans_are_document_offsets(fake_models, skills_file):
+    parser = _parse(skills_file, lazy=True)
+    spans = dict((RESUME[start:end], label)
+                 for label, start, end in parser.get_entity_spans())
+    assert spans == {'Boston University': 'ORG', 'Engineer': 'Designation'}
+
+
+def test_untagged_sections_skip_the_name(fake_models, skills_file):
+    from utils.sections import split_sections
+    from pyresparser.resume_parser import section_fields
+    sections = split_sections(RESUME)
+    fields = section_fields(sections, skills_file, lazy=True)
+    names = dict((s.name, f['name']) for s, f in zip(sections, fields))
+    assert names['header'] == 'John Smith'
+    # "Chess Club" would match the name pattern if it were tagged
+    assert names['interests'] is None
+
+
+def test_incremental_reuses_unchanged_sections(fake_models, skills_file):
+    from pyresparser.incremental import IncrementalParser
+    parser = IncrementalParser(skills_file, lazy=True)
+    first = parser.parse(_document(RESUME))
+    assert parser.last_stats == {'sections': 6, 'analysed': 6, 'reused': 0}
+    revised = RESUME.replace('python, java, docker', 'python, java, react')
+    second = parser.parse(_document(revised))
+    assert parser.last_stats == {'sections': 6, 'analysed': 1, 'reused': 5}
+    assert second['name'] == first['name']
+    assert 'React' in second['skills'] and 'Docker' not in second['skills']
+
+
+def test_organisations_are_kept_in_the_result(fake_models, skills_file):
+    details = _parse(skills_file, lazy=True).get_extracted_data()
+    assert details['organisations'] == ['Boston University']
@@ -0,0 +1,16 @@
+import base64
+
+import preview
+from utils.document import ParsedDocument
+
+
+def test_no_server_without_a_public_url(monkeypatch):
+    monkeypatch.delenv('RESUME_PREVIEW_URL', raising=False)
+    assert preview.get_preview_server() is None
+
+
+def test_inline_url_embeds_the_document():
+    document = ParsedDocument(b'%PDF-1.4 fake', name='cv.pdf')
+    url = preview.inline_url(document)
+    assert url.startswith('data:application/pdf;base64,')
+    assert base64.b64decode(url.split(',', 1)[1]) == b'%PDF-1.4 fake'
@@ -0,0 +1,72 @@
+import query_cache
+from query_cache import QueryCache
+
+
+class Loader(object):
+
+    def __init__(self, value='rows', during=None):
+        self.value = value
+        self.during = during
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.during is not None:
+            self.during()
+        return '%s-%d' % (self.value, self.calls)
+
+
+def test_hits_until_the_ttl_expires(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(query_cache.time, 'time', lambda: now[0])
+    cache = QueryCache(ttl=60)
+    load = Loader()
+    assert cache.get('q', ('user_data',), load) == 'rows-1'
+    now[0] += 59
+    assert cache.get('q', ('user_data',), load) == 'rows-1'
+    now[0] += 2
+    assert cache.get('q', ('user_data',), load) == 'rows-2'
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+
+
+def test_invalidate_drops_only_dependent_entries():
+    cache = QueryCache()
+    users, feedback, both = Loader('u'), Loader('f'), Loader('b')
+    cache.get('users', ('user_data',), users)
+    cache.get('feedback', ('user_feedback',), feedback)
+    cache.get('both', ('user_data', 'user_feedback'), both)
+    cache.invalidate('user_feedback')
+    cache.get('users', ('user_data',), users)
+    cache.get('feedback', ('user_feedback',), feedback)
+    cache.get('both', ('user_data', 'user_feedback'), both)
+    assert (users.calls, feedback.calls, both.calls) == (1, 2, 2)
+
+
+def test_load_racing_an_invalidation_is_not_stored():
+    cache = QueryCache()
+    # the write is committed while the query is running
+    racing = Loader(during=lambda: cache.invalidate('user_data'))
+    assert cache.get('q', ('user_data',), racing) == 'rows-1'
+    assert cache.stats()['entries'] == 0
+    racing.during = None
+    assert cache.get('q', ('user_data',), racing) == 'rows-2'
+    assert cache.get('q', ('user_data',), racing) == 'rows-2'
+
+
+def test_commit_listener_invalidates():
+    cache = QueryCache()
+    load = Loader()
+    cache.get('q', ('user_feedback',), load)
+    cache.on_commit('user_feedback', [('row',)])
+    cache.get('q', ('user_feedback',), load)
+    assert load.calls == 2
+
+
+def test_oldest_entries_are_evicted():
+    cache = QueryCache(max_entries=2)
+    for key in 'abc':
+        cache.get(key, (), Loader(key))
+    assert cache.stats()['entries'] == 2
+    load = Loader('a')
+    cache.get('a', (), load)
+    assert load.calls == 1
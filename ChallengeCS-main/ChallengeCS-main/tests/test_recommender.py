@@ -0,0 +1,57 @@
+import copy
+
+import Courses
+from field_classifier import JobField
+from recommender import CourseCatalog, default_catalog
+
+FIELD = JobField('Web Development', ['react', 'django'],
+                 ['Node JS', 'Flask'])
+
+COURSES = [
+    ['HTML basics', 'https://example.com/0'],
+    ['Django for beginners', 'https://example.com/1'],
+    ['React and Django full stack', 'https://example.com/2'],
+    ['CSS layouts', 'https://example.com/3'],
+    ['React with Node JS and Flask', 'https://example.com/4'],
+    ['Flask in a weekend', 'https://example.com/5'],
+]
+
+
+def _catalog():
+    return CourseCatalog({'Web Development': COURSES}, [FIELD])
+
+
+def test_courses_covering_more_of_the_gap_rank_first():
+    ranked = _catalog().recommend('Web Development', ['CSS'], k=6)
+    # react, node js and flask; then react and django; then one skill each
+    assert [c.link[-1] for c in ranked] == ['4', '2', '1', '5', '0', '3']
+
+
+def test_known_skills_do_not_count():
+    ranked = _catalog().recommend('Web Development',
+                                  ['React', 'Node JS', 'Flask'], k=3)
+    # only django is missing
+    assert [c.link[-1] for c in ranked] == ['1', '2', '0']
+
+
+def test_ties_keep_the_catalog_order():
+    ranked = _catalog().recommend('Web Development',
+                                  ['react', 'node js', 'flask', 'django'])
+    assert [c.position for c in ranked] == list(range(len(COURSES)))
+
+
+def test_unknown_field_has_no_courses():
+    assert _catalog().recommend('Cooking', ['knives']) == []
+
+
+def test_course_lists_are_not_mutated():
+    lists = ('ds_course', 'web_course', 'android_course', 'ios_course',
+             'uiux_course')
+    before = dict((name, copy.deepcopy(getattr(Courses, name)))
+                  for name in lists)
+    for field in default_catalog.courses:
+        default_catalog.recommend(field, [], k=100)
+        default_catalog.recommend(field, ['python', 'react'], k=3)
+    CourseCatalog()
+    for name in lists:
+        assert getattr(Courses, name) == before[name]
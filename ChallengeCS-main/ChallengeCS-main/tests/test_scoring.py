@@ -0,0 +1,101 @@
+'''
+The rule-table scorer against the elif ladder of App.py it replaced
+'''
+import itertools
+
+import pytest
+
+from scoring import ResumeScorer, score_resume
+
+
+def legacy_score(resume_text):
+    # copied from the baseline App.py; the first two checks were written
+    # `if 'Objective' or 'Summary' in resume_text`, which is always true,
+    # the intended test is used here
+    resume_score = 0
+    if 'Objective' in resume_text or 'Summary' in resume_text:
+        resume_score = resume_score + 6
+    if 'Education' in resume_text or 'School' in resume_text or 'College' in resume_text:
+        resume_score = resume_score + 12
+    if 'EXPERIENCE' in resume_text:
+        resume_score = resume_score + 16
+    elif 'Experience' in resume_text:
+        resume_score = resume_score + 16
+    if 'INTERNSHIPS' in resume_text:
+        resume_score = resume_score + 6
+    elif 'INTERNSHIP' in resume_text:
+        resume_score = resume_score + 6
+    elif 'Internships' in resume_text:
+        resume_score = resume_score + 6
+    elif 'Internship' in resume_text:
+        resume_score = resume_score + 6
+    if 'SKILLS' in resume_text:
+        resume_score = resume_score + 7
+    elif 'SKILL' in resume_text:
+        resume_score = resume_score + 7
+    elif 'Skills' in resume_text:
+        resume_score = resume_score + 7
+    elif 'Skill' in resume_text:
+        resume_score = resume_score + 7
+    if 'HOBBIES' in resume_text:
+        resume_score = resume_score + 4
+    elif 'Hobbies' in resume_text:
+        resume_score = resume_score + 4
+    if 'INTERESTS' in resume_text:
+        resume_score = resume_score + 5
+    elif 'Interests' in resume_text:
+        resume_score = resume_score + 5
+    if 'ACHIEVEMENTS' in resume_text:
+        resume_score = resume_score + 13
+    elif 'Achievements' in resume_text:
+        resume_score = resume_score + 13
+    if 'CERTIFICATIONS' in resume_text:
+        resume_score = resume_score + 12
+    elif 'Certifications' in resume_text:
+        resume_score = resume_score + 12
+    elif 'Certification' in resume_text:
+        resume_score = resume_score + 12
+    if 'PROJECTS' in resume_text:
+        resume_score = resume_score + 19
+    elif 'PROJECT' in resume_text:
+        resume_score = resume_score + 19
+    elif 'Projects' in resume_text:
+        resume_score = resume_score + 19
+    elif 'Project' in resume_text:
+        resume_score = resume_score + 19
+    return resume_score
+
+
+# every string the ladder looks for, plus near misses
+WORDS = ['Objective', 'Summary', 'Education', 'School', 'College',
+         'EXPERIENCE', 'Experience', 'INTERNSHIPS', 'INTERNSHIP',
+         'Internships', 'Internship', 'SKILLS', 'SKILL', 'Skills', 'Skill',
+         'HOBBIES', 'Hobbies', 'INTERESTS', 'Interests', 'ACHIEVEMENTS',
+         'Achievements', 'CERTIFICATIONS', 'Certifications', 'Certification',
+         'PROJECTS', 'PROJECT', 'Projects', 'Project',
+         'objective', 'experience', 'Proj', 'Hobby', 'skills']
+
+
+@pytest.mark.parametrize('words', list(itertools.chain(
+    ([w] for w in WORDS),
+    itertools.combinations(WORDS, 2),
+    [WORDS, []])))
+def test_scores_match_the_ladder(words):
+    text = 'Jane Doe\n' + '\n'.join(w + ':' for w in words) + '\nend'
+    assert ResumeScorer().score(text).score == legacy_score(text)
+
+
+@pytest.mark.parametrize('text', [
+    'xxPROJECTSKILLSxx', 'InternshipsSummaryEducation',
+    'CERTIFICATIONSHOBBIESINTERESTS', 'Experiencexxx', 'CollegeSchool'])
+def test_overlapping_words_are_all_seen(text):
+    assert ResumeScorer().score(text).score == legacy_score(text)
+
+
+def test_full_resume_scores_100():
+    text = ' '.join(['Objective', 'Education', 'Experience', 'Internships',
+                     'Skills', 'Hobbies', 'Interests', 'Achievements',
+                     'Certifications', 'Projects'])
+    result = score_resume(text)
+    assert result.score == legacy_score(text) == 100
+    assert result.missing == []
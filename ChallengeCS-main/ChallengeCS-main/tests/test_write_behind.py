@@ -0,0 +1,80 @@
+import contextlib
+
+import pytest
+
+pymysql = pytest.importorskip('pymysql')
+from storage import WriteBehindQueue, TABLE_COLUMNS
+
+
+class FakeCursor(object):
+
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+
+    def execute(self, sql, args=None):
+        if self.db.down:
+            raise pymysql.err.OperationalError(2006, 'MySQL server has gone away')
+        width = TABLE_COLUMNS['user_feedback']
+        for start in range(0, len(args), width):
+            row = tuple(args[start:start + width])
+            if row[0] == 'bad':
+                raise pymysql.err.DataError(1406, 'Data too long')
+            self.rows.append(row)
+
+
+class FakePool(object):
+    '''
+    Commits the rows of a cursor only when its block succeeds
+    '''
+
+    def __init__(self):
+        self.down = False
+        self.committed = []
+
+    @contextlib.contextmanager
+    def cursor(self):
+        cursor = FakeCursor(self)
+        yield cursor
+        self.committed.extend(cursor.rows)
+
+
+def _row(name):
+    return (name, 'a@b.c', '5', 'ok', '2024-01-01')
+
+
+@pytest.fixture
+def queue():
+    q = WriteBehindQueue(FakePool(), interval=60)
+    yield q
+    q.close()
+
+
+def test_operational_error_keeps_the_rows(queue):
+    queue.pool.down = True
+    queue.put('user_feedback', _row('a'))
+    queue.put('user_feedback', _row('b'))
+    assert queue.flush() == 0
+    assert queue.pending() == 2
+    queue.pool.down = False
+    assert queue.flush() == 2
+    assert [r[0] for r in queue.pool.committed] == ['a', 'b']
+
+
+def test_bad_row_is_dropped_alone(queue):
+    for name in ('a', 'bad', 'c'):
+        queue.put('user_feedback', _row(name))
+    assert queue.flush() == 2
+    assert [r[0] for r in queue.pool.committed] == ['a', 'c']
+    assert queue.pending() == 0
+    assert queue.stats()['dropped'] == 1
+
+
+def test_commit_listeners_see_only_written_rows(queue):
+    seen = []
+    queue.add_listener(lambda table, rows: seen.extend(rows),
+                       after_commit=True)
+    for name in ('a', 'bad'):
+        queue.put('user_feedback', _row(name))
+    queue.flush()
+    assert [r[0] for r in seen] == ['a']
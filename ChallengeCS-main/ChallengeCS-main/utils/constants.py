@@ -0,0 +1,34 @@
+# Omkar Pathak
+
+# two consecutive proper nouns, see `custom_utils.extract_name`
+NAME_PATTERN = [{'POS': 'PROPN'}, {'POS': 'PROPN'}]
+
+RESUME_SECTIONS_PROFESSIONAL = [
+                    'experience',
+                    'education',
+                    'interests',
+                    'professional experience',
+                    'publications',
+                    'skills',
+                    'certifications',
+                    'objective',
+                    'career objective',
+                    'summary',
+                    'leadership'
+                ]
+
+RESUME_SECTIONS_GRAD = [
+                    'accomplishments',
+                    'experience',
+                    'education',
+                    'interests',
+                    'projects',
+                    'professional experience',
+                    'publications',
+                    'skills',
+                    'certifications',
+                    'objective',
+                    'career objective',
+                    'summary',
+                    'leadership'
+                ]
@@ -0,0 +1,106 @@
+# Contact details (urls, emails, phone numbers) found in one pass
+
+import re
+import collections
+
+ContactMatch = collections.namedtuple('ContactMatch',
+                                      ['kind', 'text', 'start', 'end'])
+
+KINDS = ('url', 'email', 'phone')
+
+# Every repetition is bounded and every alternative can only start where
+# its first character class begins a run (look-behinds), so an attempt
+# examines a bounded number of characters and the scan stays linear in
+# the length of the text, whatever the input.
+CONTACT_PATTERN = re.compile(r'''
+    (?P<url>
+        (?:https?://|www\.)
+        [^\s<>"]{1,2048}
+    )
+  | (?P<email>
+        (?<![A-Za-z0-9._%+-])
+        [A-Za-z0-9._%+-]{1,64}
+        @
+        (?:[A-Za-z0-9-]{1,63}\.){1,8}
+        [A-Za-z]{2,24}
+    )
+  | (?P<phone>
+        (?<![\w+(])
+        (?:\+|00)?
+        \(?\d
+        [\d \t().-]{5,24}
+        \d
+        (?!\d)
+    )
+''', re.VERBOSE)
+
+# punctuation ending a sentence rather than the url
+URL_TRAILING = '.,;:!?)]}\'"'
+
+_NOT_DIGIT = re.compile(r'[^\d+]')
+
+
+class ContactScanner(object):
+    '''
+    Finds urls, emails and phone numbers with a single precompiled
+    pattern. Urls are tried first, so the digits and @ of a link are
+    never reported as a phone or an email.
+    '''
+
+    def __init__(self, min_phone_digits=7):
+        self.min_phone_digits = min_phone_digits
+
+    def iter_scan(self, text):
+        '''
+        :param text: plain text
+        :return: generator of `ContactMatch` in text order
+        '''
+        for match in CONTACT_PATTERN.finditer(text or ''):
+            kind = match.lastgroup
+            start, end = match.span()
+            value = match.group()
+            if kind == 'url':
+                stripped = value.rstrip(URL_TRAILING)
+                end -= len(value) - len(stripped)
+                value = stripped
+            elif kind == 'phone':
+                if sum(c.isdigit() for c in value) < self.min_phone_digits:
+                    continue
+            yield ContactMatch(kind, value, start, end)
+
+    def scan(self, text):
+        '''
+        :return: list of `ContactMatch` in text order
+        '''
+        return list(self.iter_scan(text))
+
+    def first(self, text, kind, matches=None):
+        '''
+        :param kind: one of `KINDS`
+        :param matches: result of `scan` on the same text, to avoid a
+                        second pass
+        :return: first `ContactMatch` of that kind, or None
+        '''
+        for match in (self.iter_scan(text) if matches is None else matches):
+            if match.kind == kind:
+                return match
+        return None
+
+    def spans(self, text, kinds=KINDS, matches=None):
+        '''
+        :return: list of (start, end) offsets of the matches of `kinds`,
+                 for extractors that should skip contact details
+        '''
+        if matches is None:
+            matches = self.iter_scan(text)
+        return [(m.start, m.end) for m in matches if m.kind in kinds]
+
+
+def normalise_phone(value):
+    '''
+    Helper function to keep only the digits and + of a phone number
+    '''
+    return _NOT_DIGIT.sub('', value)
+
+
+default_scanner = ContactScanner()
@@ -1,93 +1,96 @@
 # Author: Omkar Pathak
 
 import io
-import os
 import re
-import nltk
-import pandas as pd
+import threading
 import docx2txt
 from datetime import datetime
 from dateutil import relativedelta
 from . import constants as cs
+from .skills_index import get_skills_index
+from .contact_scanner import default_scanner, normalise_phone
+from spacy.matcher import Matcher
 from pdfminer.converter import TextConverter
 from pdfminer.pdfinterp import PDFPageInterpreter
 from pdfminer.pdfinterp import PDFResourceManager
 from pdfminer.layout import LAParams
 from pdfminer.pdfpage import PDFPage
 from pdfminer.pdfparser import PDFSyntaxError
-from nltk.stem import WordNetLemmatizer
-from nltk.corpus import stopwords
 
 
-def extract_text_from_pdf(pdf_path):
+# layout analysis settings for pdf text extraction:
+# - layout: full pdfminer layout analysis (most faithful reading order)
+# - fast: lines are still grouped, but the costly hierarchical grouping
+#   of text boxes is skipped
+# - raw: no layout analysis at all, characters in content-stream order
+PDF_MODES = ('layout', 'fast', 'raw')
+
+
+def get_laparams(mode='layout'):
+    '''
+    Helper function to map an extraction mode to pdfminer `LAParams`
+
+    :param mode: one of `PDF_MODES`
+    :return: object of `LAParams`, or None for raw extraction
+    '''
+    if mode == 'layout':
+        return LAParams()
+    if mode == 'fast':
+        return LAParams(boxes_flow=None, detect_vertical=False)
+    if mode == 'raw':
+        return None
+    raise ValueError('unknown pdf extraction mode: %r' % (mode,))
+
+
+def _extract_pages(fh, mode='layout'):
+    # one resource manager and converter for the whole document, so that
+    # pdfminer's font and CMap caches survive from page to page
+    resource_manager = PDFResourceManager(caching=True)
+    fake_file_handle = io.StringIO()
+    converter = TextConverter(
+        resource_manager,
+        fake_file_handle,
+        codec='utf-8',
+        laparams=get_laparams(mode)
+    )
+    page_interpreter = PDFPageInterpreter(resource_manager, converter)
+    try:
+        for page in PDFPage.get_pages(
+                fh,
+                caching=True,
+                check_extractable=True
+        ):
+            page_interpreter.process_page(page)
+            text = fake_file_handle.getvalue()
+            fake_file_handle.seek(0)
+            fake_file_handle.truncate(0)
+            yield text
+    except PDFSyntaxError:
+        return
+    finally:
+        # close open handles
+        converter.close()
+        fake_file_handle.close()
+
+
+def extract_text_from_pdf(pdf_path, mode='layout'):
     '''
     Helper function to extract the plain text from .pdf files
 
     :param pdf_path: path to PDF file to be extracted (remote or local)
+    :param mode: layout analysis mode, one of `PDF_MODES`
     :return: iterator of string of extracted text
     '''
     # https://www.blog.pythonlibrary.org/2018/05/03/exporting-data-from-pdfs-with-python/
     if not isinstance(pdf_path, io.BytesIO):
         # extract text from local pdf file
         with open(pdf_path, 'rb') as fh:
-            try:
-                for page in PDFPage.get_pages(
-                        fh,
-                        caching=True,
-                        check_extractable=True
-                ):
-                    resource_manager = PDFResourceManager()
-                    fake_file_handle = io.StringIO()
-                    converter = TextConverter(
-                        resource_manager,
-                        fake_file_handle,
-                        codec='utf-8',
-                        laparams=LAParams()
-                    )
-                    page_interpreter = PDFPageInterpreter(
-                        resource_manager,
-                        converter
-                    )
-                    page_interpreter.process_page(page)
-
-                    text = fake_file_handle.getvalue()
-                    yield text
-
-                    # close open handles
-                    converter.close()
-                    fake_file_handle.close()
-            except PDFSyntaxError:
-                return
+            for text in _extract_pages(fh, mode):
+                yield text
     else:
         # extract text from remote pdf file
-        try:
-            for page in PDFPage.get_pages(
-                    pdf_path,
-                    caching=True,
-                    check_extractable=True
-            ):
-                resource_manager = PDFResourceManager()
-                fake_file_handle = io.StringIO()
-                converter = TextConverter(
-                    resource_manager,
-                    fake_file_handle,
-                    codec='utf-8',
-                    laparams=LAParams()
-                )
-                page_interpreter = PDFPageInterpreter(
-                    resource_manager,
-                    converter
-                )
-                page_interpreter.process_page(page)
-
-                text = fake_file_handle.getvalue()
-                yield text
-
-                # close open handles
-                converter.close()
-                fake_file_handle.close()
-        except PDFSyntaxError:
-            return
+        for text in _extract_pages(pdf_path, mode):
+            yield text
 
 
 def get_number_of_pages(file_name):
@@ -153,17 +156,18 @@ def extract_text_from_doc(doc_path):
         return ' '
 
 
-def extract_text(file_path, extension):
+def extract_text(file_path, extension, mode='layout'):
     '''
     Wrapper function to detect the file extension and call text
     extraction function accordingly
 
     :param file_path: path of file of which text is to be extracted
     :param extension: extension of file `file_name`
+    :param mode: pdf layout analysis mode, one of `PDF_MODES`
     '''
     text = ''
     if extension == '.pdf':
-        for page in extract_text_from_pdf(file_path):
+        for page in extract_text_from_pdf(file_path, mode):
             text += ' ' + page
     elif extension == '.docx':
         text = extract_text_from_docx(file_path)
@@ -320,38 +324,81 @@ def extract_entity_sections_professional(text):
     return entities
 
 
-def extract_email(text):
+def extract_email(text, contacts=None):
     '''
     Helper function to extract email id from text
 
     :param text: plain text extracted from resume file
+    :param contacts: optional result of `default_scanner.scan(text)`
+    :return: string of the first email id, or None
     '''
-    email = re.findall(r"([^@|\s]+@[^@]+\.[^@|\s]+)", text)
-    if email:
-        try:
-            return email[0].split()[0].strip(';')
-        except IndexError:
-            return None
+    match = default_scanner.first(text, 'email', contacts)
+    return match.text if match else None
+
+
+# the name is looked for in the first tokens/lines of the resume first
+NAME_HEADER_TOKENS = 60
+NAME_HEADER_LINES = 8
+
+_name_matchers = {}
+_name_matchers_lock = threading.Lock()
 
 
-def extract_name(nlp_text, matcher):
+def get_name_matcher(vocab):
+    '''
+    Return the matcher of `cs.NAME_PATTERN` for a vocab, compiled on
+    first use and shared by every parse
+
+    :param vocab: object of `spacy.vocab.Vocab`
+    :return: object of `spacy.matcher.Matcher`
+    '''
+    key = id(vocab)
+    entry = _name_matchers.get(key)
+    if entry is None or entry[0] is not vocab:
+        with _name_matchers_lock:
+            entry = _name_matchers.get(key)
+            if entry is None or entry[0] is not vocab:
+                matcher = Matcher(vocab)
+                matcher.add('NAME', [cs.NAME_PATTERN])
+                # the vocab is kept so that its id is not reused
+                entry = _name_matchers[key] = (vocab, matcher)
+    return entry[1]
+
+
+def _header_end(nlp_text, max_tokens, max_lines):
+    end = min(len(nlp_text), max_tokens)
+    if max_lines is not None:
+        lines = 0
+        for token in nlp_text[:end]:
+            if '\n' in token.text or '\n' in token.whitespace_:
+                lines += 1
+                if lines >= max_lines:
+                    return token.i + 1
+    return end
+
+
+def extract_name(nlp_text, header_tokens=NAME_HEADER_TOKENS,
+                 header_lines=NAME_HEADER_LINES):
     '''
     Helper function to extract name from spacy nlp text
 
     :param nlp_text: object of `spacy.tokens.doc`
-    :param matcher: object of `spacy.matcher.Matcher`
+    :param header_tokens: size of the header window, in tokens
+    :param header_lines: size of the header window, in lines (when the
+                         text has line breaks)
     :return: string of full name
     '''
-    pattern = [cs.NAME_PATTERN]
-
-    matcher.add('NAME', None, *pattern)
-
-    matches = matcher(nlp_text)
-
-    for _, start, end in matches:
-        span = nlp_text[start:end]
-        if 'name' not in span.text.lower():
-            return span.text
+    matcher = get_name_matcher(nlp_text.vocab)
+    end = _header_end(nlp_text, header_tokens, header_lines)
+    # the whole text is only matched when the header has no name
+    for window in (nlp_text[:end], nlp_text):
+        for _, start, stop in matcher(window):
+            span = window[start:stop]
+            if 'name' not in span.text.lower():
+                return span.text
+        if end >= len(nlp_text):
+            break
+    return None
 
 
 # def extract_mobile_number(text, custom_regex=None):
@@ -382,7 +429,7 @@ def extract_name(nlp_text, matcher):
 #         return number
 
 
-def extract_mobile_number(text, custom_regex=None):
+def extract_mobile_number(text, custom_regex=None, contacts=None):
     """
     Extracts phone numbers from text (supports international formats).
 
@@ -391,28 +438,19 @@ def extract_mobile_number(text, custom_regex=None):
     +1 (202) 555-0189
     0044 20 7946 0018
     +91-9876543210
+
+    :param contacts: optional result of `default_scanner.scan(text)`
     """
     if custom_regex:
-        pattern = custom_regex
-    else:
-        # Regex that captures optional +country codes, parentheses, spaces, dashes, etc.
-        pattern = r"""
-            (?:(?:\+|00)?\d{1,3}[\s\-\(\)]*)?     # Country code, like +216 or 0044
-            (?:\(?\d{1,4}\)?[\s\-\(\)]*){2,5}     # Main number groups
-            (?:\#|x|ext\.?|extension)?\s*\d{0,5}   # Optional extension
-        """
-    
-    matches = re.findall(pattern, text, flags=re.VERBOSE)
-    cleaned_numbers = []
-
-    for match in matches:
-        # Clean up unnecessary characters
-        number = re.sub(r"[^\d+]", "", match)  # keep digits and +
-        # Require at least 7 digits (to filter out garbage)
-        if len(re.sub(r"\D", "", number)) >= 7:
-            cleaned_numbers.append(number)
+        for match in re.findall(custom_regex, text, flags=re.VERBOSE):
+            number = normalise_phone(''.join(match) if isinstance(match, tuple) else match)
+            # Require at least 7 digits (to filter out garbage)
+            if sum(c.isdigit() for c in number) >= 7:
+                return number
+        return None
+    match = default_scanner.first(text, 'phone', contacts)
+    return normalise_phone(match.text) if match else None
 
-    return cleaned_numbers[0] if cleaned_numbers else None
 
 def extract_skills(nlp_text, noun_chunks, skills_file=None):
     '''
@@ -420,26 +458,19 @@ def extract_skills(nlp_text, noun_chunks, skills_file=None):
 
     :param nlp_text: object of `spacy.tokens.doc`
     :param noun_chunks: noun chunks extracted from nlp text
+    :param skills_file: optional path to a custom skills csv
     :return: list of skills extracted
     '''
-    tokens = [token.text for token in nlp_text if not token.is_stop]
-    if not skills_file:
-        data = pd.read_csv(
-            os.path.join(os.path.dirname(__file__), 'skills.csv')
-        )
-    else:
-        data = pd.read_csv(skills_file)
-    skills = list(data.columns.values)
-    skillset = []
-    # check for one-grams
-    for token in tokens:
-        if token.lower() in skills:
-            skillset.append(token)
+    index = get_skills_index(skills_file)
+    words = [token.text for token in nlp_text]
+    stop = [token.is_stop for token in nlp_text]
+    # one-grams and multi-word skills in a single pass
+    skillset = index.match_tokens(words, skip=stop)
 
-    # check for bi-grams and tri-grams
+    # noun chunks may span tokens differently from the skill phrases
     for token in noun_chunks:
         token = token.text.lower().strip()
-        if token in skills:
+        if token in index:
             skillset.append(token)
     return [i.capitalize() for i in set([i.lower() for i in skillset])]
 
@@ -0,0 +1,92 @@
+import os
+import json
+from spacy.tokens import DocBin
+
+DEFAULT_DOCBIN_DIR = os.environ.get(
+    'RESUME_DOCBIN_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'resume_parser',
+                 'docbins')
+)
+
+
+def _write_atomic(path, data, mode='wb'):
+    tmp = path + '.tmp'
+    with open(tmp, mode) as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+class DocBinStore(object):
+    '''
+    On-disk store of the spaCy Docs produced for a resume, keyed by the
+    SHA-256 of the file. Keeping the Docs means rule changes (skills,
+    section keywords, education heuristics) can be re-applied to the
+    whole corpus without running either pipeline again.
+    '''
+
+    def __init__(self, directory=DEFAULT_DOCBIN_DIR):
+        self.directory = directory
+
+    def __path(self, digest, suffix):
+        return os.path.join(self.directory, digest[:2], digest + suffix)
+
+    def has(self, digest):
+        return os.path.exists(self.__path(digest, '.json'))
+
+    def save(self, digest, nlp_doc, custom_doc, snapshot):
+        '''
+        Persist both Docs of one resume
+
+        :param digest: SHA-256 of the resume file
+        :param nlp_doc: `en_core_web_sm` Doc of the normalised text
+        :param custom_doc: custom-model Doc of the raw text
+        :param snapshot: `ParsedDocument.snapshot()` of the resume
+        '''
+        folder = os.path.dirname(self.__path(digest, ''))
+        if not os.path.isdir(folder):
+            os.makedirs(folder, exist_ok=True)
+        for suffix, doc in (('.nlp.spacy', nlp_doc),
+                            ('.custom.spacy', custom_doc)):
+            doc_bin = DocBin(store_user_data=True)
+            doc_bin.add(doc)
+            _write_atomic(self.__path(digest, suffix), doc_bin.to_bytes())
+        # written last: its presence marks a complete entry
+        _write_atomic(self.__path(digest, '.json'),
+                      json.dumps(snapshot), mode='w')
+
+    def load(self, digest, nlp_vocab, custom_vocab):
+        '''
+        Restore the Docs of one resume
+
+        :param nlp_vocab: vocab of the `en_core_web_sm` pipeline
+        :param custom_vocab: vocab of the custom NER pipeline
+        :return: tuple of (nlp Doc, custom Doc, document snapshot)
+        '''
+        docs = []
+        for suffix, vocab in (('.nlp.spacy', nlp_vocab),
+                              ('.custom.spacy', custom_vocab)):
+            with open(self.__path(digest, suffix), 'rb') as fh:
+                doc_bin = DocBin().from_bytes(fh.read())
+            docs.append(list(doc_bin.get_docs(vocab))[0])
+        return docs[0], docs[1], self.snapshot(digest)
+
+    def snapshot(self, digest):
+        '''
+        Document snapshot of one entry, without loading its Docs
+        '''
+        with open(self.__path(digest, '.json')) as fh:
+            return json.load(fh)
+
+    def digests(self):
+        '''
+        Iterate over the hashes of every complete entry, in a stable order
+        '''
+        if not os.path.isdir(self.directory):
+            return
+        for folder in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, folder)
+            if not os.path.isdir(path):
+                continue
+            for name in sorted(os.listdir(path)):
+                if name.endswith('.json'):
+                    yield name[:-len('.json')]
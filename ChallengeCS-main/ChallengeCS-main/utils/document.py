@@ -0,0 +1,401 @@
+import io
+import os
+import math
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pdfminer.converter import PDFPageAggregator
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdfinterp import PDFPageInterpreter
+from pdfminer.pdfinterp import PDFResourceManager
+from pdfminer.layout import LTContainer, LTText, LTTextBox
+from pdfminer.layout import LTTextLine, LTImage, LTFigure
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFSyntaxError
+from . import custom_utils
+
+
+def _render_text(item, out):
+    '''
+    Helper function to flatten an analysed pdfminer layout into plain
+    text, in the same way `TextConverter` writes it
+
+    :param item: pdfminer layout object
+    :param out: list the text fragments are appended to
+    '''
+    if isinstance(item, LTContainer):
+        for child in item:
+            _render_text(child, out)
+    elif isinstance(item, LTText):
+        out.append(item.get_text())
+    if isinstance(item, LTTextBox):
+        out.append('\n')
+
+
+def _page_layout(number, layout):
+    '''
+    Helper function to summarise the layout of one analysed page
+
+    :param number: 1-based page number
+    :param layout: object of `pdfminer.layout.LTPage`
+    :return: dictionary of basic layout information
+    '''
+    info = {
+        'page': number,
+        'width': layout.width,
+        'height': layout.height,
+        'text_boxes': 0,
+        'text_lines': 0,
+        'images': 0,
+    }
+    stack = list(layout)
+    while stack:
+        item = stack.pop()
+        if isinstance(item, LTTextBox):
+            info['text_boxes'] += 1
+        elif isinstance(item, LTTextLine):
+            info['text_lines'] += 1
+        elif isinstance(item, LTImage):
+            info['images'] += 1
+        if isinstance(item, (LTTextBox, LTFigure)):
+            stack.extend(item)
+    return info
+
+
+def parse_pdf(fh, mode='layout', pagenos=None):
+    '''
+    Helper function to walk a pdf exactly once and collect the text and
+    layout of every page
+
+    :param fh: binary file object of the pdf
+    :param mode: layout analysis mode, see `custom_utils.PDF_MODES`
+    :param pagenos: optional set of 0-based page numbers to extract
+    :return: tuple of (list of page texts, list of page layouts)
+    '''
+    pages = []
+    layouts = []
+    numbers = sorted(pagenos) if pagenos else None
+    # one resource manager per document keeps pdfminer's font caches warm
+    resource_manager = PDFResourceManager(caching=True)
+    device = PDFPageAggregator(
+        resource_manager,
+        laparams=custom_utils.get_laparams(mode)
+    )
+    interpreter = PDFPageInterpreter(resource_manager, device)
+    try:
+        for page in PDFPage.get_pages(
+                fh,
+                pagenos=pagenos,
+                caching=True,
+                check_extractable=True
+        ):
+            interpreter.process_page(page)
+            layout = device.get_result()
+            out = []
+            _render_text(layout, out)
+            # TextConverter terminates every page with a form feed
+            out.append('\f')
+            number = numbers[len(pages)] + 1 if numbers else len(pages) + 1
+            pages.append(''.join(out))
+            layouts.append(_page_layout(number, layout))
+    finally:
+        device.close()
+    return pages, layouts
+
+
+# below this many pages a process pool costs more than it saves
+PARALLEL_PAGE_THRESHOLD = 8
+
+# worker count -> process pool, so callers asking for different sizes
+# each get the parallelism they asked for
+_page_pools = {}
+_page_pool_lock = threading.Lock()
+
+
+def _get_page_pool(workers):
+    with _page_pool_lock:
+        pool = _page_pools.get(workers)
+        if pool is None:
+            pool = _page_pools[workers] = ProcessPoolExecutor(max_workers=workers)
+    return pool
+
+
+def shutdown_page_pool():
+    '''
+    Stop the worker processes used for parallel page extraction
+    '''
+    with _page_pool_lock:
+        pools = list(_page_pools.values())
+        _page_pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+def count_pdf_pages(fh):
+    '''
+    Helper function to count pages from the page tree only, without
+    interpreting any page content
+
+    :param fh: binary file object of the pdf
+    :return: number of pages
+    '''
+    document = PDFDocument(PDFParser(fh))
+    return sum(1 for _ in PDFPage.create_pages(document))
+
+
+def _parse_page_range(data, mode, start, stop):
+    return parse_pdf(io.BytesIO(data), mode, set(range(start, stop)))
+
+
+def parse_pdf_parallel(
+    data,
+    mode='layout',
+    workers=None,
+    threshold=PARALLEL_PAGE_THRESHOLD
+):
+    '''
+    Helper function to extract long pdfs by fanning contiguous page
+    ranges out to a process pool; the text is reassembled in page order.
+    Documents shorter than `threshold` pages are parsed serially.
+
+    :param data: bytes of the pdf
+    :param mode: layout analysis mode, see `custom_utils.PDF_MODES`
+    :param workers: number of worker processes
+    :param threshold: minimum page count for parallel extraction
+    :return: tuple of (list of page texts, list of page layouts)
+    '''
+    total = count_pdf_pages(io.BytesIO(data))
+    workers = workers or os.cpu_count() or 1
+    if total < threshold or workers < 2:
+        return parse_pdf(io.BytesIO(data), mode)
+    step = int(math.ceil(total / float(workers)))
+    pool = _get_page_pool(workers)
+    futures = [
+        pool.submit(_parse_page_range, data, mode, start,
+                    min(start + step, total))
+        for start in range(0, total, step)
+    ]
+    pages, layouts = [], []
+    for future in futures:
+        chunk_pages, chunk_layouts = future.result()
+        pages.extend(chunk_pages)
+        layouts.extend(chunk_layouts)
+    return pages, layouts
+
+
+_persist_pool = None
+
+
+def _get_persist_pool():
+    global _persist_pool
+    with _page_pool_lock:
+        if _persist_pool is None:
+            _persist_pool = ThreadPoolExecutor(max_workers=1)
+    return _persist_pool
+
+
+def _write_file(path, buffer):
+    directory = os.path.dirname(os.path.abspath(path))
+    if not os.path.isdir(directory):
+        os.makedirs(directory, exist_ok=True)
+    tmp = path + '.part'
+    with open(tmp, 'wb') as fh:
+        fh.write(buffer)
+    os.replace(tmp, path)
+    return path
+
+
+class ParsedDocument(object):
+    '''
+    A resume read from disk (or memory) once. Text, per-page text, page
+    count and layout all come from a single parse and are shared by the
+    parser, the scorer and the education extractor.
+    '''
+
+    def __init__(
+        self,
+        source,
+        name=None,
+        mode='layout',
+        parallel=False,
+        workers=None
+    ):
+        if mode not in custom_utils.PDF_MODES:
+            raise ValueError('unknown pdf extraction mode: %r' % (mode,))
+        self.mode = mode
+        self.parallel = parallel
+        self.workers = workers
+        self.path = None
+        if isinstance(source, bytes):
+            # shared as-is: BytesIO over a bytes object does not copy it
+            data = source
+        elif isinstance(source, (bytearray, memoryview)):
+            data = bytes(source)
+        elif isinstance(source, io.BytesIO):
+            data = source.getvalue()
+            name = name or getattr(source, 'name', None)
+        elif hasattr(source, 'read'):
+            data = source.read()
+            name = name or getattr(source, 'name', None)
+        else:
+            with open(source, 'rb') as fh:
+                data = fh.read()
+            self.path = source
+            name = name or source
+        self.name = os.path.basename(name) if name else ''
+        self.extension = os.path.splitext(self.name)[1].lower()
+        self.__data = data
+        self.__sha256 = None
+        self.__pages = None
+        self.__layout = None
+        self.__page_count = None
+        self.__text = None
+
+    @classmethod
+    def from_upload(cls, uploaded_file, **kwargs):
+        '''
+        Wrap a Streamlit `UploadedFile` (or any named in-memory buffer)
+        without touching the filesystem; every consumer then shares the
+        same bytes object
+
+        :param uploaded_file: object with `getvalue()` and `name`
+        :return: object of `ParsedDocument`
+        '''
+        return cls(uploaded_file.getvalue(), name=uploaded_file.name,
+                   **kwargs)
+
+    @classmethod
+    def from_snapshot(cls, snapshot, name='', sha256=None):
+        '''
+        Rebuild a document from stored parse results when the original
+        file bytes are no longer needed (e.g. re-extraction from Docs)
+
+        :param snapshot: dictionary returned by `snapshot`
+        :param name: file name, defaults to the one in `snapshot`
+        :param sha256: content hash of the original file
+        '''
+        document = cls(b'', name=name or snapshot.get('name') or '')
+        document.restore(snapshot)
+        document.__sha256 = sha256
+        return document
+
+    @property
+    def data(self):
+        return self.__data
+
+    @property
+    def sha256(self):
+        if self.__sha256 is None:
+            self.__sha256 = hashlib.sha256(self.__data).hexdigest()
+        return self.__sha256
+
+    @property
+    def buffer(self):
+        '''
+        Zero-copy view of the document bytes
+        '''
+        return memoryview(self.__data)
+
+    def open(self):
+        '''
+        Return a fresh binary file object over the document bytes; the
+        bytes are shared with the document, not copied
+        '''
+        return io.BytesIO(self.__data)
+
+    def persist_async(self, directory, filename=None):
+        '''
+        Write the document to `directory` on a background thread so the
+        caller never waits on disk I/O
+
+        :param directory: target directory, created if missing
+        :param filename: defaults to the document name
+        :return: `concurrent.futures.Future` resolving to the file path
+        '''
+        path = os.path.join(directory, filename or self.name or self.sha256)
+        return _get_persist_pool().submit(_write_file, path, self.buffer)
+
+    def __parse(self):
+        if self.__pages is not None:
+            return
+        pages, layout, page_count = [], [], None
+        if self.extension == '.pdf':
+            try:
+                if self.parallel:
+                    pages, layout = parse_pdf_parallel(
+                        self.__data, self.mode, self.workers)
+                else:
+                    pages, layout = parse_pdf(self.open(), self.mode)
+                page_count = len(pages)
+            except PDFSyntaxError:
+                pass
+        elif self.extension == '.docx':
+            pages = [custom_utils.extract_text_from_docx(self.open())]
+        elif self.extension == '.doc':
+            # textract only works on files
+            if self.path:
+                pages = [custom_utils.extract_text_from_doc(self.path)]
+        self.__pages = pages
+        self.__layout = layout
+        self.__page_count = page_count
+
+    def snapshot(self):
+        '''
+        Parse results in a JSON-serialisable form, see `restore`
+        '''
+        self.__parse()
+        return {
+            'name': self.name,
+            'pages': self.__pages,
+            'layout': self.__layout,
+            'page_count': self.__page_count,
+        }
+
+    def restore(self, snapshot):
+        '''
+        Reuse earlier parse results (e.g. from a cache) instead of
+        parsing the document again
+
+        :param snapshot: dictionary returned by `snapshot`
+        '''
+        self.__pages = list(snapshot['pages'])
+        self.__layout = list(snapshot['layout'])
+        self.__page_count = snapshot['page_count']
+        self.__text = None
+
+    @property
+    def pages(self):
+        '''
+        List of the text of every page
+        '''
+        self.__parse()
+        return self.__pages
+
+    @property
+    def page_count(self):
+        '''
+        Number of pages, or None for non-pdf documents
+        '''
+        self.__parse()
+        return self.__page_count
+
+    @property
+    def layout(self):
+        '''
+        List of per-page layout summaries (pdf only)
+        '''
+        self.__parse()
+        return self.__layout
+
+    @property
+    def text(self):
+        '''
+        Full text, joined the same way as `custom_utils.extract_text`
+        '''
+        if self.__text is None:
+            if self.extension == '.pdf':
+                self.__text = ''.join(' ' + page for page in self.pages)
+            else:
+                self.__text = ''.join(self.pages)
+        return self.__text
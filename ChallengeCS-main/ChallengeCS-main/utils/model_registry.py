@@ -0,0 +1,159 @@
+import os
+import sys
+import json
+import time
+import threading
+import spacy
+
+
+def rss_bytes():
+    '''
+    Helper function to read the resident set size of the current process
+
+    :return: RSS in bytes, or None when it cannot be determined
+    '''
+    try:
+        with open('/proc/self/statm') as fh:
+            return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is the peak RSS, in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def peak_rss_bytes():
+    '''
+    Helper function to read the peak resident set size of the current
+    process and of its waited-for children (e.g. pool workers)
+
+    :return: peak RSS in bytes, or None when it cannot be determined
+    '''
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class ModelRegistry(object):
+    '''
+    Process-wide registry of spaCy pipelines. Every pipeline is loaded
+    lazily on first use, exactly once per process, and then borrowed by
+    all parsers and Streamlit sessions.
+    '''
+
+    def __init__(self):
+        self.__models = {}
+        self.__stats = {}
+        self.__locks = {}
+        self.__lock = threading.Lock()
+
+    def __model_lock(self, name):
+        with self.__lock:
+            if name not in self.__locks:
+                self.__locks[name] = threading.Lock()
+            return self.__locks[name]
+
+    def get(self, name):
+        '''
+        Return the pipeline `name`, loading it on first use
+
+        :param name: package name or path of a spaCy model
+        :return: object of `spacy.language.Language`
+        '''
+        nlp = self.__models.get(name)
+        if nlp is not None:
+            return nlp
+        with self.__model_lock(name):
+            # another thread may have finished loading while we waited
+            nlp = self.__models.get(name)
+            if nlp is None:
+                rss_before = rss_bytes()
+                start = time.perf_counter()
+                nlp = spacy.load(name)
+                load_time = time.perf_counter() - start
+                rss_after = rss_bytes()
+                if rss_before is not None and rss_after is not None:
+                    rss_delta = max(rss_after - rss_before, 0)
+                else:
+                    rss_delta = None
+                self.__models[name] = nlp
+                self.__stats[name] = {
+                    'load_time': round(load_time, 4),
+                    'rss_delta': rss_delta,
+                    'loaded_at': time.time(),
+                }
+        return nlp
+
+    def warmup(self, *names):
+        '''
+        Eagerly load the given pipelines, e.g. at process start-up
+
+        :param names: package names or paths of spaCy models
+        :return: dictionary of load statistics for `names`
+        '''
+        for name in names:
+            self.get(name)
+        return dict((name, self.__stats[name]) for name in names)
+
+    def unload(self, name=None):
+        '''
+        Drop a pipeline (or every pipeline when `name` is None) so that
+        its memory can be reclaimed; it is reloaded on next use
+
+        :param name: package name or path of a spaCy model
+        '''
+        with self.__lock:
+            names = [name] if name is not None else list(self.__models)
+            for key in names:
+                self.__models.pop(key, None)
+                self.__stats.pop(key, None)
+
+    def version(self, name):
+        '''
+        Version of a pipeline, read from its meta.json when the model
+        has not been loaded so that callers never pay the load cost
+
+        :param name: package name or path of a spaCy model
+        :return: version string, empty when unknown
+        '''
+        nlp = self.__models.get(name)
+        if nlp is not None:
+            return str(nlp.meta.get('version', ''))
+        path = name
+        if not os.path.isdir(path):
+            try:
+                path = str(spacy.util.get_package_path(name))
+            except Exception:
+                return ''
+        try:
+            with open(os.path.join(path, 'meta.json')) as fh:
+                return str(json.load(fh).get('version', ''))
+        except (OSError, ValueError):
+            return ''
+
+    def is_loaded(self, name):
+        return name in self.__models
+
+    def stats(self):
+        '''
+        Load time (seconds) and approximate RSS growth (bytes) of every
+        loaded pipeline
+
+        :return: dictionary keyed by model name
+        '''
+        with self.__lock:
+            return dict((k, dict(v)) for k, v in self.__stats.items())
+
+
+DEFAULT_MODEL = 'en_core_web_sm'
+
+# shared by every parser in this process
+registry = ModelRegistry()
@@ -0,0 +1,198 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import cProfile
+import threading
+import contextlib
+import collections
+
+DEFAULT_PROFILE_DIR = os.environ.get(
+    'RESUME_PROFILE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'resume_parser',
+                 'profiles')
+)
+
+
+class _StackSampler(threading.Thread):
+    '''
+    Low-overhead statistical profiler: a daemon thread that periodically
+    records the stack of one target thread as collapsed "a;b;c" strings
+    '''
+
+    def __init__(self, thread_id, interval):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = collections.Counter()
+        self.__stop = threading.Event()
+
+    def run(self):
+        while not self.__stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append('%s (%s:%d)' % (
+                    code.co_name, os.path.basename(code.co_filename),
+                    code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self.__stop.set()
+        self.join()
+
+
+class Capture(object):
+    '''
+    One in-progress profiled parse, see `ProfileSampler.start`
+    '''
+
+    def __init__(self, digest, profiler=None, sampler=None):
+        self.digest = digest
+        self.profiler = profiler
+        self.sampler = sampler
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+
+
+class ProfileSampler(object):
+    '''
+    Records a profile of resume parses that are slower than
+    `threshold` seconds, or that are picked at random with probability
+    `sample_rate`. Randomly sampled parses get a full cProfile; every
+    other parse runs under a cheap stack sampler whose samples are only
+    kept when the threshold is exceeded. Captures go to `directory`,
+    which is kept below `max_bytes` by deleting the oldest captures.
+    '''
+
+    def __init__(
+        self,
+        directory=DEFAULT_PROFILE_DIR,
+        threshold=5.0,
+        sample_rate=0.0,
+        max_bytes=50 * 1024 * 1024,
+        interval=0.005
+    ):
+        self.directory = directory
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.__lock = threading.Lock()
+
+    def start(self, digest):
+        '''
+        Begin profiling the current thread
+
+        :param digest: content hash of the document being parsed
+        :return: object of `Capture`, to hand to `finish`
+        '''
+        if self.sample_rate and random.random() < self.sample_rate:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            return Capture(digest, profiler=profiler)
+        if self.threshold is None:
+            return Capture(digest)
+        sampler = _StackSampler(threading.get_ident(), self.interval)
+        sampler.start()
+        return Capture(digest, sampler=sampler)
+
+    def finish(self, capture, stages=None):
+        '''
+        Stop profiling and save the capture if it qualifies
+
+        :param capture: object returned by `start`
+        :param stages: optional dictionary of stage name -> seconds
+        :return: path of the saved capture, or None
+        '''
+        elapsed = time.perf_counter() - capture.started
+        if capture.profiler is not None:
+            capture.profiler.disable()
+        if capture.sampler is not None:
+            capture.sampler.stop()
+        sampled = capture.profiler is not None
+        slow = self.threshold is not None and elapsed >= self.threshold
+        if not (sampled or slow):
+            return None
+        return self.__save(capture, elapsed, stages or {},
+                           'sampled' if sampled else 'slow')
+
+    @contextlib.contextmanager
+    def capture(self, digest, timer=None):
+        '''
+        Context manager around `start`/`finish`
+
+        :param timer: optional `StageTimer` providing the stage breakdown
+        '''
+        capture = self.start(digest)
+        try:
+            yield capture
+        finally:
+            self.finish(capture, timer.as_dict() if timer else None)
+
+    def __save(self, capture, elapsed, stages, reason):
+        name = '%s_%s' % (
+            time.strftime('%Y%m%d-%H%M%S', time.localtime(capture.started_at)),
+            capture.digest[:16]
+        )
+        path = os.path.join(self.directory, name)
+        with self.__lock:
+            if not os.path.isdir(path):
+                os.makedirs(path)
+            if capture.profiler is not None:
+                capture.profiler.dump_stats(os.path.join(path, 'profile.prof'))
+            else:
+                with open(os.path.join(path, 'stacks.folded'), 'w') as fh:
+                    for stack, count in capture.sampler.samples.most_common():
+                        fh.write('%s %d\n' % (stack, count))
+            with open(os.path.join(path, 'meta.json'), 'w') as fh:
+                json.dump({
+                    'sha256': capture.digest,
+                    'reason': reason,
+                    'seconds': round(elapsed, 4),
+                    'threshold': self.threshold,
+                    'started_at': capture.started_at,
+                    'stages': stages,
+                }, fh, indent=2)
+            self.__rotate()
+        return path
+
+    def __rotate(self):
+        captures = []
+        total = 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not os.path.isdir(path):
+                continue
+            size = sum(os.path.getsize(os.path.join(path, f))
+                       for f in os.listdir(path))
+            captures.append((os.path.getmtime(path), path, size))
+            total += size
+        for _, path, size in sorted(captures):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+
+_default_sampler = None
+
+
+def get_default_sampler():
+    '''
+    Return the process-wide sampler, configured from the
+    RESUME_PROFILE_THRESHOLD and RESUME_PROFILE_RATE environment variables
+    '''
+    global _default_sampler
+    if _default_sampler is None:
+        _default_sampler = ProfileSampler(
+            threshold=float(os.environ.get('RESUME_PROFILE_THRESHOLD', 5.0)),
+            sample_rate=float(os.environ.get('RESUME_PROFILE_RATE', 0.0))
+        )
+    return _default_sampler
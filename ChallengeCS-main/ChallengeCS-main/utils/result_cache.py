@@ -0,0 +1,152 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    'RESUME_CACHE_PATH',
+    os.path.join(os.path.expanduser('~'), '.cache', 'resume_parser',
+                 'results.sqlite')
+)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def cache_key(digest, *versions):
+    '''
+    Helper function to build the cache key of a parsed resume
+
+    :param digest: SHA-256 of the resume file bytes
+    :param versions: parser, model and skills-file versions
+    :return: hex digest identifying the result
+    '''
+    key = hashlib.sha256(digest.encode('utf-8'))
+    for version in versions:
+        key.update(b'\0')
+        key.update(str(version).encode('utf-8'))
+    return key.hexdigest()
+
+
+class ResultCache(object):
+    '''
+    Persistent, size-bounded LRU cache of parsed resumes backed by a
+    local SQLite file. Values must be JSON-serialisable.
+    '''
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.__lock = threading.Lock()
+        self.__conn = sqlite3.connect(path, timeout=30,
+                                      check_same_thread=False)
+        with self.__conn:
+            self.__conn.execute('PRAGMA journal_mode=WAL')
+            self.__conn.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                'size INTEGER NOT NULL, accessed REAL NOT NULL)'
+            )
+            self.__conn.execute(
+                'CREATE INDEX IF NOT EXISTS results_accessed '
+                'ON results (accessed)'
+            )
+
+    def get(self, key):
+        '''
+        Look up a cached value and mark it as recently used
+
+        :param key: key built with `cache_key`
+        :return: cached value, or None on a miss
+        '''
+        with self.__lock:
+            row = self.__conn.execute(
+                'SELECT value FROM results WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            with self.__conn:
+                self.__conn.execute(
+                    'UPDATE results SET accessed = ? WHERE key = ?',
+                    (time.time(), key)
+                )
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        '''
+        Store a value, evicting least recently used entries when the
+        cache grows beyond `max_bytes`
+
+        :param key: key built with `cache_key`
+        :param value: JSON-serialisable value
+        '''
+        payload = json.dumps(value, default=str)
+        with self.__lock, self.__conn:
+            self.__conn.execute(
+                'INSERT OR REPLACE INTO results (key, value, size, accessed) '
+                'VALUES (?, ?, ?, ?)',
+                (key, payload, len(payload), time.time())
+            )
+            self.__evict()
+
+    def __evict(self):
+        total = self.__conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM results'
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.__conn.execute(
+            'SELECT key, size FROM results ORDER BY accessed'
+        )
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self.__conn.executemany('DELETE FROM results WHERE key = ?', stale)
+
+    def clear(self):
+        with self.__lock, self.__conn:
+            self.__conn.execute('DELETE FROM results')
+
+    def stats(self):
+        '''
+        Hit/miss counters of this process and the size of the store
+
+        :return: dictionary of statistics
+        '''
+        with self.__lock:
+            entries, size = self.__conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results'
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'entries': entries,
+            'bytes': size,
+        }
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache():
+    '''
+    Return the process-wide cache stored at `DEFAULT_CACHE_PATH`
+    '''
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache()
+    return _default_cache
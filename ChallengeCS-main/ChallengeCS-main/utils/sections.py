@@ -0,0 +1,120 @@
+# Cheap segmentation of a resume into its sections
+
+import re
+import bisect
+import hashlib
+import collections
+
+Section = collections.namedtuple('Section', ['name', 'start', 'end', 'text'])
+
+# section name -> header words; a short line made of one of these (with
+# an optional trailing colon) starts the section
+SECTION_HEADERS = collections.OrderedDict([
+    ('objective', ('objective', 'career objective', 'summary', 'profile',
+                   'professional summary', 'about me')),
+    ('education', ('education', 'academic background', 'qualifications',
+                   'academic qualifications', 'educational background')),
+    ('experience', ('experience', 'work experience', 'professional experience',
+                    'employment', 'employment history', 'work history')),
+    ('internships', ('internship', 'internships')),
+    ('skills', ('skills', 'technical skills', 'skill', 'key skills',
+                'competencies', 'core competencies')),
+    ('projects', ('projects', 'project', 'academic projects',
+                  'personal projects')),
+    ('certifications', ('certifications', 'certification', 'certificates',
+                        'courses', 'licenses')),
+    ('achievements', ('achievements', 'awards', 'accomplishments', 'honors')),
+    ('languages', ('languages',)),
+    ('interests', ('interests', 'hobbies', 'hobbies and interests')),
+    ('contact', ('contact', 'contact details', 'personal details',
+                 'personal information')),
+    ('references', ('references',)),
+])
+
+# the text before the first header (name, contact details)
+PREAMBLE = 'header'
+
+_WORD = re.compile(r'\S+')
+
+_HEADER_WORDS = dict((header, name)
+                     for name, headers in SECTION_HEADERS.items()
+                     for header in headers)
+_MAX_HEADER_WORDS = max(len(h.split()) for h in _HEADER_WORDS)
+
+
+def section_name(line):
+    '''
+    Helper function to recognise a section header line
+
+    :return: name of the section, or None for a regular line
+    '''
+    words = line.strip().rstrip(':').lower().split()
+    if not words or len(words) > _MAX_HEADER_WORDS:
+        return None
+    return _HEADER_WORDS.get(' '.join(words))
+
+
+def split_sections(text):
+    '''
+    Split a raw resume text on its header lines, in one pass
+
+    :param text: raw text, with its line breaks
+    :return: list of `Section`; the sections cover the text contiguously,
+             the first one being `PREAMBLE`
+    '''
+    sections = []
+    name, start, pos = PREAMBLE, 0, 0
+    for line in (text or '').splitlines(True):
+        found = section_name(line)
+        if found is not None and (pos > start or name != PREAMBLE):
+            sections.append(Section(name, start, pos, text[start:pos]))
+            start = pos
+        if found is not None:
+            name = found
+        pos += len(line)
+    sections.append(Section(name, start, pos, (text or '')[start:pos]))
+    return sections
+
+
+def section_digest(section):
+    '''
+    :return: hex digest of the text of a section
+    '''
+    return hashlib.sha1(section.text.encode('utf-8')).hexdigest()
+
+
+class NormalisedText(object):
+    '''
+    A text with its whitespace collapsed to single spaces (the input of
+    the `en_core_web_sm` pipeline), mapping offsets back to the raw text
+    '''
+
+    def __init__(self, raw):
+        self.__raw_starts = []
+        self.__starts = []
+        words = []
+        pos = 0
+        for match in _WORD.finditer(raw or ''):
+            self.__raw_starts.append(match.start())
+            self.__starts.append(pos)
+            words.append(match.group())
+            pos += len(match.group()) + 1
+        self.text = ' '.join(words)
+
+    def raw_offset(self, offset):
+        '''
+        :param offset: character offset in `text`
+        :return: offset of the same character in the raw text
+        '''
+        i = bisect.bisect_right(self.__starts, offset) - 1
+        if i < 0:
+            return offset
+        return self.__raw_starts[i] + offset - self.__starts[i]
+
+    def raw_span(self, start, end):
+        '''
+        :return: (start, end) in the raw text of the span [start, end)
+        '''
+        if end <= start:
+            return self.raw_offset(start), self.raw_offset(start)
+        return self.raw_offset(start), self.raw_offset(end - 1) + 1
@@ -0,0 +1,93 @@
+import os
+import csv
+import threading
+
+DEFAULT_SKILLS_FILE = os.path.join(os.path.dirname(__file__), 'skills.csv')
+
+
+class SkillsIndex(object):
+    '''
+    Compiled lookup structure over a skills file. Every skill is stored
+    as a tuple of lower-cased words so that unigrams and multi-word
+    skills are both found in a single pass over the document tokens.
+    '''
+
+    def __init__(self, skills, version=None):
+        self.__phrases = set()
+        self.__max_len = 1
+        for skill in skills:
+            words = tuple(skill.lower().split())
+            if not words:
+                continue
+            self.__phrases.add(words)
+            self.__max_len = max(self.__max_len, len(words))
+        self.version = version
+
+    def __len__(self):
+        return len(self.__phrases)
+
+    def __contains__(self, phrase):
+        return tuple(phrase.lower().split()) in self.__phrases
+
+    def match_tokens(self, words, skip=None):
+        '''
+        Find every skill in a sequence of words
+
+        :param words: list of token strings, in document order
+        :param skip: optional list of booleans; unigram matches on
+                     positions flagged True (e.g. stop words) are ignored
+        :return: list of matched phrases, as they appear in the text
+        '''
+        lowered = [w.lower() for w in words]
+        phrases = self.__phrases
+        found = []
+        for i in range(len(lowered)):
+            for n in range(1, min(self.__max_len, len(lowered) - i) + 1):
+                if n == 1 and skip is not None and skip[i]:
+                    continue
+                if tuple(lowered[i:i + n]) in phrases:
+                    found.append(' '.join(words[i:i + n]))
+        return found
+
+
+def load_skills(skills_file):
+    '''
+    Helper function to read the skills vocabulary; skills are stored as
+    the header row of the csv file
+
+    :param skills_file: path to the csv file
+    :return: list of skill names
+    '''
+    with open(skills_file, newline='', encoding='utf-8') as fh:
+        try:
+            row = next(csv.reader(fh))
+        except StopIteration:
+            return []
+    return [skill.strip() for skill in row if skill.strip()]
+
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def get_skills_index(skills_file=None):
+    '''
+    Return the compiled index for `skills_file`, compiling it only when
+    the file is seen for the first time or has changed on disk
+
+    :param skills_file: path to a custom skills csv, defaults to the
+                        bundled skills.csv
+    :return: object of `SkillsIndex`
+    '''
+    path = os.path.abspath(skills_file or DEFAULT_SKILLS_FILE)
+    stat = os.stat(path)
+    version = '%d-%d' % (stat.st_mtime_ns, stat.st_size)
+    index = _indexes.get(path)
+    if index is not None and index.version == version:
+        return index
+    with _lock:
+        index = _indexes.get(path)
+        if index is None or index.version != version:
+            index = SkillsIndex(load_skills(path), version=version)
+            _indexes[path] = index
+    return index
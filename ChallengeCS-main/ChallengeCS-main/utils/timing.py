@@ -0,0 +1,32 @@
+import time
+import contextlib
+import collections
+
+
+class StageTimer(object):
+    '''
+    Records the wall-clock time spent in each named stage of a parse.
+    An optional `callback(name, seconds)` is invoked as every stage
+    finishes, e.g. to drive a progress bar.
+    '''
+
+    def __init__(self, callback=None):
+        self.stages = collections.OrderedDict()
+        self.callback = callback
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+            if self.callback is not None:
+                self.callback(name, elapsed)
+
+    def total(self):
+        return sum(self.stages.values())
+
+    def as_dict(self):
+        return dict((k, round(v, 6)) for k, v in self.stages.items())